@@ -0,0 +1,476 @@
+"""baseline: schema de docs/banco_dados_scripts/initial_db_tables.sql
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Reproduz tabelas, índices, triggers, funções e views do script inicial.
+Bancos criados anteriormente pelo script ou pelo create_all devem ser
+marcados com `alembic stamp 0001_baseline` antes do primeiro upgrade.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+TABELAS_COM_ATUALIZADO_EM = [
+    'usuarios',
+    'categorias',
+    'contas_bancarias',
+    'cartoes_credito',
+    'emprestimos',
+    'transacoes',
+    'faturas_cartao',
+    'parcelas_emprestimo',
+    'orcamentos',
+    'metas_financeiras',
+    'configuracoes_usuario',
+]
+
+
+def _id():
+    return sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()'))
+
+
+def _usuario_id():
+    return sa.Column('usuario_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False)
+
+
+def _timestamps(atualizado_em=True):
+    colunas = [sa.Column('criado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'))]
+    if atualizado_em:
+        colunas.append(sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')))
+    return colunas
+
+
+def _dinheiro(nome, nullable=True, padrao=None):
+    return sa.Column(
+        nome,
+        sa.Numeric(15, 2),
+        nullable=nullable,
+        server_default=sa.text(padrao) if padrao is not None else None
+    )
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+
+    op.create_table(
+        'usuarios',
+        _id(),
+        sa.Column('email', sa.String(255), nullable=False, unique=True),
+        sa.Column('senha_hash', sa.String(255), nullable=False),
+        sa.Column('primeiro_nome', sa.String(100), nullable=False),
+        sa.Column('ultimo_nome', sa.String(100), nullable=False),
+        sa.Column('telefone', sa.String(20)),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'categorias',
+        _id(),
+        _usuario_id(),
+        sa.Column('nome', sa.String(100), nullable=False),
+        sa.Column('descricao', sa.Text),
+        sa.Column('cor', sa.String(7)),
+        sa.Column('icone', sa.String(50)),
+        sa.Column('tipo', sa.String(20), nullable=False),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+        sa.CheckConstraint("tipo IN ('receita', 'despesa')", name='check_categoria_tipo'),
+        sa.UniqueConstraint('usuario_id', 'nome', 'tipo', name='uq_categoria_usuario_nome_tipo'),
+    )
+
+    op.create_table(
+        'contas_bancarias',
+        _id(),
+        _usuario_id(),
+        sa.Column('nome', sa.String(100), nullable=False),
+        sa.Column('nome_banco', sa.String(100)),
+        sa.Column('tipo_conta', sa.String(20), nullable=False),
+        _dinheiro('saldo', padrao='0.00'),
+        _dinheiro('saldo_inicial', padrao='0.00'),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+        sa.CheckConstraint("tipo_conta IN ('corrente', 'poupanca', 'investimento', 'dinheiro')", name='check_tipo_conta'),
+    )
+
+    op.create_table(
+        'cartoes_credito',
+        _id(),
+        _usuario_id(),
+        sa.Column('nome', sa.String(100), nullable=False),
+        sa.Column('nome_banco', sa.String(100)),
+        sa.Column('ultimos_digitos', sa.String(4)),
+        _dinheiro('limite_credito', nullable=False),
+        _dinheiro('saldo_atual', padrao='0.00'),
+        sa.Column('dia_fechamento', sa.Integer, nullable=False),
+        sa.Column('dia_vencimento', sa.Integer, nullable=False),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+        sa.CheckConstraint('dia_fechamento BETWEEN 1 AND 31', name='check_dia_fechamento'),
+        sa.CheckConstraint('dia_vencimento BETWEEN 1 AND 31', name='check_dia_vencimento'),
+    )
+
+    op.create_table(
+        'emprestimos',
+        _id(),
+        _usuario_id(),
+        sa.Column('nome', sa.String(100), nullable=False),
+        sa.Column('tipo_emprestimo', sa.String(20), nullable=False),
+        _dinheiro('valor_principal', nullable=False),
+        _dinheiro('saldo_devedor', nullable=False),
+        sa.Column('taxa_juros', sa.Numeric(5, 2), nullable=False),
+        sa.Column('total_parcelas', sa.Integer, nullable=False),
+        sa.Column('parcelas_pagas', sa.Integer, server_default=sa.text('0')),
+        _dinheiro('valor_parcela', nullable=False),
+        sa.Column('data_inicio', sa.Date, nullable=False),
+        sa.Column('data_fim', sa.Date, nullable=False),
+        sa.Column('proximo_vencimento', sa.Date),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+        sa.CheckConstraint(
+            "tipo_emprestimo IN ('pessoal', 'habitacional', 'veiculo', 'estudantil', 'empresarial')",
+            name='check_tipo_emprestimo'
+        ),
+    )
+
+    op.create_table(
+        'transacoes',
+        _id(),
+        _usuario_id(),
+        sa.Column('categoria_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('categorias.id', ondelete='SET NULL')),
+        sa.Column('conta_bancaria_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('contas_bancarias.id', ondelete='SET NULL')),
+        sa.Column('cartao_credito_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('cartoes_credito.id', ondelete='SET NULL')),
+        sa.Column('emprestimo_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('emprestimos.id', ondelete='SET NULL')),
+        sa.Column('descricao', sa.String(255), nullable=False),
+        _dinheiro('valor', nullable=False),
+        sa.Column('tipo_transacao', sa.String(20), nullable=False),
+        sa.Column('data_transacao', sa.Date, nullable=False),
+        sa.Column('data_vencimento', sa.Date),
+        sa.Column('eh_recorrente', sa.Boolean, server_default=sa.text('false')),
+        sa.Column('frequencia_recorrencia', sa.String(20)),
+        sa.Column('data_fim_recorrencia', sa.Date),
+        sa.Column('status', sa.String(20), server_default=sa.text("'concluida'")),
+        sa.Column('observacoes', sa.Text),
+        sa.Column('etiquetas', postgresql.ARRAY(sa.Text)),
+        *_timestamps(),
+        sa.CheckConstraint(
+            "tipo_transacao IN ('receita', 'despesa', 'transferencia', 'pagamento_emprestimo', 'pagamento_cartao')",
+            name='check_tipo_transacao'
+        ),
+        sa.CheckConstraint(
+            "frequencia_recorrencia IN ('diaria', 'semanal', 'mensal', 'anual') OR frequencia_recorrencia IS NULL",
+            name='check_frequencia_recorrencia'
+        ),
+        sa.CheckConstraint("status IN ('pendente', 'concluida', 'cancelada')", name='check_status_transacao'),
+    )
+
+    op.create_table(
+        'faturas_cartao',
+        _id(),
+        sa.Column('cartao_credito_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('cartoes_credito.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('mes_referencia', sa.Date, nullable=False),
+        _dinheiro('valor_total', nullable=False),
+        _dinheiro('pagamento_minimo', nullable=False),
+        sa.Column('data_vencimento', sa.Date, nullable=False),
+        sa.Column('data_fechamento', sa.Date, nullable=False),
+        sa.Column('status', sa.String(20), server_default=sa.text("'aberta'")),
+        _dinheiro('valor_pago', padrao='0.00'),
+        sa.Column('data_pagamento', sa.Date),
+        *_timestamps(),
+        sa.CheckConstraint("status IN ('aberta', 'fechada', 'paga', 'vencida')", name='check_status_fatura'),
+    )
+
+    op.create_table(
+        'parcelas_emprestimo',
+        _id(),
+        sa.Column('emprestimo_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('emprestimos.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('numero_parcela', sa.Integer, nullable=False),
+        sa.Column('data_vencimento', sa.Date, nullable=False),
+        _dinheiro('valor', nullable=False),
+        _dinheiro('valor_principal', nullable=False),
+        _dinheiro('valor_juros', nullable=False),
+        sa.Column('status', sa.String(20), server_default=sa.text("'pendente'")),
+        sa.Column('data_pagamento', sa.Date),
+        _dinheiro('valor_pago', padrao='0.00'),
+        *_timestamps(),
+        sa.CheckConstraint("status IN ('pendente', 'paga', 'vencida')", name='check_status_parcela'),
+        sa.UniqueConstraint('emprestimo_id', 'numero_parcela', name='uq_emprestimo_parcela'),
+    )
+
+    op.create_table(
+        'orcamentos',
+        _id(),
+        _usuario_id(),
+        sa.Column('categoria_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('categorias.id', ondelete='CASCADE')),
+        sa.Column('nome', sa.String(100), nullable=False),
+        _dinheiro('valor_limite', nullable=False),
+        _dinheiro('valor_gasto', padrao='0.00'),
+        sa.Column('tipo_periodo', sa.String(20), nullable=False),
+        sa.Column('data_inicio', sa.Date, nullable=False),
+        sa.Column('data_fim', sa.Date, nullable=False),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(),
+        sa.CheckConstraint("tipo_periodo IN ('mensal', 'anual')", name='check_tipo_periodo'),
+    )
+
+    op.create_table(
+        'metas_financeiras',
+        _id(),
+        _usuario_id(),
+        sa.Column('nome', sa.String(100), nullable=False),
+        sa.Column('descricao', sa.Text),
+        _dinheiro('valor_objetivo', nullable=False),
+        _dinheiro('valor_atual', padrao='0.00'),
+        sa.Column('data_inicio', sa.Date, nullable=False),
+        sa.Column('data_objetivo', sa.Date, nullable=False),
+        sa.Column('tipo_meta', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), server_default=sa.text("'ativa'")),
+        *_timestamps(),
+        sa.CheckConstraint(
+            "tipo_meta IN ('economia', 'investimento', 'compra', 'viagem', 'emergencia')",
+            name='check_tipo_meta'
+        ),
+        sa.CheckConstraint("status IN ('ativa', 'concluida', 'pausada', 'cancelada')", name='check_status_meta'),
+    )
+
+    op.create_table(
+        'alertas',
+        _id(),
+        _usuario_id(),
+        sa.Column('tipo_alerta', sa.String(30), nullable=False),
+        sa.Column('titulo', sa.String(200), nullable=False),
+        sa.Column('mensagem', sa.Text, nullable=False),
+        sa.Column('data_alerta', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('lido', sa.Boolean, server_default=sa.text('false')),
+        sa.Column('ativo', sa.Boolean, server_default=sa.text('true')),
+        *_timestamps(atualizado_em=False),
+        sa.CheckConstraint(
+            "tipo_alerta IN ('vencimento_fatura', 'vencimento_emprestimo', 'limite_orcamento', 'meta_atingida', 'saldo_baixo')",
+            name='check_tipo_alerta'
+        ),
+    )
+
+    op.create_table(
+        'configuracoes_usuario',
+        _id(),
+        _usuario_id(),
+        sa.Column('moeda', sa.String(3), server_default=sa.text("'BRL'")),
+        sa.Column('formato_data', sa.String(10), server_default=sa.text("'DD/MM/YYYY'")),
+        sa.Column('tema', sa.String(10), server_default=sa.text("'auto'")),
+        sa.Column('notificacoes_email', sa.Boolean, server_default=sa.text('true')),
+        sa.Column('notificacoes_push', sa.Boolean, server_default=sa.text('true')),
+        sa.Column('dia_fechamento_mes', sa.Integer, server_default=sa.text('1')),
+        *_timestamps(),
+        sa.CheckConstraint("tema IN ('claro', 'escuro', 'auto')", name='check_tema'),
+        sa.CheckConstraint('dia_fechamento_mes BETWEEN 1 AND 31', name='check_dia_fechamento_mes'),
+        sa.UniqueConstraint('usuario_id', name='uq_usuario_configuracao'),
+    )
+
+    # Índices para performance
+    op.create_index('idx_transacoes_usuario_id', 'transacoes', ['usuario_id'])
+    op.create_index('idx_transacoes_data', 'transacoes', ['data_transacao'])
+    op.create_index('idx_transacoes_categoria', 'transacoes', ['categoria_id'])
+    op.create_index('idx_transacoes_tipo', 'transacoes', ['tipo_transacao'])
+    op.create_index('idx_faturas_cartao_id', 'faturas_cartao', ['cartao_credito_id'])
+    op.create_index('idx_parcelas_emprestimo_id', 'parcelas_emprestimo', ['emprestimo_id'])
+    op.create_index('idx_parcelas_vencimento', 'parcelas_emprestimo', ['data_vencimento'])
+    op.create_index('idx_alertas_usuario_id', 'alertas', ['usuario_id'])
+    op.create_index('idx_alertas_data', 'alertas', ['data_alerta'])
+
+    # Triggers para atualizar atualizado_em
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atualizar_timestamp()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.atualizado_em = CURRENT_TIMESTAMP;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """)
+    for tabela in TABELAS_COM_ATUALIZADO_EM:
+        op.execute(
+            f"CREATE TRIGGER trigger_{tabela}_atualizado_em BEFORE UPDATE ON {tabela} "
+            f"FOR EACH ROW EXECUTE FUNCTION atualizar_timestamp()"
+        )
+
+    # Views úteis para relatórios
+    op.execute("""
+        CREATE VIEW vw_resumo_financeiro AS
+        SELECT
+            u.id as usuario_id,
+            u.primeiro_nome || ' ' || u.ultimo_nome as nome_completo,
+            COALESCE(cb.total_contas, 0) as total_contas_bancarias,
+            COALESCE(cc.total_cartoes, 0) as total_divida_cartoes,
+            COALESCE(emp.total_emprestimos, 0) as total_divida_emprestimos,
+            COALESCE(cb.total_contas, 0) - COALESCE(cc.total_cartoes, 0) - COALESCE(emp.total_emprestimos, 0) as patrimonio_liquido
+        FROM usuarios u
+        LEFT JOIN (
+            SELECT usuario_id, SUM(saldo) as total_contas
+            FROM contas_bancarias
+            WHERE ativo = true
+            GROUP BY usuario_id
+        ) cb ON u.id = cb.usuario_id
+        LEFT JOIN (
+            SELECT usuario_id, SUM(saldo_atual) as total_cartoes
+            FROM cartoes_credito
+            WHERE ativo = true
+            GROUP BY usuario_id
+        ) cc ON u.id = cc.usuario_id
+        LEFT JOIN (
+            SELECT usuario_id, SUM(saldo_devedor) as total_emprestimos
+            FROM emprestimos
+            WHERE ativo = true
+            GROUP BY usuario_id
+        ) emp ON u.id = emp.usuario_id
+        WHERE u.ativo = true;
+    """)
+
+    op.execute("""
+        CREATE VIEW vw_transacoes_mes_atual AS
+        SELECT
+            t.*,
+            c.nome as categoria_nome,
+            c.tipo as categoria_tipo,
+            cb.nome as conta_nome,
+            cc.nome as cartao_nome
+        FROM transacoes t
+        LEFT JOIN categorias c ON t.categoria_id = c.id
+        LEFT JOIN contas_bancarias cb ON t.conta_bancaria_id = cb.id
+        LEFT JOIN cartoes_credito cc ON t.cartao_credito_id = cc.id
+        WHERE EXTRACT(YEAR FROM t.data_transacao) = EXTRACT(YEAR FROM CURRENT_DATE)
+          AND EXTRACT(MONTH FROM t.data_transacao) = EXTRACT(MONTH FROM CURRENT_DATE)
+          AND t.status = 'concluida';
+    """)
+
+    # Função para calcular próximo vencimento de empréstimo
+    op.execute("""
+        CREATE OR REPLACE FUNCTION calcular_proximo_vencimento_emprestimo(emprestimo_uuid UUID)
+        RETURNS DATE AS $$
+        DECLARE
+            proximo_vencimento DATE;
+        BEGIN
+            SELECT MIN(data_vencimento) INTO proximo_vencimento
+            FROM parcelas_emprestimo
+            WHERE emprestimo_id = emprestimo_uuid
+              AND status = 'pendente'
+              AND data_vencimento >= CURRENT_DATE;
+
+            RETURN proximo_vencimento;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Função e trigger para atualizar saldo da conta após transação
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atualizar_saldo_conta()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Se é uma nova transação
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.conta_bancaria_id IS NOT NULL THEN
+                    IF NEW.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    ELSIF NEW.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            -- Se é uma atualização de transação
+            IF TG_OP = 'UPDATE' THEN
+                -- Reverter transação antiga se mudou de conta
+                IF OLD.conta_bancaria_id IS NOT NULL AND OLD.conta_bancaria_id != NEW.conta_bancaria_id THEN
+                    IF OLD.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    ELSIF OLD.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    END IF;
+                END IF;
+
+                -- Aplicar nova transação
+                IF NEW.conta_bancaria_id IS NOT NULL THEN
+                    IF NEW.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    ELSIF NEW.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            -- Se é uma exclusão de transação
+            IF TG_OP = 'DELETE' THEN
+                IF OLD.conta_bancaria_id IS NOT NULL THEN
+                    IF OLD.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    ELSIF OLD.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN OLD;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_atualizar_saldo_conta
+            AFTER INSERT OR UPDATE OR DELETE ON transacoes
+            FOR EACH ROW EXECUTE FUNCTION atualizar_saldo_conta();
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trigger_atualizar_saldo_conta ON transacoes")
+    op.execute("DROP FUNCTION IF EXISTS atualizar_saldo_conta()")
+    op.execute("DROP FUNCTION IF EXISTS calcular_proximo_vencimento_emprestimo(UUID)")
+    op.execute("DROP VIEW IF EXISTS vw_transacoes_mes_atual")
+    op.execute("DROP VIEW IF EXISTS vw_resumo_financeiro")
+
+    for tabela in reversed(TABELAS_COM_ATUALIZADO_EM):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_{tabela}_atualizado_em ON {tabela}")
+    op.execute("DROP FUNCTION IF EXISTS atualizar_timestamp()")
+
+    for tabela in [
+        'configuracoes_usuario',
+        'alertas',
+        'metas_financeiras',
+        'orcamentos',
+        'parcelas_emprestimo',
+        'faturas_cartao',
+        'transacoes',
+        'emprestimos',
+        'cartoes_credito',
+        'contas_bancarias',
+        'categorias',
+        'usuarios',
+    ]:
+        op.drop_table(tabela)
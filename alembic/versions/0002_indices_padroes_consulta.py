@@ -0,0 +1,80 @@
+"""índices compostos e parciais para os padrões de consulta
+
+Revision ID: 0002_indices_padroes_consulta
+Revises: 0001_baseline
+Create Date: 2026-10-18 00:00:00
+
+Os índices são criados com CONCURRENTLY para não bloquear escritas em
+tabelas grandes. Índices de coluna única cobertos pelos novos compostos
+(mesma coluna inicial) são removidos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_indices_padroes_consulta'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_transacoes_usuario_data',
+            'transacoes',
+            ['usuario_id', sa.text('data_transacao DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_parcelas_pendentes_vencimento',
+            'parcelas_emprestimo',
+            ['data_vencimento'],
+            postgresql_where=sa.text("status = 'pendente'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_parcelas_emprestimo_pendentes',
+            'parcelas_emprestimo',
+            ['emprestimo_id', 'data_vencimento'],
+            postgresql_where=sa.text("status = 'pendente'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_faturas_cartao_mes',
+            'faturas_cartao',
+            ['cartao_credito_id', sa.text('mes_referencia DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_faturas_abertas_vencimento',
+            'faturas_cartao',
+            ['data_vencimento'],
+            postgresql_where=sa.text("status IN ('aberta', 'fechada')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_alertas_nao_lidos',
+            'alertas',
+            ['usuario_id', sa.text('data_alerta DESC')],
+            postgresql_where=sa.text('lido = false'),
+            postgresql_concurrently=True,
+        )
+
+        # Cobertos pelos índices compostos acima
+        op.drop_index('idx_transacoes_usuario_id', table_name='transacoes', postgresql_concurrently=True)
+        op.drop_index('idx_faturas_cartao_id', table_name='faturas_cartao', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('idx_faturas_cartao_id', 'faturas_cartao', ['cartao_credito_id'], postgresql_concurrently=True)
+        op.create_index('idx_transacoes_usuario_id', 'transacoes', ['usuario_id'], postgresql_concurrently=True)
+
+        op.drop_index('idx_alertas_nao_lidos', table_name='alertas', postgresql_concurrently=True)
+        op.drop_index('idx_faturas_abertas_vencimento', table_name='faturas_cartao', postgresql_concurrently=True)
+        op.drop_index('idx_faturas_cartao_mes', table_name='faturas_cartao', postgresql_concurrently=True)
+        op.drop_index('idx_parcelas_emprestimo_pendentes', table_name='parcelas_emprestimo', postgresql_concurrently=True)
+        op.drop_index('idx_parcelas_pendentes_vencimento', table_name='parcelas_emprestimo', postgresql_concurrently=True)
+        op.drop_index('idx_transacoes_usuario_data', table_name='transacoes', postgresql_concurrently=True)
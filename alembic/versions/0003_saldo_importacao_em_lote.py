@@ -0,0 +1,138 @@
+"""trigger de saldo ignora importações em lote e reverte o valor antigo em updates
+
+Revision ID: 0003_saldo_importacao_em_lote
+Revises: 0002_indices_padroes_consulta
+Create Date: 2026-10-18 00:00:00
+
+Importações em lote ajustam o saldo com um único UPDATE agregado por conta;
+durante a transação da importação a variável app.importacao_em_lote fica
+'on' (SET LOCAL) e o trigger por linha não faz nada.
+
+Corrige também o UPDATE, que só revertia o valor antigo quando a conta
+mudava: alterar valor ou tipo de uma transação na mesma conta somava o novo
+valor sem subtrair o anterior.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_saldo_importacao_em_lote'
+down_revision = '0002_indices_padroes_consulta'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atualizar_saldo_conta()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Importações em lote aplicam o saldo agregado por conta
+            IF current_setting('app.importacao_em_lote', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+
+            -- Reverter a transação antiga (UPDATE ou DELETE)
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.conta_bancaria_id IS NOT NULL THEN
+                IF OLD.tipo_transacao = 'receita' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo - OLD.valor
+                    WHERE id = OLD.conta_bancaria_id;
+                ELSIF OLD.tipo_transacao = 'despesa' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo + OLD.valor
+                    WHERE id = OLD.conta_bancaria_id;
+                END IF;
+            END IF;
+
+            -- Aplicar a nova transação (INSERT ou UPDATE)
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.conta_bancaria_id IS NOT NULL THEN
+                IF NEW.tipo_transacao = 'receita' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo + NEW.valor
+                    WHERE id = NEW.conta_bancaria_id;
+                ELSIF NEW.tipo_transacao = 'despesa' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo - NEW.valor
+                    WHERE id = NEW.conta_bancaria_id;
+                END IF;
+            END IF;
+
+            -- Trigger AFTER: o valor de retorno é ignorado
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION atualizar_saldo_conta()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Se é uma nova transação
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.conta_bancaria_id IS NOT NULL THEN
+                    IF NEW.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    ELSIF NEW.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            -- Se é uma atualização de transação
+            IF TG_OP = 'UPDATE' THEN
+                -- Reverter transação antiga se mudou de conta
+                IF OLD.conta_bancaria_id IS NOT NULL AND OLD.conta_bancaria_id != NEW.conta_bancaria_id THEN
+                    IF OLD.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    ELSIF OLD.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    END IF;
+                END IF;
+
+                -- Aplicar nova transação
+                IF NEW.conta_bancaria_id IS NOT NULL THEN
+                    IF NEW.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    ELSIF NEW.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - NEW.valor
+                        WHERE id = NEW.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            -- Se é uma exclusão de transação
+            IF TG_OP = 'DELETE' THEN
+                IF OLD.conta_bancaria_id IS NOT NULL THEN
+                    IF OLD.tipo_transacao = 'receita' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo - OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    ELSIF OLD.tipo_transacao = 'despesa' THEN
+                        UPDATE contas_bancarias
+                        SET saldo = saldo + OLD.valor
+                        WHERE id = OLD.conta_bancaria_id;
+                    END IF;
+                END IF;
+                RETURN OLD;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
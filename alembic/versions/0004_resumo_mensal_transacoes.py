@@ -0,0 +1,171 @@
+"""resumo mensal de transações mantido por triggers
+
+Revision ID: 0004_resumo_mensal_transacoes
+Revises: 0003_saldo_importacao_em_lote
+Create Date: 2026-10-18 00:00:00
+
+Cria resumo_mensal_transacoes (totais e quantidades por usuário, mês,
+categoria, tipo e status) e os triggers por comando (FOR EACH STATEMENT com
+tabelas de transição) que aplicam as variações de cada INSERT, UPDATE e
+DELETE em transacoes com um único upsert agregado.
+
+Também troca o filtro de vw_transacoes_mes_atual (EXTRACT de ano e mês)
+por um intervalo de datas, que pode usar os índices de data_transacao.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_resumo_mensal_transacoes'
+down_revision = '0003_saldo_importacao_em_lote'
+branch_labels = None
+depends_on = None
+
+
+GRUPO = (
+    "usuario_id, mes_referencia, "
+    "COALESCE(categoria_id, '00000000-0000-0000-0000-000000000000'::uuid), "
+    "tipo_transacao, status"
+)
+
+
+def _variacoes(tabela, sinal):
+    return f"""
+        SELECT usuario_id,
+               date_trunc('month', data_transacao)::date AS mes_referencia,
+               categoria_id,
+               tipo_transacao,
+               COALESCE(status, 'concluida') AS status,
+               {sinal}valor AS valor,
+               {sinal}1 AS quantidade
+        FROM {tabela}
+    """
+
+
+def _aplicar_variacoes(origem):
+    """Upsert das variações agregadas por grupo; grupos zerados são removidos"""
+    return f"""
+            INSERT INTO resumo_mensal_transacoes AS r
+                (usuario_id, mes_referencia, categoria_id, tipo_transacao, status, total, quantidade)
+            SELECT v.usuario_id, v.mes_referencia, v.categoria_id, v.tipo_transacao, v.status,
+                   sum(v.valor), sum(v.quantidade)
+            FROM ({origem}) v
+            -- Ignora usuários removidos no mesmo comando (ON DELETE CASCADE)
+            JOIN usuarios u ON u.id = v.usuario_id
+            GROUP BY v.usuario_id, v.mes_referencia, v.categoria_id, v.tipo_transacao, v.status
+            HAVING sum(v.valor) <> 0 OR sum(v.quantidade) <> 0
+            ORDER BY 1, 2, 3, 4, 5
+            ON CONFLICT ({GRUPO}) DO UPDATE
+            SET total = r.total + EXCLUDED.total,
+                quantidade = r.quantidade + EXCLUDED.quantidade,
+                atualizado_em = CURRENT_TIMESTAMP;
+
+            DELETE FROM resumo_mensal_transacoes r
+            WHERE r.quantidade = 0
+              AND r.usuario_id IN (SELECT v.usuario_id FROM ({origem}) v);
+    """
+
+
+def upgrade():
+    op.create_table(
+        'resumo_mensal_transacoes',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('usuario_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('mes_referencia', sa.Date, nullable=False),
+        sa.Column('categoria_id', postgresql.UUID(as_uuid=True)),
+        sa.Column('tipo_transacao', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('total', sa.Numeric(15, 2), nullable=False, server_default=sa.text('0.00')),
+        sa.Column('quantidade', sa.Integer, nullable=False, server_default=sa.text('0')),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.execute(f"CREATE UNIQUE INDEX uq_resumo_mensal_grupo ON resumo_mensal_transacoes ({GRUPO})")
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION atualizar_resumo_mensal()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_variacoes(_variacoes('novas', ''))}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_aplicar_variacoes(_variacoes('novas', '') + ' UNION ALL ' + _variacoes('antigas', '-'))}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_variacoes(_variacoes('antigas', '-'))}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Tabelas de transição exigem um trigger por evento
+    op.execute("""
+        CREATE TRIGGER trigger_resumo_mensal_insert
+            AFTER INSERT ON transacoes
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_resumo_mensal();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_resumo_mensal_update
+            AFTER UPDATE ON transacoes
+            REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_resumo_mensal();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_resumo_mensal_delete
+            AFTER DELETE ON transacoes
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_resumo_mensal();
+    """)
+
+    # Carga inicial
+    op.execute(f"""
+        INSERT INTO resumo_mensal_transacoes
+            (usuario_id, mes_referencia, categoria_id, tipo_transacao, status, total, quantidade)
+        SELECT v.usuario_id, v.mes_referencia, v.categoria_id, v.tipo_transacao, v.status,
+               sum(v.valor), sum(v.quantidade)
+        FROM ({_variacoes('transacoes', '')}) v
+        GROUP BY v.usuario_id, v.mes_referencia, v.categoria_id, v.tipo_transacao, v.status
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE VIEW vw_transacoes_mes_atual AS
+        SELECT
+            t.*,
+            c.nome as categoria_nome,
+            c.tipo as categoria_tipo,
+            cb.nome as conta_nome,
+            cc.nome as cartao_nome
+        FROM transacoes t
+        LEFT JOIN categorias c ON t.categoria_id = c.id
+        LEFT JOIN contas_bancarias cb ON t.conta_bancaria_id = cb.id
+        LEFT JOIN cartoes_credito cc ON t.cartao_credito_id = cc.id
+        WHERE t.data_transacao >= date_trunc('month', CURRENT_DATE)::date
+          AND t.data_transacao < (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date
+          AND t.status = 'concluida';
+    """)
+
+
+def downgrade():
+    op.execute("""
+        CREATE OR REPLACE VIEW vw_transacoes_mes_atual AS
+        SELECT
+            t.*,
+            c.nome as categoria_nome,
+            c.tipo as categoria_tipo,
+            cb.nome as conta_nome,
+            cc.nome as cartao_nome
+        FROM transacoes t
+        LEFT JOIN categorias c ON t.categoria_id = c.id
+        LEFT JOIN contas_bancarias cb ON t.conta_bancaria_id = cb.id
+        LEFT JOIN cartoes_credito cc ON t.cartao_credito_id = cc.id
+        WHERE EXTRACT(YEAR FROM t.data_transacao) = EXTRACT(YEAR FROM CURRENT_DATE)
+          AND EXTRACT(MONTH FROM t.data_transacao) = EXTRACT(MONTH FROM CURRENT_DATE)
+          AND t.status = 'concluida';
+    """)
+
+    for evento in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_resumo_mensal_{evento} ON transacoes")
+    op.execute("DROP FUNCTION IF EXISTS atualizar_resumo_mensal()")
+    op.drop_table('resumo_mensal_transacoes')
@@ -0,0 +1,144 @@
+"""materialização de transações recorrentes
+
+Revision ID: 0005_transacoes_recorrentes
+Revises: 0004_resumo_mensal_transacoes
+Create Date: 2026-10-18 00:00:00
+
+Adiciona transacoes.transacao_origem_id (modelo recorrente que gerou a
+ocorrência) com índice único parcial em (transacao_origem_id,
+data_transacao), que torna a geração idempotente, e a tabela
+checkpoints_tarefas para retomada de tarefas em lote.
+
+As ocorrências futuras são criadas como 'pendente'; o trigger de saldo passa
+a considerar apenas transações concluídas, e os saldos atuais são ajustados
+removendo o efeito das transações pendentes e canceladas já aplicadas.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_transacoes_recorrentes'
+down_revision = '0004_resumo_mensal_transacoes'
+branch_labels = None
+depends_on = None
+
+
+def _funcao_saldo(condicao_old, condicao_new):
+    return f"""
+        CREATE OR REPLACE FUNCTION atualizar_saldo_conta()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Importações em lote aplicam o saldo agregado por conta
+            IF current_setting('app.importacao_em_lote', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+
+            -- Reverter a transação antiga (UPDATE ou DELETE)
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.conta_bancaria_id IS NOT NULL{condicao_old} THEN
+                IF OLD.tipo_transacao = 'receita' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo - OLD.valor
+                    WHERE id = OLD.conta_bancaria_id;
+                ELSIF OLD.tipo_transacao = 'despesa' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo + OLD.valor
+                    WHERE id = OLD.conta_bancaria_id;
+                END IF;
+            END IF;
+
+            -- Aplicar a nova transação (INSERT ou UPDATE)
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.conta_bancaria_id IS NOT NULL{condicao_new} THEN
+                IF NEW.tipo_transacao = 'receita' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo + NEW.valor
+                    WHERE id = NEW.conta_bancaria_id;
+                ELSIF NEW.tipo_transacao = 'despesa' THEN
+                    UPDATE contas_bancarias
+                    SET saldo = saldo - NEW.valor
+                    WHERE id = NEW.conta_bancaria_id;
+                END IF;
+            END IF;
+
+            -- Trigger AFTER: o valor de retorno é ignorado
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def _ajustar_saldos(sinal):
+    """Soma (ou subtrai) nos saldos o efeito das transações não concluídas"""
+    return f"""
+        UPDATE contas_bancarias c
+        SET saldo = c.saldo {sinal} x.efeito
+        FROM (
+            SELECT conta_bancaria_id,
+                   sum(CASE tipo_transacao
+                           WHEN 'receita' THEN valor
+                           WHEN 'despesa' THEN -valor
+                           ELSE 0
+                       END) AS efeito
+            FROM transacoes
+            WHERE conta_bancaria_id IS NOT NULL
+              AND COALESCE(status, 'concluida') <> 'concluida'
+            GROUP BY conta_bancaria_id
+        ) x
+        WHERE c.id = x.conta_bancaria_id
+    """
+
+
+def upgrade():
+    op.create_table(
+        'checkpoints_tarefas',
+        sa.Column('nome', sa.String(100), primary_key=True),
+        sa.Column('posicao', postgresql.JSONB),
+        sa.Column('iniciado_em', sa.DateTime(timezone=True)),
+        sa.Column('concluido_em', sa.DateTime(timezone=True)),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+
+    op.add_column(
+        'transacoes',
+        sa.Column(
+            'transacao_origem_id',
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('transacoes.id', ondelete='SET NULL'),
+        )
+    )
+
+    op.execute(_funcao_saldo(
+        " AND COALESCE(OLD.status, 'concluida') = 'concluida'",
+        " AND COALESCE(NEW.status, 'concluida') = 'concluida'",
+    ))
+    op.execute(_ajustar_saldos('-'))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_transacoes_ocorrencia',
+            'transacoes',
+            ['transacao_origem_id', 'data_transacao'],
+            unique=True,
+            postgresql_where=sa.text('transacao_origem_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_transacoes_modelos_recorrentes',
+            'transacoes',
+            ['id'],
+            postgresql_where=sa.text('eh_recorrente = true AND transacao_origem_id IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_transacoes_modelos_recorrentes', table_name='transacoes', postgresql_concurrently=True)
+        op.drop_index('uq_transacoes_ocorrencia', table_name='transacoes', postgresql_concurrently=True)
+
+    op.execute(_ajustar_saldos('+'))
+    op.execute(_funcao_saldo("", ""))
+
+    op.drop_column('transacoes', 'transacao_origem_id')
+    op.drop_table('checkpoints_tarefas')
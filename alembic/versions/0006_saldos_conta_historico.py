@@ -0,0 +1,123 @@
+"""snapshots de saldo das contas bancárias
+
+Revision ID: 0006_saldos_conta_historico
+Revises: 0005_transacoes_recorrentes
+Create Date: 2026-10-18 00:00:00
+
+Cria saldos_conta_historico (saldo ao final de uma data, por conta) e
+triggers por comando em transacoes que ajustam os snapshots com data igual
+ou posterior à de transações concluídas inseridas, alteradas ou removidas,
+para que lançamentos retroativos não invalidem o histórico.
+
+Adiciona o índice (conta_bancaria_id, data_transacao) usado para somar as
+transações entre o snapshot e a data consultada.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_saldos_conta_historico'
+down_revision = '0005_transacoes_recorrentes'
+branch_labels = None
+depends_on = None
+
+
+def _variacoes(tabela, sinal):
+    return f"""
+        SELECT conta_bancaria_id,
+               data_transacao,
+               {sinal}(CASE tipo_transacao
+                   WHEN 'receita' THEN valor
+                   WHEN 'despesa' THEN -valor
+                   ELSE 0
+               END) AS efeito
+        FROM {tabela}
+        WHERE conta_bancaria_id IS NOT NULL
+          AND COALESCE(status, 'concluida') = 'concluida'
+          AND tipo_transacao IN ('receita', 'despesa')
+    """
+
+
+def _ajustar_snapshots(origem):
+    return f"""
+            UPDATE saldos_conta_historico h
+            SET saldo = h.saldo + x.variacao
+            FROM (
+                SELECT s.id, sum(v.efeito) AS variacao
+                FROM ({origem}) v
+                JOIN saldos_conta_historico s
+                  ON s.conta_bancaria_id = v.conta_bancaria_id
+                 AND s.data_referencia >= v.data_transacao
+                GROUP BY s.id
+                HAVING sum(v.efeito) <> 0
+            ) x
+            WHERE h.id = x.id;
+    """
+
+
+def upgrade():
+    op.create_table(
+        'saldos_conta_historico',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('conta_bancaria_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('contas_bancarias.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('data_referencia', sa.Date, nullable=False),
+        sa.Column('saldo', sa.Numeric(15, 2), nullable=False),
+        sa.Column('criado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('conta_bancaria_id', 'data_referencia', name='uq_saldo_conta_data'),
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION ajustar_saldos_historico()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_ajustar_snapshots(_variacoes('novas', ''))}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_ajustar_snapshots(_variacoes('novas', '') + ' UNION ALL ' + _variacoes('antigas', '-'))}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_ajustar_snapshots(_variacoes('antigas', '-'))}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Tabelas de transição exigem um trigger por evento
+    op.execute("""
+        CREATE TRIGGER trigger_saldos_historico_insert
+            AFTER INSERT ON transacoes
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION ajustar_saldos_historico();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_saldos_historico_update
+            AFTER UPDATE ON transacoes
+            REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION ajustar_saldos_historico();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_saldos_historico_delete
+            AFTER DELETE ON transacoes
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION ajustar_saldos_historico();
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_transacoes_conta_data',
+            'transacoes',
+            ['conta_bancaria_id', 'data_transacao'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_transacoes_conta_data', table_name='transacoes', postgresql_concurrently=True)
+
+    for evento in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_saldos_historico_{evento} ON transacoes")
+    op.execute("DROP FUNCTION IF EXISTS ajustar_saldos_historico()")
+    op.drop_table('saldos_conta_historico')
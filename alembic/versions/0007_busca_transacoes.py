@@ -0,0 +1,74 @@
+"""busca textual e por etiquetas em transações
+
+Revision ID: 0007_busca_transacoes
+Revises: 0006_saldos_conta_historico
+Create Date: 2026-10-18 00:00:00
+
+Adiciona transacoes.busca, tsvector gerado (dicionário portuguese) de
+descricao (peso A) e observacoes (peso B), e índices GIN para a busca
+textual, para trechos de descrição (pg_trgm) e para etiquetas (@>).
+
+A coluna gerada STORED reescreve a tabela ao ser adicionada; em bases
+grandes execute em janela de manutenção. Os índices são criados com
+CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_busca_transacoes'
+down_revision = '0006_saldos_conta_historico'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column(
+        'transacoes',
+        sa.Column(
+            'busca',
+            postgresql.TSVECTOR,
+            sa.Computed(
+                "setweight(to_tsvector('portuguese', coalesce(descricao, '')), 'A') || "
+                "setweight(to_tsvector('portuguese', coalesce(observacoes, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_transacoes_busca',
+            'transacoes',
+            ['busca'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_transacoes_descricao_trgm',
+            'transacoes',
+            ['descricao'],
+            postgresql_using='gin',
+            postgresql_ops={'descricao': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_transacoes_etiquetas',
+            'transacoes',
+            ['etiquetas'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_transacoes_etiquetas', table_name='transacoes', postgresql_concurrently=True)
+        op.drop_index('idx_transacoes_descricao_trgm', table_name='transacoes', postgresql_concurrently=True)
+        op.drop_index('idx_transacoes_busca', table_name='transacoes', postgresql_concurrently=True)
+
+    op.drop_column('transacoes', 'busca')
@@ -0,0 +1,36 @@
+"""índices por usuário em contas, cartões e empréstimos
+
+Revision ID: 0008_indices_usuario_resumo
+Revises: 0007_busca_transacoes
+Create Date: 2026-10-18 00:00:00
+
+O resumo financeiro por usuário soma contas, cartões e empréstimos de um
+único usuário; sem estes índices cada soma percorre a tabela inteira.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_indices_usuario_resumo'
+down_revision = '0007_busca_transacoes'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('idx_contas_bancarias_usuario_id', 'contas_bancarias'),
+    ('idx_cartoes_credito_usuario_id', 'cartoes_credito'),
+    ('idx_emprestimos_usuario_id', 'emprestimos'),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela in INDICES:
+            op.create_index(nome, tabela, ['usuario_id'], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True)
@@ -0,0 +1,133 @@
+"""valor_gasto dos orçamentos mantido por triggers
+
+Revision ID: 0009_valor_gasto_orcamentos
+Revises: 0008_indices_usuario_resumo
+Create Date: 2026-10-18 00:00:00
+
+Triggers por comando (tabelas de transição) em transacoes somam a variação
+das despesas concluídas em cada orçamento do usuário cuja categoria (ou
+qualquer categoria, quando o orçamento não tem categoria) e período contêm
+a transação. Um trigger BEFORE em orcamentos recalcula valor_gasto quando
+o orçamento é criado ou muda de usuário, categoria ou período.
+
+Recalcula o valor_gasto de todos os orçamentos existentes.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_valor_gasto_orcamentos'
+down_revision = '0008_indices_usuario_resumo'
+branch_labels = None
+depends_on = None
+
+
+def _variacoes(tabela, sinal):
+    return f"""
+        SELECT usuario_id, categoria_id, data_transacao, {sinal}valor AS valor
+        FROM {tabela}
+        WHERE tipo_transacao = 'despesa'
+          AND COALESCE(status, 'concluida') = 'concluida'
+    """
+
+
+def _aplicar_variacoes(origem):
+    return f"""
+            UPDATE orcamentos o
+            SET valor_gasto = COALESCE(o.valor_gasto, 0) + x.variacao
+            FROM (
+                SELECT b.id, sum(v.valor) AS variacao
+                FROM ({origem}) v
+                JOIN orcamentos b
+                  ON b.usuario_id = v.usuario_id
+                 AND v.data_transacao BETWEEN b.data_inicio AND b.data_fim
+                 AND (b.categoria_id IS NULL OR b.categoria_id = v.categoria_id)
+                GROUP BY b.id
+                HAVING sum(v.valor) <> 0
+                ORDER BY b.id
+            ) x
+            WHERE o.id = x.id;
+    """
+
+
+GASTO_DO_ORCAMENTO = """
+    SELECT COALESCE(sum(t.valor), 0)
+    FROM transacoes t
+    WHERE t.usuario_id = {o}.usuario_id
+      AND t.tipo_transacao = 'despesa'
+      AND COALESCE(t.status, 'concluida') = 'concluida'
+      AND t.data_transacao BETWEEN {o}.data_inicio AND {o}.data_fim
+      AND ({o}.categoria_id IS NULL OR t.categoria_id = {o}.categoria_id)
+"""
+
+
+def upgrade():
+    op.create_index('idx_orcamentos_usuario_periodo', 'orcamentos', ['usuario_id', 'data_inicio', 'data_fim'])
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION atualizar_valor_gasto_orcamentos()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_variacoes(_variacoes('novas', ''))}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_aplicar_variacoes(_variacoes('novas', '') + ' UNION ALL ' + _variacoes('antigas', '-'))}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_variacoes(_variacoes('antigas', '-'))}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Tabelas de transição exigem um trigger por evento
+    op.execute("""
+        CREATE TRIGGER trigger_orcamentos_gasto_insert
+            AFTER INSERT ON transacoes
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_valor_gasto_orcamentos();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_orcamentos_gasto_update
+            AFTER UPDATE ON transacoes
+            REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_valor_gasto_orcamentos();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_orcamentos_gasto_delete
+            AFTER DELETE ON transacoes
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_valor_gasto_orcamentos();
+    """)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION recalcular_valor_gasto_orcamento()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+               OR NEW.usuario_id IS DISTINCT FROM OLD.usuario_id
+               OR NEW.categoria_id IS DISTINCT FROM OLD.categoria_id
+               OR NEW.data_inicio IS DISTINCT FROM OLD.data_inicio
+               OR NEW.data_fim IS DISTINCT FROM OLD.data_fim THEN
+                NEW.valor_gasto := ({GASTO_DO_ORCAMENTO.format(o='NEW')});
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_orcamentos_recalcular_gasto
+            BEFORE INSERT OR UPDATE ON orcamentos
+            FOR EACH ROW EXECUTE FUNCTION recalcular_valor_gasto_orcamento();
+    """)
+
+    op.execute(f"UPDATE orcamentos o SET valor_gasto = ({GASTO_DO_ORCAMENTO.format(o='o')})")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trigger_orcamentos_recalcular_gasto ON orcamentos")
+    op.execute("DROP FUNCTION IF EXISTS recalcular_valor_gasto_orcamento()")
+    for evento in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_orcamentos_gasto_{evento} ON transacoes")
+    op.execute("DROP FUNCTION IF EXISTS atualizar_valor_gasto_orcamentos()")
+    op.drop_index('idx_orcamentos_usuario_periodo', table_name='orcamentos')
@@ -0,0 +1,48 @@
+"""deduplicação de alertas e marca d'água de orçamentos
+
+Revision ID: 0010_alertas_limite_orcamento
+Revises: 0009_valor_gasto_orcamentos
+Create Date: 2026-10-18 00:00:00
+
+Adiciona alertas.chave_deduplicacao com índice único parcial, usado pelos
+geradores de alertas em lote (INSERT ... ON CONFLICT DO NOTHING), e um
+índice em orcamentos.atualizado_em para a avaliação incremental de limites.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_alertas_limite_orcamento'
+down_revision = '0009_valor_gasto_orcamentos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('alertas', sa.Column('chave_deduplicacao', sa.String(200)))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_alertas_chave_deduplicacao',
+            'alertas',
+            ['chave_deduplicacao'],
+            unique=True,
+            postgresql_where=sa.text('chave_deduplicacao IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_orcamentos_ativos_atualizado_em',
+            'orcamentos',
+            ['atualizado_em'],
+            postgresql_where=sa.text('ativo = true'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_orcamentos_ativos_atualizado_em', table_name='orcamentos', postgresql_concurrently=True)
+        op.drop_index('uq_alertas_chave_deduplicacao', table_name='alertas', postgresql_concurrently=True)
+
+    op.drop_column('alertas', 'chave_deduplicacao')
@@ -0,0 +1,86 @@
+"""notificação de alertas por LISTEN/NOTIFY
+
+Revision ID: 0011_notificacao_alertas
+Revises: 0010_alertas_limite_orcamento
+Create Date: 2026-10-18 00:00:00
+
+Triggers por comando em alertas enviam, no canal 'alertas', uma notificação
+por usuário afetado com a quantidade de alertas novos e o total de não
+lidos. As notificações só são entregues no commit, então valem também para
+alertas gerados em SQL pelas tarefas em lote (outros processos).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_notificacao_alertas'
+down_revision = '0010_alertas_limite_orcamento'
+branch_labels = None
+depends_on = None
+
+
+def _notificar(usuarios):
+    return f"""
+            PERFORM pg_notify('alertas', json_build_object(
+                'usuario_id', x.usuario_id,
+                'novos', x.novos,
+                'nao_lidos', (
+                    SELECT count(*)
+                    FROM alertas a
+                    WHERE a.usuario_id = x.usuario_id
+                      AND a.lido = false
+                      AND a.ativo = true
+                )
+            )::text)
+            FROM ({usuarios}) x;
+    """
+
+
+def upgrade():
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notificar_alertas()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_notificar("SELECT usuario_id, count(*) AS novos FROM novas GROUP BY usuario_id")}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_notificar('''
+                    SELECT DISTINCT n.usuario_id, 0 AS novos
+                    FROM novas n
+                    JOIN antigas a ON a.id = n.id
+                    WHERE n.lido IS DISTINCT FROM a.lido
+                       OR n.ativo IS DISTINCT FROM a.ativo
+                ''')}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_notificar("SELECT DISTINCT usuario_id, 0 AS novos FROM antigas WHERE lido = false")}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Tabelas de transição exigem um trigger por evento
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_notificar_insert
+            AFTER INSERT ON alertas
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alertas();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_notificar_update
+            AFTER UPDATE ON alertas
+            REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alertas();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_notificar_delete
+            AFTER DELETE ON alertas
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alertas();
+    """)
+
+
+def downgrade():
+    for evento in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_alertas_notificar_{evento} ON alertas")
+    op.execute("DROP FUNCTION IF EXISTS notificar_alertas()")
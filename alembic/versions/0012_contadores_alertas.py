@@ -0,0 +1,166 @@
+"""contador de alertas não lidos por usuário
+
+Revision ID: 0012_contadores_alertas
+Revises: 0011_notificacao_alertas
+Create Date: 2026-10-18 00:00:00
+
+Cria contadores_alertas (alertas ativos não lidos por usuário), mantido por
+triggers por comando em alertas que aplicam a variação agregada por usuário
+de cada INSERT, UPDATE e DELETE, e faz a carga inicial.
+
+notificar_alertas() passa a ler o total de não lidos do contador em vez de
+contar os alertas; os triggers do contador disparam antes por ordem de nome.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_contadores_alertas'
+down_revision = '0011_notificacao_alertas'
+branch_labels = None
+depends_on = None
+
+
+NAO_LIDOS_CONTADOR = """
+    SELECT COALESCE(
+        (SELECT c.nao_lidos FROM contadores_alertas c WHERE c.usuario_id = x.usuario_id),
+        0
+    )
+"""
+
+NAO_LIDOS_CONTAGEM = """
+    SELECT count(*)
+    FROM alertas a
+    WHERE a.usuario_id = x.usuario_id
+      AND a.lido = false
+      AND a.ativo = true
+"""
+
+
+def _variacoes(tabela, sinal):
+    return f"""
+        SELECT usuario_id, {sinal}1 AS variacao
+        FROM {tabela}
+        WHERE lido = false
+          AND ativo = true
+    """
+
+
+def _aplicar_variacoes(origem):
+    return f"""
+            INSERT INTO contadores_alertas AS c (usuario_id, nao_lidos)
+            SELECT v.usuario_id, sum(v.variacao)
+            FROM ({origem}) v
+            -- Ignora usuários removidos no mesmo comando (ON DELETE CASCADE)
+            JOIN usuarios u ON u.id = v.usuario_id
+            GROUP BY v.usuario_id
+            HAVING sum(v.variacao) <> 0
+            ORDER BY v.usuario_id
+            ON CONFLICT (usuario_id) DO UPDATE
+            SET nao_lidos = c.nao_lidos + EXCLUDED.nao_lidos,
+                atualizado_em = CURRENT_TIMESTAMP;
+    """
+
+
+def _notificar(usuarios, nao_lidos):
+    return f"""
+            PERFORM pg_notify('alertas', json_build_object(
+                'usuario_id', x.usuario_id,
+                'novos', x.novos,
+                'nao_lidos', ({nao_lidos})
+            )::text)
+            FROM ({usuarios}) x;
+    """
+
+
+def _funcao_notificar(nao_lidos):
+    return f"""
+        CREATE OR REPLACE FUNCTION notificar_alertas()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_notificar("SELECT usuario_id, count(*) AS novos FROM novas GROUP BY usuario_id", nao_lidos)}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_notificar('''
+                    SELECT DISTINCT n.usuario_id, 0 AS novos
+                    FROM novas n
+                    JOIN antigas a ON a.id = n.id
+                    WHERE n.lido IS DISTINCT FROM a.lido
+                       OR n.ativo IS DISTINCT FROM a.ativo
+                ''', nao_lidos)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_notificar("SELECT DISTINCT usuario_id, 0 AS novos FROM antigas WHERE lido = false", nao_lidos)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade():
+    op.create_table(
+        'contadores_alertas',
+        sa.Column('usuario_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('usuarios.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('nao_lidos', sa.Integer, nullable=False, server_default=sa.text('0')),
+        sa.Column('atualizado_em', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION atualizar_contadores_alertas()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_variacoes(_variacoes('novas', ''))}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_aplicar_variacoes(_variacoes('novas', '') + ' UNION ALL ' + _variacoes('antigas', '-'))}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_variacoes(_variacoes('antigas', '-'))}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Tabelas de transição exigem um trigger por evento; os nomes ordenam
+    # estes triggers antes de trigger_alertas_notificar_*
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_contadores_insert
+            AFTER INSERT ON alertas
+            REFERENCING NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_contadores_alertas();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_contadores_update
+            AFTER UPDATE ON alertas
+            REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_contadores_alertas();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_alertas_contadores_delete
+            AFTER DELETE ON alertas
+            REFERENCING OLD TABLE AS antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION atualizar_contadores_alertas();
+    """)
+
+    # Carga inicial
+    op.execute("""
+        INSERT INTO contadores_alertas (usuario_id, nao_lidos)
+        SELECT usuario_id, count(*)
+        FROM alertas
+        WHERE lido = false
+          AND ativo = true
+        GROUP BY usuario_id
+    """)
+
+    op.execute(_funcao_notificar(NAO_LIDOS_CONTADOR))
+
+
+def downgrade():
+    op.execute(_funcao_notificar(NAO_LIDOS_CONTAGEM))
+
+    for evento in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_alertas_contadores_{evento} ON alertas")
+    op.execute("DROP FUNCTION IF EXISTS atualizar_contadores_alertas()")
+    op.drop_table('contadores_alertas')
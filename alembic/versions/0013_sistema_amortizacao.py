@@ -0,0 +1,35 @@
+"""sistema de amortização dos empréstimos
+
+Revision ID: 0013_sistema_amortizacao
+Revises: 0012_contadores_alertas
+Create Date: 2026-10-18 00:00:00
+
+Adiciona emprestimos.sistema_amortizacao ('price' ou 'sac'), usado na
+geração do cronograma de parcelas; empréstimos existentes ficam como 'price'.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_sistema_amortizacao'
+down_revision = '0012_contadores_alertas'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'emprestimos',
+        sa.Column('sistema_amortizacao', sa.String(10), nullable=False, server_default=sa.text("'price'"))
+    )
+    op.create_check_constraint(
+        'check_sistema_amortizacao',
+        'emprestimos',
+        "sistema_amortizacao IN ('price', 'sac')"
+    )
+
+
+def downgrade():
+    op.drop_constraint('check_sistema_amortizacao', 'emprestimos', type_='check')
+    op.drop_column('emprestimos', 'sistema_amortizacao')
@@ -1,23 +1,32 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 
-from ..core.database import get_db
-from ..core.security import verify_token
-from ..models.usuario import Usuario
+from ..core.config import settings
+from ..core.replicas import roteador_leitura
+from ..core.principal import (
+    resolver_usuario_id,
+    obter_snapshot_em_cache,
+    carregar_snapshot_usuario,
+    carregar_snapshot_usuario_async,
+)
+from ..schemas.usuario import UsuarioResponse
 
 security = HTTPBearer()
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Usuario:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> UsuarioResponse:
     """
-    Dependency para obter o usuário atual autenticado
+    Dependency para obter o usuário atual autenticado.
+    
+    Claims do token e snapshot do usuário ativo vêm do cache; o banco só é
+    consultado (fora do event loop) quando o usuário não está em cache.
     """
     token = credentials.credentials
-    usuario_id = verify_token(token)
+    usuario_id = resolver_usuario_id(token)
     
     if usuario_id is None:
         raise HTTPException(
@@ -26,10 +35,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    usuario = db.query(Usuario).filter(
-        Usuario.id == usuario_id,
-        Usuario.ativo == True
-    ).first()
+    usuario = obter_snapshot_em_cache(usuario_id)
+    if usuario is None:
+        if settings.DATABASE_ASYNC_ENABLED:
+            usuario = await carregar_snapshot_usuario_async(usuario_id)
+        else:
+            usuario = await run_in_threadpool(carregar_snapshot_usuario, usuario_id)
     
     if usuario is None:
         raise HTTPException(
@@ -40,9 +51,21 @@ async def get_current_user(
     
     return usuario
 
+def get_read_db(
+    current_user: UsuarioResponse = Depends(get_current_user)
+):
+    """
+    Dependency para obter sessão de leitura (réplica ou primário) do usuário atual
+    """
+    db = roteador_leitura.criar_sessao(current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
 def get_current_active_user(
-    current_user: Usuario = Depends(get_current_user)
-) -> Usuario:
+    current_user: UsuarioResponse = Depends(get_current_user)
+) -> UsuarioResponse:
     """
     Dependency para garantir que o usuário está ativo
     """
@@ -51,4 +74,21 @@ def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário inativo"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def verificar_chave_integracao(
+    x_api_key: Optional[str] = Header(None)
+) -> None:
+    """
+    Dependency para endpoints de integração com parceiros (header X-Api-Key)
+    """
+    if not settings.INTEGRACAO_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Integração desabilitada"
+        )
+    if not x_api_key or not secrets.compare_digest(x_api_key, settings.INTEGRACAO_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Chave de integração inválida"
+        )
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db
+from ...core.notificacoes import LimiteConexoesError, barramento_alertas
+from ...services.alerta_service import AlertaService, eventos_alertas
+from ...schemas.alerta import AlertaListaResponse, MarcarLidosResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=AlertaListaResponse)
+def listar_alertas(
+    apenas_nao_lidos: bool = Query(False),
+    limite: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Lista os alertas do usuário, mais recentes primeiro, com o total de não lidos
+    """
+    alerta_service = AlertaService(db)
+    return alerta_service.listar(current_user.id, apenas_nao_lidos, limite)
+
+@router.post("/marcar-lidos", response_model=MarcarLidosResponse)
+def marcar_todos_como_lidos(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Marca todos os alertas do usuário como lidos
+    """
+    alerta_service = AlertaService(db)
+    return alerta_service.marcar_como_lidos(current_user.id)
+
+@router.post("/marcar-lidos/{tipo_alerta}", response_model=MarcarLidosResponse)
+def marcar_tipo_como_lidos(
+    tipo_alerta: str = Path(..., pattern="^(vencimento_fatura|vencimento_emprestimo|limite_orcamento|meta_atingida|saldo_baixo)$"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Marca como lidos os alertas do usuário de um tipo
+    """
+    alerta_service = AlertaService(db)
+    return alerta_service.marcar_como_lidos(current_user.id, tipo_alerta)
+
+@router.get("/stream")
+async def stream_alertas(current_user = Depends(get_current_user)):
+    """
+    Stream de eventos (Server-Sent Events) dos alertas do usuário: `nao_lidos`
+    ao conectar e a cada mudança, `alertas` quando há alertas novos. Substitui
+    o polling; o cliente deve enviar o cabeçalho Authorization.
+    """
+    try:
+        assinatura = barramento_alertas.assinar(str(current_user.id))
+    except LimiteConexoesError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+    return StreamingResponse(
+        eventos_alertas(assinatura),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desativa o buffer de proxies (nginx) para entregar cada evento na hora
+            "X-Accel-Buffering": "no",
+        }
+    )
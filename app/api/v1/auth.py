@@ -1,20 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import Optional
 
 from ...core.database import get_db
-from ...core.security import verify_token
 from ...services.auth_service import AuthService
 from ...schemas.auth import LoginRequest, Token
-from ...schemas.usuario import UsuarioCreate, UsuarioResponse
-from ...models.usuario import Usuario
+from ...schemas.usuario import UsuarioCreate, UsuarioResponse, UsuarioLoteCreate, RegistroLoteResponse
+from ..deps import get_current_user, verificar_chave_integracao
 
 router = APIRouter()
-security = HTTPBearer()
 
 @router.post("/registrar", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
-def registrar_usuario(
+async def registrar_usuario(
     usuario_data: UsuarioCreate,
     db: Session = Depends(get_db)
 ):
@@ -22,52 +18,35 @@ def registrar_usuario(
     Registra um novo usuário no sistema com configurações e categorias padrão
     """
     auth_service = AuthService(db)
-    return auth_service.criar_usuario_completo(usuario_data)
+    return await auth_service.criar_usuario_completo(usuario_data)
 
-@router.post("/login", response_model=Token)
-def fazer_login(
-    login_data: LoginRequest,
-    db: Session = Depends(get_db)
+@router.post("/registrar/lote", response_model=RegistroLoteResponse)
+async def registrar_usuarios_em_lote(
+    lote: UsuarioLoteCreate,
+    db: Session = Depends(get_db),
+    _: None = Depends(verificar_chave_integracao)
 ):
     """
-    Realiza o login do usuário
+    Registra vários usuários (importação de parceiros) com configurações e
+    categorias padrão, informando o resultado de cada linha
     """
     auth_service = AuthService(db)
-    return auth_service.fazer_login(login_data.email, login_data.senha)
+    return await auth_service.criar_usuarios_em_lote(lote.usuarios)
 
-# Dependency para obter usuário atual
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+@router.post("/login", response_model=Token)
+async def fazer_login(
+    login_data: LoginRequest,
     db: Session = Depends(get_db)
-) -> Usuario:
+):
     """
-    Dependency para obter o usuário atual baseado no token JWT
+    Realiza o login do usuário
     """
-    token = credentials.credentials
-    usuario_id = verify_token(token)
-    
-    if usuario_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
     auth_service = AuthService(db)
-    usuario = auth_service.obter_usuario_por_id(usuario_id)
-    
-    if usuario is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return usuario
+    return await auth_service.fazer_login(login_data.email, login_data.senha)
 
 @router.get("/me", response_model=UsuarioResponse)
-def obter_usuario_atual(
-    current_user: Usuario = Depends(get_current_user)
+async def obter_usuario_atual(
+    current_user: UsuarioResponse = Depends(get_current_user)
 ):
     """
     Obtém informações do usuário autenticado
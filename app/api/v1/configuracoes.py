@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import get_db, get_async_db
 from ...models.configuracao_usuario import ConfiguracaoUsuario
 from ...schemas.configuracao_usuario import ConfiguracaoUsuarioResponse, ConfiguracaoUsuarioUpdate
-from .auth import get_current_user
+from ..deps import get_current_user, get_read_db
 
 router = APIRouter()
 
-@router.get("/", response_model=ConfiguracaoUsuarioResponse)
 def obter_configuracoes(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -25,6 +27,31 @@ def obter_configuracoes(
     
     return configuracao
 
+async def obter_configuracoes_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Obtém as configurações do usuário
+    """
+    resultado = await db.execute(
+        select(ConfiguracaoUsuario).where(ConfiguracaoUsuario.usuario_id == current_user.id)
+    )
+    configuracao = resultado.scalars().first()
+    
+    if not configuracao:
+        raise HTTPException(status_code=404, detail="Configurações não encontradas")
+    
+    return configuracao
+
+# Leitura pelo caminho assíncrono (asyncpg) quando DATABASE_ASYNC_ENABLED
+router.add_api_route(
+    "/",
+    obter_configuracoes_async if settings.DATABASE_ASYNC_ENABLED else obter_configuracoes,
+    methods=["GET"],
+    response_model=ConfiguracaoUsuarioResponse
+)
+
 @router.put("/", response_model=ConfiguracaoUsuarioResponse)
 def atualizar_configuracoes(
     configuracao_update: ConfiguracaoUsuarioUpdate,
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+import uuid
+
+from ...services.saldo_service import SaldoService
+from ...schemas.conta_bancaria import SaldoNaDataResponse, HistoricoSaldoResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/{conta_id}/saldo", response_model=SaldoNaDataResponse)
+def obter_saldo_na_data(
+    conta_id: uuid.UUID,
+    data: Optional[date] = Query(None, description="Data do saldo (padrão: hoje)"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Saldo da conta ao final da data informada
+    """
+    saldo_service = SaldoService(db)
+    return saldo_service.saldo_na_data(current_user.id, conta_id, data or date.today())
+
+@router.get("/{conta_id}/historico-saldo", response_model=HistoricoSaldoResponse)
+def obter_historico_saldo(
+    conta_id: uuid.UUID,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Saldos diários registrados da conta no período
+    """
+    saldo_service = SaldoService(db)
+    return saldo_service.historico(current_user.id, conta_id, data_inicio, data_fim)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, datetime
+
+from ...services.resumo_mensal_service import ResumoMensalService
+from ...services.resumo_financeiro_service import ResumoFinanceiroService
+from ...schemas.dashboard import ResumoMensalResponse, EvolucaoMensalResponse, ResumoFinanceiroResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/resumo-financeiro", response_model=ResumoFinanceiroResponse)
+def obter_resumo_financeiro(
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Saldo em contas, dívidas de cartões e empréstimos e patrimônio líquido
+    """
+    resumo_service = ResumoFinanceiroService(db)
+    return resumo_service.obter(current_user.id)
+
+@router.get("/resumo-mensal", response_model=ResumoMensalResponse)
+def obter_resumo_mensal(
+    mes: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Mês no formato AAAA-MM (padrão: mês atual)"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Receitas, despesas e totais por categoria do mês
+    """
+    mes_referencia = datetime.strptime(mes, "%Y-%m").date() if mes else date.today()
+    resumo_service = ResumoMensalService(db)
+    return resumo_service.resumo_do_mes(current_user.id, mes_referencia)
+
+@router.get("/evolucao", response_model=EvolucaoMensalResponse)
+def obter_evolucao_mensal(
+    meses: int = Query(12, ge=1, le=60),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Evolução mês a mês de receitas e despesas até o mês atual
+    """
+    resumo_service = ResumoMensalService(db)
+    return resumo_service.evolucao_mensal(current_user.id, meses)
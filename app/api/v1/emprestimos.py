@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+
+from ...core.database import get_db
+from ...services.amortizacao_service import AmortizacaoService
+from ...services.simulacao_emprestimo_service import SimulacaoEmprestimoService
+from ...schemas.emprestimo import CronogramaResponse, SimulacaoRequest, SimulacaoResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/{emprestimo_id}/cronograma", response_model=CronogramaResponse)
+def obter_cronograma(
+    emprestimo_id: uuid.UUID,
+    sistema: Optional[str] = Query(None, pattern="^(price|sac)$"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Cronograma de amortização do empréstimo: as parcelas gravadas ou, se ainda
+    não existirem (ou outro sistema for pedido), a simulação Price/SAC
+    """
+    amortizacao_service = AmortizacaoService(db)
+    return amortizacao_service.cronograma(current_user.id, emprestimo_id, sistema)
+
+@router.post("/{emprestimo_id}/cronograma", response_model=CronogramaResponse)
+def gerar_cronograma(
+    emprestimo_id: uuid.UUID,
+    sistema: Optional[str] = Query(None, pattern="^(price|sac)$"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Grava as parcelas do empréstimo pelo sistema de amortização informado
+    """
+    amortizacao_service = AmortizacaoService(db)
+    return amortizacao_service.gerar(current_user.id, emprestimo_id, sistema)
+
+@router.post("/{emprestimo_id}/simulacoes", response_model=SimulacaoResponse)
+def simular_emprestimo(
+    emprestimo_id: uuid.UUID,
+    simulacao: SimulacaoRequest,
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Simula pagamentos extras (grade de valores x meses) e refinanciamentos
+    sobre as parcelas em aberto: nova data final, nova parcela e juros economizados
+    """
+    simulacao_service = SimulacaoEmprestimoService(db)
+    return simulacao_service.simular(current_user.id, emprestimo_id, simulacao)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+
+from ...services.orcamento_service import OrcamentoService
+from ...schemas.orcamento import OrcamentoListaResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=OrcamentoListaResponse)
+def listar_orcamentos(
+    ativo: Optional[bool] = Query(True, description="Filtra por orçamentos ativos (vazio: todos)"),
+    data: Optional[date] = Query(None, description="Apenas orçamentos vigentes nesta data"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Lista os orçamentos do usuário com valor gasto e status
+    """
+    orcamento_service = OrcamentoService(db)
+    return orcamento_service.listar(current_user.id, ativo, data)
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+import uuid
+
+from ...core.database import get_db
+from ...services.transacao_service import TransacaoService
+from ...services.importacao_service import ImportacaoService
+from ...services.exportacao_service import exportar_transacoes
+from ...schemas.transacao import TransacaoPagina, TransacaoBuscaPagina, ImportacaoResponse
+from ..deps import get_current_user, get_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=TransacaoPagina)
+def listar_transacoes(
+    cursor: Optional[str] = Query(None, description="Cursor retornado em proximo_cursor"),
+    limite: int = Query(50, ge=1, le=200),
+    tipo_transacao: Optional[str] = Query(None, pattern="^(receita|despesa|transferencia|pagamento_emprestimo|pagamento_cartao)$"),
+    status: Optional[str] = Query(None, pattern="^(pendente|concluida|cancelada)$"),
+    categoria_id: Optional[uuid.UUID] = None,
+    conta_bancaria_id: Optional[uuid.UUID] = None,
+    cartao_credito_id: Optional[uuid.UUID] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Lista as transações do usuário com paginação por cursor
+    """
+    transacao_service = TransacaoService(db)
+    return transacao_service.listar(
+        current_user.id,
+        cursor=cursor,
+        limite=limite,
+        tipo_transacao=tipo_transacao,
+        status_transacao=status,
+        categoria_id=categoria_id,
+        conta_bancaria_id=conta_bancaria_id,
+        cartao_credito_id=cartao_credito_id,
+        data_inicio=data_inicio,
+        data_fim=data_fim
+    )
+
+@router.get("/busca", response_model=TransacaoBuscaPagina)
+def buscar_transacoes(
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Texto ou trecho da descrição"),
+    etiquetas: Optional[List[str]] = Query(None, description="Etiquetas que devem estar todas presentes"),
+    pagina: int = Query(1, ge=1, le=500),
+    tamanho: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Busca transações por texto (descrição e observações) e etiquetas,
+    ordenadas por relevância
+    """
+    if not q and not etiquetas:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe um termo de busca ou ao menos uma etiqueta"
+        )
+    
+    transacao_service = TransacaoService(db)
+    return transacao_service.buscar(current_user.id, q, etiquetas, pagina, tamanho)
+
+@router.get("/exportar")
+def exportar(
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    compactar: bool = Query(False, description="Compacta o arquivo com gzip"),
+    tipo_transacao: Optional[str] = Query(None, pattern="^(receita|despesa|transferencia|pagamento_emprestimo|pagamento_cartao)$"),
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    current_user = Depends(get_current_user)
+):
+    """
+    Exporta o histórico de transações do usuário em CSV ou NDJSON
+    """
+    nome_arquivo = f"transacoes.{formato}" + (".gz" if compactar else "")
+    if compactar:
+        tipo_conteudo = "application/gzip"
+    elif formato == "ndjson":
+        tipo_conteudo = "application/x-ndjson"
+    else:
+        tipo_conteudo = "text/csv; charset=utf-8"
+    
+    return StreamingResponse(
+        exportar_transacoes(
+            current_user.id,
+            formato=formato,
+            compactar=compactar,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            tipo_transacao=tipo_transacao
+        ),
+        media_type=tipo_conteudo,
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    )
+
+@router.post("/importar", response_model=ImportacaoResponse)
+def importar_transacoes(
+    arquivo: UploadFile = File(..., description="Extrato CSV (data;descricao;valor) ou OFX"),
+    conta_bancaria_id: uuid.UUID = Form(...),
+    categoria_id: Optional[uuid.UUID] = Form(None),
+    formato: Optional[str] = Form(None, pattern="^(csv|ofx)$"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Importa um extrato bancário para a conta informada, ignorando lançamentos
+    já existentes
+    """
+    if formato is None:
+        extensao = (arquivo.filename or "").rsplit(".", 1)[-1].lower()
+        if extensao not in ("csv", "ofx"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Informe o formato do arquivo (csv ou ofx)"
+            )
+        formato = extensao
+    
+    importacao_service = ImportacaoService(db)
+    return importacao_service.importar(
+        current_user.id,
+        arquivo.file,
+        formato,
+        conta_bancaria_id,
+        categoria_id=categoria_id
+    )
@@ -0,0 +1,200 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
+import time
+
+import numpy as np
+
+# Cálculo dos cronogramas Price e SAC em centavos, sem banco: usado pelos
+# serviços de empréstimo e pelo modelo Emprestimo
+
+
+class Cronogramas(NamedTuple):
+    """Cronogramas em centavos: uma linha por empréstimo e uma coluna por parcela (zeros após o prazo)"""
+    parcela: np.ndarray
+    amortizacao: np.ndarray
+    juros: np.ndarray
+    saldo: np.ndarray
+    prazos: np.ndarray
+
+
+def para_centavos(valor) -> int:
+    return int((Decimal(valor) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def para_decimal(centavos) -> Decimal:
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def _arredondar(valores: np.ndarray) -> np.ndarray:
+    """Arredonda para centavos inteiros, metade para cima (valores não negativos)"""
+    return np.floor(valores + 0.5).astype(np.int64)
+
+
+def taxa_mensal(taxas_anuais: np.ndarray) -> np.ndarray:
+    """Taxa mensal equivalente (juros compostos) à taxa anual em percentual"""
+    return np.power(1 + np.asarray(taxas_anuais, dtype=np.float64) / 100, 1 / 12) - 1
+
+
+def _fator_price(taxas: np.ndarray, prazos: np.ndarray) -> np.ndarray:
+    """Parcela Price por unidade de principal (sem juros: principal / prazo)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(taxas > 0, taxas / (1 - np.power(1 + taxas, -prazos)), 1 / prazos)
+
+
+def calcular_cronogramas(
+    principais: np.ndarray,
+    taxas_anuais: np.ndarray,
+    prazos: np.ndarray,
+    sac: np.ndarray
+) -> Cronogramas:
+    """
+    Calcula de uma vez os cronogramas de vários empréstimos, percorrendo as
+    parcelas mês a mês com operações sobre todos os empréstimos.
+
+    `principais` em centavos (int64); `sac` indica os empréstimos pelo
+    sistema SAC (amortização constante), os demais seguem a tabela Price
+    (parcela constante). Juros e parcelas são arredondados para centavos a
+    cada mês e a última parcela amortiza exatamente o saldo restante, então
+    a soma das amortizações é sempre igual ao principal.
+    """
+    principais = np.asarray(principais, dtype=np.int64)
+    prazos = np.asarray(prazos, dtype=np.int64)
+    sac = np.asarray(sac, dtype=bool)
+    quantidade = len(principais)
+    prazo_maximo = int(prazos.max()) if quantidade else 0
+    taxas = taxa_mensal(taxas_anuais)
+
+    parcela_price = _arredondar(principais * _fator_price(taxas, prazos))
+    amortizacao_sac = _arredondar(principais / prazos)
+
+    cronogramas = Cronogramas(
+        parcela=np.zeros((quantidade, prazo_maximo), dtype=np.int64),
+        amortizacao=np.zeros((quantidade, prazo_maximo), dtype=np.int64),
+        juros=np.zeros((quantidade, prazo_maximo), dtype=np.int64),
+        saldo=np.zeros((quantidade, prazo_maximo), dtype=np.int64),
+        prazos=prazos,
+    )
+    saldo = principais.copy()
+    for mes in range(prazo_maximo):
+        ativa = mes < prazos
+        juros = np.where(ativa, _arredondar(saldo * taxas), 0)
+        amortizacao = np.where(sac, amortizacao_sac, parcela_price - juros)
+        amortizacao = np.clip(amortizacao, 0, saldo)
+        amortizacao = np.where(mes == prazos - 1, saldo, amortizacao)
+        amortizacao = np.where(ativa, amortizacao, 0)
+        saldo = saldo - amortizacao
+
+        cronogramas.amortizacao[:, mes] = amortizacao
+        cronogramas.juros[:, mes] = juros
+        cronogramas.parcela[:, mes] = amortizacao + juros
+        cronogramas.saldo[:, mes] = saldo
+
+    return cronogramas
+
+
+@lru_cache(maxsize=4096)
+def total_juros(valor_principal, taxa_juros, total_parcelas: int, sistema_amortizacao: Optional[str]) -> Decimal:
+    """Total de juros do cronograma de um empréstimo (memorizado pelos parâmetros)"""
+    cronogramas = calcular_cronogramas(
+        np.array([para_centavos(valor_principal)], dtype=np.int64),
+        np.array([float(taxa_juros or 0)], dtype=np.float64),
+        np.array([total_parcelas], dtype=np.int64),
+        np.array([sistema_amortizacao == "sac"], dtype=bool),
+    )
+    return para_decimal(cronogramas.juros.sum())
+
+
+class PagamentosExtras(NamedTuple):
+    """Resultado por cenário de pagamento extra, em centavos"""
+    prazos: np.ndarray
+    juros: np.ndarray
+    parcelas_seguintes: np.ndarray
+
+
+def simular_pagamentos_extras(
+    saldo: int,
+    taxa: float,
+    prazo: int,
+    valor_parcela: int,
+    amortizacao_sac: int,
+    sac: bool,
+    extras: np.ndarray,
+    meses: np.ndarray,
+    reduzir_parcela: bool = False
+) -> PagamentosExtras:
+    """
+    Simula de uma vez vários cenários de pagamento extra sobre o saldo em
+    aberto de um empréstimo (`taxa` mensal, `prazo` parcelas restantes).
+
+    No cenário k, `extras[k]` centavos são pagos junto com a parcela
+    `meses[k]` (1 = próxima; 0 = sem pagamento extra). Com `reduzir_parcela`
+    a parcela (Price) ou a amortização (SAC) é recalculada para o prazo
+    restante; senão ela é mantida e o prazo encurta. Retorna o número de
+    parcelas até quitar, os juros totais e o valor da parcela seguinte ao
+    pagamento extra.
+    """
+    extras = np.asarray(extras, dtype=np.int64)
+    meses = np.asarray(meses, dtype=np.int64)
+    cenarios = len(extras)
+    saldos = np.full(cenarios, saldo, dtype=np.int64)
+    parcelas = np.full(cenarios, valor_parcela, dtype=np.int64)
+    amortizacoes_sac = np.full(cenarios, amortizacao_sac, dtype=np.int64)
+    juros_totais = np.zeros(cenarios, dtype=np.int64)
+    prazos = np.full(cenarios, prazo, dtype=np.int64)
+    parcelas_seguintes = np.zeros(cenarios, dtype=np.int64)
+
+    for mes in range(1, prazo + 1):
+        ativos = saldos > 0
+        if not ativos.any():
+            break
+        juros = np.where(ativos, _arredondar(saldos * taxa), 0)
+        amortizacao = amortizacoes_sac if sac else parcelas - juros
+        amortizacao = saldos if mes == prazo else np.clip(amortizacao, 0, saldos)
+        saldos = saldos - amortizacao
+        juros_totais += juros
+
+        pagamentos = (meses == mes) & (saldos > 0)
+        if pagamentos.any():
+            saldos = saldos - np.where(pagamentos, np.minimum(extras, saldos), 0)
+            restantes = prazo - mes
+            if reduzir_parcela and restantes > 0:
+                if sac:
+                    amortizacoes_sac = np.where(pagamentos, _arredondar(saldos / restantes), amortizacoes_sac)
+                else:
+                    fator = float(_fator_price(np.array([taxa]), np.array([restantes]))[0])
+                    parcelas = np.where(pagamentos, _arredondar(saldos * fator), parcelas)
+            juros_seguintes = _arredondar(saldos * taxa)
+            if sac:
+                seguintes = np.minimum(amortizacoes_sac, saldos) + juros_seguintes
+            else:
+                seguintes = np.minimum(parcelas, saldos + juros_seguintes)
+            parcelas_seguintes = np.where(pagamentos, np.where(saldos > 0, seguintes, 0), parcelas_seguintes)
+
+        prazos = np.where(ativos & (saldos == 0), mes, prazos)
+
+    return PagamentosExtras(prazos=prazos, juros=juros_totais, parcelas_seguintes=parcelas_seguintes)
+
+
+def medir_simulacao(cenarios: int = 1000, prazo: int = 360) -> Dict[str, Any]:
+    """Benchmark sem banco: grade de `cenarios` pagamentos extras sobre um saldo de `prazo` parcelas"""
+    saldo = 50_000_000
+    taxa = float(taxa_mensal([12.0])[0])
+    valor_parcela = int(_arredondar(saldo * _fator_price(np.array([taxa]), np.array([prazo])))[0])
+    gerador = np.random.default_rng(42)
+    extras = gerador.integers(100_00, 5_000_000, size=cenarios, dtype=np.int64)
+    meses = gerador.integers(1, prazo + 1, size=cenarios, dtype=np.int64)
+
+    antes = time.perf_counter()
+    simular_pagamentos_extras(saldo, taxa, prazo, valor_parcela, 0, False, extras, meses)
+    reduzir_prazo = time.perf_counter() - antes
+    antes = time.perf_counter()
+    simular_pagamentos_extras(saldo, taxa, prazo, valor_parcela, 0, False, extras, meses, reduzir_parcela=True)
+    reduzir_parcela = time.perf_counter() - antes
+
+    return {
+        "cenarios": cenarios,
+        "prazo": prazo,
+        "reduzir_prazo_ms": round(reduzir_prazo * 1000, 2),
+        "reduzir_parcela_ms": round(reduzir_parcela * 1000, 2),
+    }
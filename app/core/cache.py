@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Registro de todos os caches criados no processo (usado pelo endpoint de métricas)
+_caches: Dict[str, "TTLCache"] = {}
+
+_AUSENTE = object()
+
+
+class TTLCache:
+    """
+    Cache em memória com tamanho máximo (LRU) e tempo de vida por entrada.
+
+    É local ao processo: em implantações com vários workers cada um mantém
+    o seu próprio cache, por isso o TTL deve ser curto o suficiente para
+    limitar a janela de dados desatualizados entre workers.
+
+    Para não regravar um valor lido antes de uma invalidação concorrente,
+    obtenha `geracao()` antes da leitura e passe-a a `set`: a gravação é
+    ignorada se a chave foi invalidada depois disso.
+    """
+
+    def __init__(self, nome: str, max_itens: int, ttl_segundos: float):
+        self.nome = nome
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._dados: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Geração da última invalidação de cada chave (limitado a max_itens);
+        # gerações anteriores a _geracao_minima são tratadas como invalidadas
+        self._geracao = 0
+        self._invalidadas: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._geracao_minima = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.expiracoes = 0
+        self.remocoes = 0
+        self.invalidacoes = 0
+        _caches[nome] = self
+
+    def get(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._lock:
+            item = self._dados.get(chave, _AUSENTE)
+            if item is _AUSENTE:
+                self.falhas += 1
+                return padrao
+
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._dados[chave]
+                self.expiracoes += 1
+                self.falhas += 1
+                return padrao
+
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def geracao(self) -> int:
+        """Marca a ser obtida antes de ler o valor que será gravado com `set`"""
+        with self._lock:
+            return self._geracao
+
+    def _invalidada_desde(self, chave: Hashable, geracao: int) -> bool:
+        if geracao < self._geracao_minima:
+            return True
+        return self._invalidadas.get(chave, -1) > geracao
+
+    def _registrar_invalidacao(self, chave: Hashable):
+        self._geracao += 1
+        self._invalidadas[chave] = self._geracao
+        self._invalidadas.move_to_end(chave)
+        while len(self._invalidadas) > self.max_itens:
+            _, geracao = self._invalidadas.popitem(last=False)
+            self._geracao_minima = max(self._geracao_minima, geracao)
+
+    def set(
+        self,
+        chave: Hashable,
+        valor: Any,
+        ttl_segundos: Optional[float] = None,
+        geracao: Optional[int] = None
+    ):
+        ttl = self.ttl_segundos if ttl_segundos is None else min(ttl_segundos, self.ttl_segundos)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if geracao is not None and self._invalidada_desde(chave, geracao):
+                return
+            self._dados[chave] = (time.monotonic() + ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_itens:
+                self._dados.popitem(last=False)
+                self.remocoes += 1
+
+    def invalidate(self, chave: Hashable):
+        with self._lock:
+            self._registrar_invalidacao(chave)
+            if self._dados.pop(chave, _AUSENTE) is not _AUSENTE:
+                self.invalidacoes += 1
+
+    def invalidate_where(self, predicado: Callable[[Hashable, Any], bool]):
+        """Remove todas as entradas cujo (chave, valor) satisfaz o predicado"""
+        with self._lock:
+            chaves = [c for c, (_, v) in self._dados.items() if predicado(c, v)]
+            for chave in chaves:
+                self._registrar_invalidacao(chave)
+                del self._dados[chave]
+            self.invalidacoes += len(chaves)
+
+    def clear(self):
+        with self._lock:
+            self._geracao += 1
+            self._geracao_minima = self._geracao
+            self._invalidadas.clear()
+            self._dados.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "itens": len(self._dados),
+                "max_itens": self.max_itens,
+                "ttl_segundos": self.ttl_segundos,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+                "expiracoes": self.expiracoes,
+                "remocoes": self.remocoes,
+                "invalidacoes": self.invalidacoes,
+            }
+
+
+def estatisticas_caches() -> Dict[str, Dict[str, Any]]:
+    """Retorna as estatísticas de todos os caches registrados"""
+    return {nome: cache.estatisticas() for nome, cache in _caches.items()}
+
+
+def registrar_apos_commit(
+    nome: str,
+    modelos: Iterable[Type],
+    chave: Callable[[Any], Optional[Hashable]],
+    callback: Callable[[Hashable], None],
+    atributos: Optional[Iterable[str]] = None,
+):
+    """
+    Chama `callback(chave)` para cada instância dos modelos inserida, alterada
+    ou removida por uma sessão, somente depois que o commit é confirmado.
+
+    As chaves afetadas são coletadas no flush; em caso de rollback são
+    descartadas. Quando `atributos` é informado, alterações em outros campos
+    são ignoradas.
+    """
+    modelos = tuple(modelos)
+    atributos = tuple(atributos) if atributos else None
+    chave_info = f"_apos_commit_{nome}"
+
+    def _alterado(obj) -> bool:
+        if atributos is None:
+            return True
+        estado = inspect(obj)
+        return any(estado.attrs[attr].history.has_changes() for attr in atributos)
+
+    @event.listens_for(Session, "after_flush")
+    def _coletar(session, flush_context):
+        pendentes = session.info.setdefault(chave_info, set())
+        for obj in session.new:
+            if isinstance(obj, modelos):
+                pendentes.add(chave(obj))
+        for obj in session.deleted:
+            if isinstance(obj, modelos):
+                pendentes.add(chave(obj))
+        for obj in session.dirty:
+            if isinstance(obj, modelos) and _alterado(obj):
+                pendentes.add(chave(obj))
+
+    @event.listens_for(Session, "after_commit")
+    def _confirmar(session):
+        for item in session.info.pop(chave_info, ()):
+            if item is not None:
+                callback(item)
+
+    @event.listens_for(Session, "after_rollback")
+    def _descartar(session):
+        session.info.pop(chave_info, None)
+
+
+def invalidar_apos_commit(
+    cache: TTLCache,
+    modelos: Iterable[Type],
+    chave: Callable[[Any], Optional[Hashable]],
+    atributos: Optional[Iterable[str]] = None,
+):
+    """
+    Invalida entradas do cache quando instâncias dos modelos são inseridas,
+    alteradas ou removidas por uma sessão.
+
+    A invalidação só acontece após o commit, evitando que uma leitura
+    concorrente recoloque no cache um valor anterior ao commit.
+    """
+    registrar_apos_commit(f"invalidar_{cache.nome}", modelos, chave, cache.invalidate, atributos)
@@ -1,18 +1,26 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
+from app.core.pool_metrics import MetricasPool, classe_pool_instrumentada
+
+# Criar engine com o pool configurado pelo Settings e instrumentado
+metricas_pool = MetricasPool("principal")
 
-# Criar engine com configurações otimizadas
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.DEBUG
+    poolclass=classe_pool_instrumentada(metricas_pool),
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    echo=settings.DB_ECHO
 )
+metricas_pool.instrumentar(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -28,33 +36,57 @@ def get_db():
     finally:
         db.close()
 
-def create_tables():
+# Engine assíncrona (asyncpg), opcional e criada sob demanda
+_async_engine = None
+_AsyncSessionLocal = None
+metricas_pool_async = MetricasPool("assincrono")
+
+def get_async_database_url() -> str:
+    """URL da engine assíncrona; por padrão a DATABASE_URL com o driver asyncpg"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+def get_async_engine():
     """
-    Função para criar todas as tabelas no banco de dados
+    Retorna a engine assíncrona, criando-a no primeiro uso
     """
-    try:
-        # Importar todos os models para garantir que sejam registrados
-        from app.models.usuario import Usuario
-        from app.models.categoria import Categoria
-        from app.models.conta_bancaria import ContaBancaria
-        from app.models.cartao_credito import CartaoCredito
-        from app.models.emprestimo import Emprestimo
-        from app.models.transacao import Transacao
-        from app.models.fatura_cartao import FaturaCartao
-        from app.models.parcela_emprestimo import ParcelaEmprestimo
-        from app.models.orcamento import Orcamento
-        from app.models.meta_financeira import MetaFinanceira
-        from app.models.alerta import Alerta
-        from app.models.configuracao_usuario import ConfiguracaoUsuario
-        
-        # Criar todas as tabelas
-        Base.metadata.create_all(bind=engine)
-        
-        print("✅ Todas as tabelas foram criadas com sucesso!")
-        
-    except SQLAlchemyError as e:
-        print(f"❌ Erro ao criar tabelas: {e}")
-        raise e
+    global _async_engine, _AsyncSessionLocal
+    if not settings.DATABASE_ASYNC_ENABLED:
+        raise RuntimeError("Engine assíncrona desabilitada (DATABASE_ASYNC_ENABLED=false)")
+    
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            poolclass=classe_pool_instrumentada(metricas_pool_async, assincrono=True),
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_size=settings.ASYNC_DB_POOL_SIZE,
+            max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            echo=settings.DB_ECHO
+        )
+        metricas_pool_async.instrumentar(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+def get_async_sessionmaker():
+    get_async_engine()
+    return _AsyncSessionLocal
+
+async def get_async_db():
+    """
+    Dependency para obter sessão assíncrona do banco de dados
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+async def dispose_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
 
 def test_connection():
     """
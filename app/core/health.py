@@ -0,0 +1,160 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import metricas_pool
+from app.core.replicas import roteador_leitura
+
+# Conexão própria do health check, fora do pool das requisições: com o pool
+# principal cheio a verificação continua medindo o banco em vez de esperar
+# um checkout (até DB_POOL_TIMEOUT_SECONDS) e marcar o worker como indisponível
+_engine_verificacao = create_engine(
+    settings.DATABASE_URL,
+    poolclass=NullPool,
+    connect_args={
+        "connect_timeout": max(1, math.ceil(settings.HEALTH_CHECK_TIMEOUT_SECONDS)),
+        "options": f"-c statement_timeout={int(settings.HEALTH_CHECK_TIMEOUT_SECONDS * 1000)}",
+    },
+)
+
+
+def _agora_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MonitorSaude:
+    """
+    Verifica periodicamente o banco e o pool de conexões em segundo plano.
+
+    Os endpoints de health apenas leem o último resultado, sem tocar no
+    banco, então podem ser chamados pelo load balancer com alta frequência.
+    """
+
+    def __init__(self):
+        self.iniciado_em = _agora_iso()
+        self._tarefa: Optional[asyncio.Task] = None
+        # Thread própria da verificação: pelo threadpool do anyio (40 threads,
+        # compartilhadas com as rotas síncronas) o SELECT 1 esperaria na fila
+        # justamente quando o worker está sobrecarregado
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-check")
+        self._verificado_em_monotonic: Optional[float] = None
+        self._resultado: Dict[str, Any] = {
+            "status": "iniciando",
+            "database": {"status": "desconhecido"},
+            "timestamp": None,
+        }
+
+    def _consultar_banco(self):
+        with _engine_verificacao.connect() as conexao:
+            conexao.execute(text("SELECT 1"))
+
+    async def _verificar_banco(self) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._consultar_banco),
+                timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS
+            )
+            return {
+                "status": "conectado",
+                "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2),
+            }
+        except asyncio.TimeoutError:
+            return {
+                "status": "timeout",
+                "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "erro": f"Sem resposta em {settings.HEALTH_CHECK_TIMEOUT_SECONDS}s",
+            }
+        except Exception as e:
+            return {
+                "status": "desconectado",
+                "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "erro": str(e),
+            }
+
+    async def verificar(self) -> Dict[str, Any]:
+        """Executa as verificações e atualiza o resultado em cache"""
+        pool = metricas_pool.estatisticas()
+        pool_saturado = pool["em_uso"] >= settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        banco = await self._verificar_banco()
+
+        if banco["status"] != "conectado":
+            status = "indisponivel"
+        elif pool_saturado:
+            # Banco respondendo com o pool cheio: ocupado, mas ainda pronto
+            status = "degradado"
+        else:
+            status = "saudavel"
+
+        self._resultado = {
+            "status": status,
+            "database": banco,
+            "pool": {
+                "tamanho": pool["tamanho"],
+                "em_uso": pool["em_uso"],
+                "overflow": pool["overflow"],
+                "saturado": pool_saturado,
+                "espera_checkout_p99_ms": pool["espera_checkout"]["p99_ms"],
+            },
+            "replicas": roteador_leitura.estado()["replicas"],
+            "timestamp": _agora_iso(),
+        }
+        self._verificado_em_monotonic = time.monotonic()
+        return self._resultado
+
+    async def _executar(self):
+        while True:
+            try:
+                await self.verificar()
+            except Exception as e:
+                print(f"❌ Erro no health check: {e}")
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL_SECONDS)
+
+    def iniciar(self):
+        if self._tarefa is None:
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def liveness(self) -> Dict[str, Any]:
+        """O processo está respondendo (não depende do banco)"""
+        return {
+            "status": "vivo",
+            "iniciado_em": self.iniciado_em,
+            "timestamp": _agora_iso(),
+        }
+
+    def prontidao(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Último resultado das verificações; não está pronto se o banco estiver
+        indisponível ou se o resultado for mais antigo que HEALTH_CHECK_STALE_SECONDS
+        """
+        resultado = dict(self._resultado)
+        if self._verificado_em_monotonic is None:
+            return False, resultado
+
+        idade = time.monotonic() - self._verificado_em_monotonic
+        resultado["idade_verificacao_segundos"] = round(idade, 2)
+        if idade > settings.HEALTH_CHECK_STALE_SECONDS:
+            resultado["status"] = "desatualizado"
+            return False, resultado
+
+        return resultado["status"] != "indisponivel", resultado
+
+
+monitor_saude = MonitorSaude()
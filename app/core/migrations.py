@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Any, Dict
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from app.core.database import engine
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def get_alembic_config() -> Config:
+    """Configuração do Alembic com caminhos absolutos (independe do diretório atual)"""
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    return config
+
+
+def verificar_versao_schema() -> Dict[str, Any]:
+    """
+    Compara a revisão aplicada no banco com a última revisão das migrações.
+    
+    Apenas lê a tabela alembic_version; não cria nem altera nada.
+    """
+    esperadas = set(ScriptDirectory.from_config(get_alembic_config()).get_heads())
+    
+    with engine.connect() as conexao:
+        atuais = set(MigrationContext.configure(conexao).get_current_heads())
+    
+    return {
+        "atual": sorted(atuais),
+        "esperada": sorted(esperadas),
+        "atualizado": atuais == esperadas
+    }
+
+
+def aplicar_migracoes(revisao: str = "head"):
+    """Aplica as migrações pendentes até a revisão informada"""
+    command.upgrade(get_alembic_config(), revisao)
@@ -0,0 +1,304 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import registrar_apos_commit
+from app.core.config import settings
+from app.models.alerta import Alerta
+
+# Canal usado pelos triggers da migração 0011
+CANAL_ALERTAS = "alertas"
+
+# Pede que o total de não lidos do usuário seja relido (eventos descartados, alterações locais)
+SINCRONIZAR = {"evento": "sincronizar"}
+
+
+class LimiteConexoesError(Exception):
+    """Limite de streams abertos no worker ou por usuário atingido"""
+
+
+class Assinatura:
+    """Stream aberto de um usuário, com fila de eventos de tamanho fixo"""
+
+    __slots__ = ("usuario_id", "fila", "descartes")
+
+    def __init__(self, usuario_id: str, tamanho_fila: int):
+        self.usuario_id = usuario_id
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho_fila)
+        self.descartes = 0
+
+
+class BarramentoAlertas:
+    """
+    Pub/sub em memória dos eventos de alertas, por usuário.
+
+    Cada stream tem uma fila limitada: um cliente lento não acumula eventos;
+    quando a fila enche ela é esvaziada e o usuário é sincronizado, o que
+    resume o que foi perdido. `publicar` pode ser chamado de qualquer thread
+    (ex.: callbacks de commit em rotas síncronas).
+
+    A sincronização é feita por usuário, não por stream: uma tarefa lê em
+    lotes o total de não lidos dos usuários pendentes (uma consulta por
+    lote, espaçadas por ALERTAS_STREAM_SINCRONIZACAO_INTERVALO_SECONDS) e
+    entrega o evento pronto a todos os streams de cada usuário. Assim uma
+    reconexão do LISTEN não dispara uma leitura por aba aberta.
+    """
+
+    def __init__(self):
+        self._assinaturas: Dict[str, Set[Assinatura]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._contador: Optional[Callable[[List[str]], Dict[str, int]]] = None
+        self._pendentes: Set[str] = set()
+        self._sinal_pendentes: Optional[asyncio.Event] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self.conexoes = 0
+        self.eventos_publicados = 0
+        self.filas_descartadas = 0
+        self.sincronizacoes = 0
+
+    def definir_contador(self, contador: Callable[[List[str]], Dict[str, int]]):
+        """Função (executada em thread) que retorna o total de não lidos de cada usuário"""
+        self._contador = contador
+
+    def iniciar(self):
+        self._loop = asyncio.get_running_loop()
+        self._sinal_pendentes = asyncio.Event()
+        if self._pendentes:
+            self._sinal_pendentes.set()
+        self._tarefa = asyncio.create_task(self._sincronizar_pendentes())
+
+    def assinar(self, usuario_id: str) -> Assinatura:
+        if self.conexoes >= settings.ALERTAS_STREAM_MAX_CONEXOES:
+            raise LimiteConexoesError("Limite de streams de alertas do servidor atingido")
+        assinaturas = self._assinaturas.setdefault(usuario_id, set())
+        if len(assinaturas) >= settings.ALERTAS_STREAM_MAX_CONEXOES_POR_USUARIO:
+            raise LimiteConexoesError("Limite de streams de alertas abertos para o usuário atingido")
+
+        assinatura = Assinatura(usuario_id, settings.ALERTAS_STREAM_FILA_MAX)
+        assinaturas.add(assinatura)
+        self.conexoes += 1
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        assinaturas = self._assinaturas.get(assinatura.usuario_id)
+        if assinaturas is None or assinatura not in assinaturas:
+            return
+        assinaturas.discard(assinatura)
+        if not assinaturas:
+            del self._assinaturas[assinatura.usuario_id]
+        self.conexoes -= 1
+
+    def _entregar(self, assinatura: Assinatura, evento: Optional[Dict[str, Any]]):
+        try:
+            assinatura.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            while not assinatura.fila.empty():
+                assinatura.fila.get_nowait()
+            assinatura.descartes += 1
+            self.filas_descartadas += 1
+            if evento is None:
+                assinatura.fila.put_nowait(None)
+            else:
+                self._agendar_sincronizacao(assinatura.usuario_id)
+
+    def _agendar_sincronizacao(self, usuario_id: str):
+        self._pendentes.add(usuario_id)
+        if self._sinal_pendentes is not None:
+            self._sinal_pendentes.set()
+
+    def _publicar_no_loop(self, usuario_id: str, evento: Dict[str, Any]):
+        if evento is SINCRONIZAR:
+            if usuario_id in self._assinaturas:
+                self._agendar_sincronizacao(usuario_id)
+            return
+        for assinatura in self._assinaturas.get(usuario_id, ()):
+            self._entregar(assinatura, evento)
+        self.eventos_publicados += 1
+
+    async def _sincronizar_pendentes(self):
+        lote_maximo = settings.ALERTAS_STREAM_SINCRONIZACAO_LOTE
+        while True:
+            await self._sinal_pendentes.wait()
+            self._sinal_pendentes.clear()
+            while self._pendentes:
+                # Usuários que fecharam todos os streams não precisam ser lidos
+                lote = list(itertools.islice(self._pendentes, lote_maximo))
+                self._pendentes.difference_update(lote)
+                lote = [u for u in lote if u in self._assinaturas]
+                if lote and self._contador is not None:
+                    try:
+                        contagens = await run_in_threadpool(self._contador, lote)
+                    except Exception as e:
+                        print(f"❌ Erro ao sincronizar streams de alertas: {e}")
+                        self._pendentes.update(lote)
+                        contagens = {}
+                    for usuario_id, nao_lidos in contagens.items():
+                        evento = {"evento": "nao_lidos", "nao_lidos": nao_lidos}
+                        for assinatura in list(self._assinaturas.get(usuario_id, ())):
+                            self._entregar(assinatura, evento)
+                    self.sincronizacoes += len(contagens)
+                if self._pendentes:
+                    await asyncio.sleep(settings.ALERTAS_STREAM_SINCRONIZACAO_INTERVALO_SECONDS)
+
+    def publicar(self, usuario_id: str, evento: Dict[str, Any]):
+        if self._loop is None:
+            return
+        try:
+            mesmo_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            mesmo_loop = False
+
+        if mesmo_loop:
+            self._publicar_no_loop(str(usuario_id), evento)
+        else:
+            self._loop.call_soon_threadsafe(self._publicar_no_loop, str(usuario_id), evento)
+
+    def sincronizar_todos(self):
+        """Sincroniza todos os usuários com streams abertos (ex.: após reconectar o LISTEN)"""
+        for usuario_id in self._assinaturas:
+            self._agendar_sincronizacao(usuario_id)
+
+    def encerrar(self):
+        """Encerra os streams abertos (None sinaliza o fim)"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            self._tarefa = None
+        for assinaturas in self._assinaturas.values():
+            for assinatura in assinaturas:
+                self._entregar(assinatura, None)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "conexoes": self.conexoes,
+            "usuarios": len(self._assinaturas),
+            "eventos_publicados": self.eventos_publicados,
+            "filas_descartadas": self.filas_descartadas,
+            "sincronizacoes": self.sincronizacoes,
+            "sincronizacoes_pendentes": len(self._pendentes),
+        }
+
+
+class PonteNotifyAlertas:
+    """
+    Escuta o canal 'alertas' do Postgres em uma conexão dedicada e repassa as
+    notificações ao barramento, levando a cada worker os alertas criados por
+    outros workers e pelas tarefas em lote.
+
+    A conexão é lida pelo event loop (add_reader), sem thread própria; se
+    cair, é refeita e todos os streams são sincronizados, pois notificações
+    enviadas nesse intervalo se perdem.
+    """
+
+    def __init__(self, barramento: BarramentoAlertas):
+        self.barramento = barramento
+        self._tarefa: Optional[asyncio.Task] = None
+        self._conexao = None
+        self._perdida: Optional[asyncio.Event] = None
+        self.conectada = False
+        self.notificacoes = 0
+        self.reconexoes = 0
+
+    def _conectar(self):
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        # Keepalive detecta conexões mortas sem tráfego (LISTEN fica ocioso)
+        conexao = psycopg2.connect(dsn, keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
+        conexao.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conexao.cursor() as cursor:
+            cursor.execute(f"LISTEN {CANAL_ALERTAS}")
+        return conexao
+
+    def _ler(self):
+        if self._perdida.is_set():
+            return
+        try:
+            self._conexao.poll()
+        except psycopg2.Error as e:
+            print(f"❌ Conexão LISTEN de alertas perdida: {e}")
+            self._perdida.set()
+            return
+
+        while self._conexao.notifies:
+            notificacao = self._conexao.notifies.pop(0)
+            self.notificacoes += 1
+            try:
+                dados = json.loads(notificacao.payload)
+            except ValueError:
+                continue
+            self.barramento.publicar(dados["usuario_id"], {"evento": "alertas", "dados": dados})
+
+    async def _executar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                self._conexao = await run_in_threadpool(self._conectar)
+            except Exception as e:
+                print(f"❌ Erro ao conectar o LISTEN de alertas: {e}")
+                await asyncio.sleep(settings.ALERTAS_NOTIFY_RECONEXAO_SECONDS)
+                continue
+
+            descritor = self._conexao.fileno()
+            self._perdida = asyncio.Event()
+            loop.add_reader(descritor, self._ler)
+            self.conectada = True
+            # Notificações enviadas enquanto a conexão não existia se perderam
+            self.barramento.sincronizar_todos()
+            try:
+                await self._perdida.wait()
+            finally:
+                loop.remove_reader(descritor)
+                self.conectada = False
+                self._conexao.close()
+                self._conexao = None
+
+            self.reconexoes += 1
+            await asyncio.sleep(settings.ALERTAS_NOTIFY_RECONEXAO_SECONDS)
+
+    def iniciar(self):
+        if self._tarefa is None:
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "habilitada": settings.ALERTAS_NOTIFY_ENABLED,
+            "conectada": self.conectada,
+            "notificacoes": self.notificacoes,
+            "reconexoes": self.reconexoes,
+        }
+
+
+barramento_alertas = BarramentoAlertas()
+ponte_alertas = PonteNotifyAlertas(barramento_alertas)
+
+
+def notificar_alteracao_alertas(usuario_id: str):
+    """
+    Avisa os streams do usuário neste processo que os alertas mudaram; com a
+    ponte ativa os triggers já notificam todos os workers, inclusive este
+    """
+    if not settings.ALERTAS_NOTIFY_ENABLED:
+        barramento_alertas.publicar(usuario_id, SINCRONIZAR)
+
+
+# Alertas criados ou lidos pelo ORM neste processo
+registrar_apos_commit(
+    "stream_alertas",
+    modelos=[Alerta],
+    chave=lambda alerta: str(alerta.usuario_id),
+    callback=notificar_alteracao_alertas,
+    atributos=["lido", "ativo"],
+)
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Métricas de todos os pools instrumentados no processo
+_metricas: Dict[str, "MetricasPool"] = {}
+
+
+class MetricasPool:
+    """
+    Coleta métricas de um pool de conexões via eventos do SQLAlchemy.
+
+    O tempo de espera no checkout é medido pela classe de pool gerada em
+    `classe_pool_instrumentada`, já que não existe evento antes do checkout.
+    """
+
+    def __init__(self, nome: str, amostras: int = 1000):
+        self.nome = nome
+        self.engine = None
+        self._lock = threading.Lock()
+        self._esperas = deque(maxlen=amostras)
+        self._criacao_conexoes: Dict[int, float] = {}
+        self.conexoes_criadas = 0
+        self.conexoes_fechadas = 0
+        self.conexoes_invalidadas = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.esperas_total = 0
+        self.espera_total_segundos = 0.0
+        self.espera_maxima_segundos = 0.0
+        _metricas[nome] = self
+
+    def registrar_espera(self, segundos: float):
+        with self._lock:
+            self._esperas.append(segundos)
+            self.esperas_total += 1
+            self.espera_total_segundos += segundos
+            self.espera_maxima_segundos = max(self.espera_maxima_segundos, segundos)
+
+    def instrumentar(self, engine):
+        """
+        Registra os listeners de eventos de pool na engine (para engines
+        assíncronas, usar `sync_engine`)
+        """
+        self.engine = engine
+
+        @event.listens_for(engine, "connect")
+        def _connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.conexoes_criadas += 1
+                self._criacao_conexoes[id(connection_record)] = time.monotonic()
+
+        @event.listens_for(engine, "close")
+        def _close(dbapi_connection, connection_record):
+            with self._lock:
+                self.conexoes_fechadas += 1
+                self._criacao_conexoes.pop(id(connection_record), None)
+
+        @event.listens_for(engine, "invalidate")
+        def _invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.conexoes_invalidadas += 1
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+    def _percentil(self, valores, percentil: float) -> float:
+        if not valores:
+            return 0.0
+        indice = min(len(valores) - 1, int(round(percentil * (len(valores) - 1))))
+        return valores[indice]
+
+    def estatisticas(self) -> Dict[str, Any]:
+        agora = time.monotonic()
+        with self._lock:
+            esperas = sorted(self._esperas)
+            idades = [agora - criada for criada in self._criacao_conexoes.values()]
+            dados = {
+                "conexoes_criadas": self.conexoes_criadas,
+                "conexoes_fechadas": self.conexoes_fechadas,
+                "conexoes_invalidadas": self.conexoes_invalidadas,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "espera_checkout": {
+                    "total": self.esperas_total,
+                    "media_ms": round(self.espera_total_segundos / self.esperas_total * 1000, 3) if self.esperas_total else 0.0,
+                    "p50_ms": round(self._percentil(esperas, 0.50) * 1000, 3),
+                    "p99_ms": round(self._percentil(esperas, 0.99) * 1000, 3),
+                    "maxima_ms": round(self.espera_maxima_segundos * 1000, 3),
+                },
+                "idade_conexoes_segundos": {
+                    "abertas": len(idades),
+                    "minima": round(min(idades), 1) if idades else 0.0,
+                    "media": round(sum(idades) / len(idades), 1) if idades else 0.0,
+                    "maxima": round(max(idades), 1) if idades else 0.0,
+                },
+            }
+
+        if self.engine is not None:
+            pool = self.engine.pool
+            dados.update({
+                "tamanho": pool.size(),
+                "em_uso": pool.checkedout(),
+                "disponiveis": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return dados
+
+
+def classe_pool_instrumentada(metricas: MetricasPool, assincrono: bool = False):
+    """
+    Gera uma subclasse de QueuePool que mede o tempo de espera no checkout.
+
+    A métrica fica na própria classe para sobreviver ao `recreate()` do pool
+    (ex.: após `engine.dispose()`).
+    """
+    base = AsyncAdaptedQueuePool if assincrono else QueuePool
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            self._metricas.registrar_espera(time.perf_counter() - inicio)
+
+    return type(f"{base.__name__}Instrumentado", (base,), {"_metricas": metricas, "_do_get": _do_get})
+
+
+def estatisticas_pools() -> Dict[str, Dict[str, Any]]:
+    """Retorna as métricas de todos os pools instrumentados"""
+    return {nome: metricas.estatisticas() for nome, metricas in _metricas.items()}
@@ -0,0 +1,106 @@
+import time
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.core.cache import TTLCache, invalidar_apos_commit
+from app.core.config import settings
+from app.core.database import get_async_sessionmaker
+from app.core.replicas import roteador_leitura
+from app.core.security import decode_token
+from app.models.usuario import Usuario
+from app.schemas.usuario import UsuarioResponse
+
+# Token -> id do usuário (claims já validadas, expiram junto com o token)
+_cache_tokens = TTLCache(
+    "principal_tokens",
+    max_itens=settings.PRINCIPAL_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Id do usuário -> snapshot do usuário ativo
+_cache_usuarios = TTLCache(
+    "principal_usuarios",
+    max_itens=settings.PRINCIPAL_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Qualquer alteração de status, email ou perfil descarta o snapshot
+invalidar_apos_commit(
+    _cache_usuarios,
+    modelos=[Usuario],
+    chave=lambda usuario: str(usuario.id),
+    atributos=["ativo", "email", "primeiro_nome", "ultimo_nome", "telefone"],
+)
+
+
+def resolver_usuario_id(token: str) -> Optional[str]:
+    """
+    Retorna o id do usuário do token, decodificando o JWT apenas na primeira vez
+    """
+    usuario_id = _cache_tokens.get(token)
+    if usuario_id is not None:
+        return usuario_id
+
+    payload = decode_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    usuario_id = str(payload["sub"])
+    ttl = None
+    if payload.get("exp") is not None:
+        ttl = payload["exp"] - time.time()
+    _cache_tokens.set(token, usuario_id, ttl_segundos=ttl)
+    return usuario_id
+
+
+def obter_snapshot_em_cache(usuario_id: str) -> Optional[UsuarioResponse]:
+    """Retorna o snapshot do usuário se estiver em cache"""
+    return _cache_usuarios.get(usuario_id)
+
+
+def carregar_snapshot_usuario(usuario_id: str) -> Optional[UsuarioResponse]:
+    """
+    Busca o usuário ativo no banco (réplica de leitura, se houver) e guarda
+    o snapshot no cache, a menos que ele tenha sido invalidado durante a busca
+    """
+    geracao = _cache_usuarios.geracao()
+    db = roteador_leitura.criar_sessao(usuario_id)
+    try:
+        usuario = db.query(Usuario).filter(
+            Usuario.id == usuario_id,
+            Usuario.ativo == True
+        ).first()
+
+        if usuario is None:
+            return None
+
+        snapshot = UsuarioResponse.from_orm(usuario)
+    finally:
+        db.close()
+
+    _cache_usuarios.set(usuario_id, snapshot, geracao=geracao)
+    return snapshot
+
+
+async def carregar_snapshot_usuario_async(usuario_id: str) -> Optional[UsuarioResponse]:
+    """
+    Mesma busca de carregar_snapshot_usuario, pela engine assíncrona
+    """
+    geracao = _cache_usuarios.geracao()
+    async with get_async_sessionmaker()() as db:
+        resultado = await db.execute(
+            select(Usuario).where(Usuario.id == usuario_id, Usuario.ativo == True)
+        )
+        usuario = resultado.scalars().first()
+        if usuario is None:
+            return None
+        snapshot = UsuarioResponse.from_orm(usuario)
+    
+    _cache_usuarios.set(usuario_id, snapshot, geracao=geracao)
+    return snapshot
+
+
+def invalidar_usuario(usuario_id: str):
+    """Remove o snapshot do usuário do cache"""
+    _cache_usuarios.invalidate(str(usuario_id))
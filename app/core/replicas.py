@@ -0,0 +1,277 @@
+import asyncio
+import itertools
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from app.core.cache import registrar_apos_commit
+from app.core.config import settings
+from app.core.database import Base, SessionLocal
+from app.core.pool_metrics import MetricasPool, classe_pool_instrumentada
+
+
+class Replica:
+    """Réplica de leitura com estado de saúde verificado periodicamente em segundo plano"""
+
+    def __init__(self, url: str, indice: int):
+        self.nome = f"replica_{indice}"
+        metricas = MetricasPool(self.nome)
+        self.engine = create_engine(
+            url,
+            poolclass=classe_pool_instrumentada(metricas),
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            connect_args={"connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+            echo=settings.DB_ECHO
+        )
+        metricas.instrumentar(self.engine)
+        # Health check em conexão própria: com o pool cheio ele não espera checkout
+        self._engine_verificacao = create_engine(
+            url,
+            poolclass=NullPool,
+            connect_args={
+                "connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS,
+                "options": f"-c statement_timeout={settings.REPLICA_CONNECT_TIMEOUT_SECONDS * 1000}",
+            },
+        )
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.saudavel = True
+        self.verificada_em = 0.0
+        self.ultimo_erro: Optional[str] = None
+
+        # Erros de conexão durante consultas marcam a réplica como indisponível
+        @event.listens_for(self.engine, "handle_error")
+        def _marcar_falha(contexto):
+            if contexto.is_disconnect:
+                self.marcar_indisponivel(str(contexto.original_exception))
+
+    def marcar_indisponivel(self, erro: str):
+        self.saudavel = False
+        self.ultimo_erro = erro
+        self.verificada_em = time.monotonic()
+
+    def verificar(self) -> bool:
+        """Executa o health check (SELECT 1) e atualiza o estado"""
+        try:
+            with self._engine_verificacao.connect() as conexao:
+                conexao.execute(text("SELECT 1"))
+            self.saudavel = True
+            self.ultimo_erro = None
+        except Exception as e:
+            self.saudavel = False
+            self.ultimo_erro = str(e)
+        self.verificada_em = time.monotonic()
+        return self.saudavel
+
+    def disponivel(self) -> bool:
+        """
+        Último estado de saúde conhecido; nunca consulta o banco, a verificação
+        é feita pelo RoteadorLeitura em segundo plano
+        """
+        return self.saudavel
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "saudavel": self.saudavel,
+            "verificada_ha_segundos": round(time.monotonic() - self.verificada_em, 1) if self.verificada_em else None,
+            "ultimo_erro": self.ultimo_erro,
+        }
+
+
+class MarcadorEscrita:
+    """Última escrita conhecida do cliente na requisição atual (timestamp Unix)"""
+
+    __slots__ = ("ultima_escrita", "escreveu")
+
+    def __init__(self, ultima_escrita: Optional[float]):
+        self.ultima_escrita = ultima_escrita
+        self.escreveu = False
+
+    def recente(self) -> bool:
+        if self.ultima_escrita is None:
+            return False
+        return 0 <= time.time() - self.ultima_escrita <= settings.READ_YOUR_WRITES_SECONDS
+
+
+# Marcador da requisição em andamento; o objeto é compartilhado com as threads
+# do threadpool (que recebem uma cópia do contexto), então escritas feitas
+# nelas aparecem na resposta
+_marcador_requisicao: ContextVar[Optional[MarcadorEscrita]] = ContextVar("marcador_escrita", default=None)
+
+
+def _ler_ultima_escrita(headers) -> Optional[float]:
+    valor = None
+    for nome, conteudo in headers:
+        if nome == b"x-ultima-escrita":
+            valor = conteudo.decode("latin-1")
+        elif nome == b"cookie" and valor is None:
+            cookie = SimpleCookie()
+            try:
+                cookie.load(conteudo.decode("latin-1"))
+            except Exception:
+                continue
+            if settings.READ_YOUR_WRITES_COOKIE in cookie:
+                valor = cookie[settings.READ_YOUR_WRITES_COOKIE].value
+    try:
+        return float(valor) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class LeiaSuasEscritasMiddleware:
+    """
+    Leva o instante da última escrita do cliente entre requisições: quando a
+    requisição grava algo, a resposta devolve o cookie READ_YOUR_WRITES_COOKIE
+    (e o cabeçalho X-Ultima-Escrita, para clientes sem cookies); enquanto ele
+    tiver menos de READ_YOUR_WRITES_SECONDS as leituras vão para o primário,
+    qualquer que seja o worker ou processo que atenda a requisição.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marcador = MarcadorEscrita(_ler_ultima_escrita(scope["headers"]))
+        token = _marcador_requisicao.set(marcador)
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start" and marcador.escreveu:
+                valor = f"{marcador.ultima_escrita:.3f}"
+                headers = MutableHeaders(scope=mensagem)
+                headers.append("X-Ultima-Escrita", valor)
+                headers.append(
+                    "Set-Cookie",
+                    f"{settings.READ_YOUR_WRITES_COOKIE}={valor}; Max-Age={settings.READ_YOUR_WRITES_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _marcador_requisicao.reset(token)
+
+
+class RoteadorLeitura:
+    """
+    Cria sessões de leitura distribuindo entre as réplicas saudáveis (round-robin).
+
+    Usa o primário quando não há réplica disponível ou quando o cliente fez
+    um commit nos últimos READ_YOUR_WRITES_SECONDS (leia-suas-escritas). A
+    marca da última escrita viaja com o cliente (LeiaSuasEscritasMiddleware),
+    então vale entre workers e processos.
+
+    A saúde das réplicas é verificada por uma tarefa em segundo plano a cada
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS (iniciada pela aplicação); o
+    roteamento só lê o último estado, então uma réplica lenta ou fora do ar
+    não soma o seu timeout de conexão às requisições. Sem a tarefa (ex.:
+    tarefas do run.py) uma réplica marcada como indisponível por erro de
+    conexão deixa de ser usada até o fim do processo.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url, indice) for indice, url in enumerate(urls)]
+        self._proxima = itertools.count()
+        self.leituras_primario = 0
+        self.leituras_replica = 0
+        self._tarefa: Optional[asyncio.Task] = None
+
+    async def verificar_replicas(self):
+        """Executa o health check de todas as réplicas em paralelo"""
+        await asyncio.gather(*(run_in_threadpool(replica.verificar) for replica in self.replicas))
+
+    async def _executar(self):
+        while True:
+            try:
+                await self.verificar_replicas()
+            except Exception as e:
+                print(f"❌ Erro no health check das réplicas: {e}")
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+
+    def iniciar(self):
+        if self.replicas and self._tarefa is None:
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def registrar_escrita(self, usuario_id=None):
+        """
+        Marca que a requisição atual gravou dados; fora de uma requisição
+        (tarefas do run.py) não há cliente a marcar
+        """
+        marcador = _marcador_requisicao.get()
+        if marcador is not None:
+            marcador.escreveu = True
+            marcador.ultima_escrita = time.time()
+
+    def escrita_recente(self) -> bool:
+        marcador = _marcador_requisicao.get()
+        return marcador is not None and marcador.recente()
+
+    def escolher_replica(self) -> Optional[Replica]:
+        total = len(self.replicas)
+        inicio = next(self._proxima)
+        for deslocamento in range(total):
+            replica = self.replicas[(inicio + deslocamento) % total]
+            if replica.disponivel():
+                return replica
+        return None
+
+    def criar_sessao(self, usuario_id=None) -> Session:
+        """Cria uma sessão de leitura para o usuário informado"""
+        if self.replicas and not self.escrita_recente():
+            replica = self.escolher_replica()
+            if replica is not None:
+                self.leituras_replica += 1
+                return replica.SessionLocal()
+
+        self.leituras_primario += 1
+        return SessionLocal()
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "leituras_primario": self.leituras_primario,
+            "leituras_replica": self.leituras_replica,
+            "replicas": {replica.nome: replica.estado() for replica in self.replicas},
+        }
+
+
+def _usuario_afetado(obj):
+    """Id do usuário dono do registro alterado (ou o próprio usuário)"""
+    if obj.__tablename__ == "usuarios":
+        return str(obj.id)
+    usuario_id = getattr(obj, "usuario_id", None)
+    return str(usuario_id) if usuario_id is not None else None
+
+
+roteador_leitura = RoteadorLeitura(settings.DATABASE_REPLICA_URLS)
+
+# Todo commit que altera dados de um usuário abre a janela de leia-suas-escritas do cliente
+if roteador_leitura.replicas:
+    registrar_apos_commit(
+        "escritas_recentes",
+        modelos=[Base],
+        chave=_usuario_afetado,
+        callback=roteador_leitura.registrar_escrita,
+    )
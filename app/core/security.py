@@ -1,11 +1,24 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 from .config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+class HashPoolSaturadoError(Exception):
+    """Fila do pool de hash de senhas está cheia"""
+
+# Pool de processos dedicado ao bcrypt, para não ocupar o threadpool das requisições
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_pendentes = 0
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -22,10 +35,162 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_token(token: str) -> Optional[str]:
+def iniciar_pool_hash() -> ProcessPoolExecutor:
+    """
+    Cria o pool de processos do bcrypt (spawn evita herdar threads do servidor)
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_executor
+
+def encerrar_pool_hash():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+@contextmanager
+def _reservar_vaga_hash():
+    """
+    Ocupa uma vaga da fila do pool de hash, recusando imediatamente quando ela
+    atinge PASSWORD_HASH_MAX_PENDING (o contador só é alterado no event loop)
+    """
+    global _hash_pendentes
+    if _hash_pendentes >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HashPoolSaturadoError()
+    
+    _hash_pendentes += 1
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        return user_id
+        yield iniciar_pool_hash()
+    finally:
+        _hash_pendentes -= 1
+
+async def _executar_no_pool_hash(func, *args):
+    with _reservar_vaga_hash() as executor:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _executar_no_pool_hash(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _executar_no_pool_hash(get_password_hash, password)
+
+async def get_password_hashes_async(passwords: List[str]) -> List[str]:
+    """
+    Gera vários hashes em paralelo ocupando uma única vaga da fila. Os hashes são
+    enviados em grupos do tamanho do pool para que logins concorrentes possam
+    ser atendidos entre um grupo e outro.
+    """
+    with _reservar_vaga_hash() as executor:
+        loop = asyncio.get_running_loop()
+        hashes: List[str] = []
+        tamanho_grupo = settings.PASSWORD_HASH_WORKERS
+        for inicio in range(0, len(passwords), tamanho_grupo):
+            grupo = passwords[inicio:inicio + tamanho_grupo]
+            hashes.extend(await asyncio.gather(
+                *(loop.run_in_executor(executor, get_password_hash, senha) for senha in grupo)
+            ))
+        return hashes
+
+def estatisticas_pool_hash() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pendentes": settings.PASSWORD_HASH_MAX_PENDING,
+        "pendentes": _hash_pendentes,
+        "iniciado": _hash_executor is not None
+    }
+
+def _percentil_ms(valores: List[float], percentil: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return round(ordenados[min(len(ordenados) - 1, int(round(percentil * (len(ordenados) - 1))))] * 1000, 2)
+
+async def _medir_login(logins: int, concorrencia: int, pelo_pool: bool) -> Dict[str, Any]:
+    senha = "benchmark-login"
+    senha_hash = get_password_hash(senha)
+    if pelo_pool:
+        await verify_password_async(senha, senha_hash)  # sobe os processos fora da medição
+    
+    pendentes = iter(range(logins))
+    latencias_login: List[float] = []
+    latencias_outras: List[float] = []
+    recusados = 0
+    terminou = asyncio.Event()
+    
+    async def cliente():
+        nonlocal recusados
+        for _ in pendentes:
+            inicio = time.perf_counter()
+            try:
+                if pelo_pool:
+                    await verify_password_async(senha, senha_hash)
+                else:
+                    await run_in_threadpool(verify_password, senha, senha_hash)
+            except HashPoolSaturadoError:
+                recusados += 1
+                continue
+            latencias_login.append(time.perf_counter() - inicio)
+    
+    async def outra_rota():
+        # Rota síncrona trivial: mede só a espera por uma thread do threadpool
+        while not terminou.is_set():
+            inicio = time.perf_counter()
+            await run_in_threadpool(time.monotonic)
+            latencias_outras.append(time.perf_counter() - inicio)
+            await asyncio.sleep(0.01)
+    
+    medidor = asyncio.create_task(outra_rota())
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    terminou.set()
+    await medidor
+    
+    return {
+        "modo": "pool de processos" if pelo_pool else "threadpool",
+        "logins": len(latencias_login),
+        "recusados": recusados,
+        "duracao_segundos": round(duracao, 2),
+        "login_p50_ms": _percentil_ms(latencias_login, 0.50),
+        "login_p99_ms": _percentil_ms(latencias_login, 0.99),
+        "outras_p50_ms": _percentil_ms(latencias_outras, 0.50),
+        "outras_p99_ms": _percentil_ms(latencias_outras, 0.99),
+    }
+
+def medir_login(logins: int = 100, concorrencia: int = 16) -> List[Dict[str, Any]]:
+    """
+    Benchmark sem banco: `logins` verificações de senha com `concorrencia`
+    clientes simultâneos, pelo pool de processos e, para comparação, pelo
+    threadpool das requisições (como antes do pool). Em paralelo mede a
+    latência de uma rota síncrona trivial, que disputa o mesmo threadpool.
+    Logins recusados pela fila cheia (503 na API) são contados à parte.
+    """
+    async def _medir():
+        try:
+            return [
+                await _medir_login(logins, concorrencia, pelo_pool=True),
+                await _medir_login(logins, concorrencia, pelo_pool=False),
+            ]
+        finally:
+            encerrar_pool_hash()
+    
+    return asyncio.run(_medir())
+
+def decode_token(token: str) -> Optional[dict]:
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def verify_token(token: str) -> Optional[str]:
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    user_id: str = payload.get("sub")
+    return user_id
\ No newline at end of file
@@ -0,0 +1,98 @@
+import multiprocessing
+from typing import Any, Dict
+
+from app.core.config import settings
+
+try:
+    # uvicorn.workers depende do gunicorn (indisponível no Windows)
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    UvicornWorker = None
+
+if UvicornWorker is not None:
+    class UvicornWorkerProducao(UvicornWorker):
+        """Worker uvicorn com uvloop e httptools"""
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def numero_workers() -> int:
+    """Workers configurados ou, se 0, um por CPU (workers assíncronos)"""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    return multiprocessing.cpu_count()
+
+
+def _pos_fork(server, worker):
+    """
+    Descarta conexões herdadas do processo master (preload_app) para que cada
+    worker abra as suas próprias
+    """
+    from app.core.database import engine
+    from app.core.replicas import roteador_leitura
+
+    engine.dispose(close=False)
+    for replica in roteador_leitura.replicas:
+        replica.engine.dispose(close=False)
+
+
+def opcoes_gunicorn() -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": numero_workers(),
+        "worker_class": "app.core.server.UvicornWorkerProducao",
+        "preload_app": settings.SERVER_PRELOAD_APP,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "post_fork": _pos_fork,
+        "accesslog": "-" if settings.SERVER_ACCESS_LOG else None,
+        "errorlog": "-",
+        "loglevel": "info",
+    }
+
+
+def run_gunicorn():
+    """
+    Executa com gunicorn (master + workers uvicorn). Com preload_app os
+    imports acontecem uma vez no master e os workers são criados por fork.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class AplicacaoProducao(BaseApplication):
+        def __init__(self, opcoes: Dict[str, Any]):
+            self.opcoes = opcoes
+            super().__init__()
+
+        def load_config(self):
+            for chave, valor in self.opcoes.items():
+                if valor is not None:
+                    self.cfg.set(chave, valor)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    AplicacaoProducao(opcoes_gunicorn()).run()
+
+
+def run_uvicorn_workers():
+    """
+    Alternativa sem gunicorn (ex.: Windows): uvicorn com múltiplos workers,
+    sem preload
+    """
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=numero_workers(),
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        backlog=settings.SERVER_BACKLOG,
+        access_log=settings.SERVER_ACCESS_LOG,
+        log_level="info"
+    )
@@ -13,25 +13,52 @@ from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.config import settings
-from app.core.database import engine, create_tables
-from app.api.v1 import auth, configuracoes
+from app.core.database import engine, dispose_async_engine
+from app.core.migrations import verificar_versao_schema
+from app.core.health import monitor_saude
+from app.core.cache import estatisticas_caches
+from app.core.pool_metrics import estatisticas_pools
+from app.core.replicas import LeiaSuasEscritasMiddleware, roteador_leitura
+from app.core.security import iniciar_pool_hash, encerrar_pool_hash, estatisticas_pool_hash
+from app.core.notificacoes import barramento_alertas, ponte_alertas
+from app.models import init as _models  # noqa: F401 - registra todos os models antes de configurar os mappers
+from app.api.v1 import auth, configuracoes, transacoes, dashboard, contas, orcamentos, alertas, emprestimos
 
 # Função para inicializar o banco de dados
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Iniciando aplicação...")
-    print("📊 Criando tabelas do banco de dados...")
+    print("📊 Verificando versão do schema do banco de dados...")
     try:
-        create_tables()
-        print("✅ Tabelas criadas com sucesso!")
+        versao = verificar_versao_schema()
+        if versao["atualizado"]:
+            print(f"✅ Schema atualizado (revisão {', '.join(versao['atual'])})")
+        else:
+            print(
+                f"⚠️ Schema desatualizado: banco em {versao['atual'] or 'nenhuma revisão'}, "
+                f"esperado {versao['esperada']}. Execute: python run.py migrate"
+            )
     except Exception as e:
-        print(f"❌ Erro ao criar tabelas: {e}")
+        print(f"❌ Erro ao verificar schema: {e}")
+    
+    iniciar_pool_hash()
+    roteador_leitura.iniciar()
+    monitor_saude.iniciar()
+    barramento_alertas.iniciar()
+    if settings.ALERTAS_NOTIFY_ENABLED:
+        ponte_alertas.iniciar()
     
     yield
     
     # Shutdown
     print("🛑 Encerrando aplicação...")
+    await ponte_alertas.parar()
+    barramento_alertas.encerrar()
+    await monitor_saude.parar()
+    await roteador_leitura.parar()
+    encerrar_pool_hash()
+    await dispose_async_engine()
 
 # Criar instância do FastAPI
 app = FastAPI(
@@ -51,8 +78,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Ultima-Escrita"],
 )
 
+# Leia-suas-escritas: devolve ao cliente a marca da última escrita
+app.add_middleware(LeiaSuasEscritasMiddleware)
+
 # Middleware para tratamento de erros
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -90,6 +121,42 @@ app.include_router(
     tags=["⚙️ Configurações"]
 )
 
+app.include_router(
+    transacoes.router, 
+    prefix=f"{settings.API_V1_STR}/transacoes", 
+    tags=["💸 Transações"]
+)
+
+app.include_router(
+    dashboard.router, 
+    prefix=f"{settings.API_V1_STR}/dashboard", 
+    tags=["📊 Dashboard"]
+)
+
+app.include_router(
+    contas.router, 
+    prefix=f"{settings.API_V1_STR}/contas", 
+    tags=["🏦 Contas"]
+)
+
+app.include_router(
+    orcamentos.router, 
+    prefix=f"{settings.API_V1_STR}/orcamentos", 
+    tags=["🎯 Orçamentos"]
+)
+
+app.include_router(
+    alertas.router, 
+    prefix=f"{settings.API_V1_STR}/alertas", 
+    tags=["🔔 Alertas"]
+)
+
+app.include_router(
+    emprestimos.router, 
+    prefix=f"{settings.API_V1_STR}/emprestimos", 
+    tags=["🏠 Empréstimos"]
+)
+
 # Rota raiz
 @app.get("/", tags=["📋 Informações"])
 def read_root():
@@ -105,38 +172,57 @@ def read_root():
             "registrar": f"{settings.API_V1_STR}/auth/registrar",
             "login": f"{settings.API_V1_STR}/auth/login",
             "perfil": f"{settings.API_V1_STR}/auth/me",
-            "configuracoes": f"{settings.API_V1_STR}/configuracoes"
+            "configuracoes": f"{settings.API_V1_STR}/configuracoes",
+            "transacoes": f"{settings.API_V1_STR}/transacoes",
+            "dashboard": f"{settings.API_V1_STR}/dashboard",
+            "contas": f"{settings.API_V1_STR}/contas",
+            "orcamentos": f"{settings.API_V1_STR}/orcamentos",
+            "alertas": f"{settings.API_V1_STR}/alertas",
+            "emprestimos": f"{settings.API_V1_STR}/emprestimos"
         }
     }
 
-# Endpoint de health check
+# Endpoints de health check (servem o último resultado do monitor em segundo plano)
+@app.get("/health/live", tags=["📋 Informações"])
+async def health_liveness():
+    """
+    Liveness: o processo está no ar
+    """
+    return monitor_saude.liveness()
+
+@app.get("/health/ready", tags=["📋 Informações"])
+async def health_readiness():
+    """
+    Readiness: banco e pool verificados recentemente e disponíveis
+    """
+    pronto, resultado = monitor_saude.prontidao()
+    if not pronto:
+        return JSONResponse(status_code=503, content=resultado)
+    return resultado
+
 @app.get("/health", tags=["📋 Informações"])
-def health_check():
+async def health_check():
     """
-    Endpoint para verificar se a API está funcionando
+    Endpoint para verificar se a API está funcionando (mesmo que /health/ready)
     """
-    try:
-        # Testar conexão com banco
-        from app.core.database import SessionLocal
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        
-        return {
-            "status": "🟢 Healthy",
-            "database": "🟢 Connected",
-            "timestamp": "2024-01-15T10:30:00Z"
+    return await health_readiness()
+
+# Endpoint de métricas internas
+@app.get("/metricas", tags=["📋 Informações"])
+def obter_metricas():
+    """
+    Métricas do processo atual (pools de conexão, caches, pool de hash de senhas e streams de alertas)
+    """
+    return {
+        "pools_banco": estatisticas_pools(),
+        "leituras": roteador_leitura.estado(),
+        "caches": estatisticas_caches(),
+        "pool_hash_senhas": estatisticas_pool_hash(),
+        "streams_alertas": {
+            **barramento_alertas.estatisticas(),
+            "ponte_notify": ponte_alertas.estatisticas(),
         }
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "🔴 Unhealthy",
-                "database": "🔴 Disconnected",
-                "error": str(e),
-                "timestamp": "2024-01-15T10:30:00Z"
-            }
-        )
+    }
 
 # Endpoint para listar todas as rotas disponíveis
 @app.get("/routes", tags=["📋 Informações"])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -16,11 +16,23 @@ class Alerta(Base):
     data_alerta = Column(DateTime(timezone=True), nullable=False)
     lido = Column(Boolean, default=False)
     ativo = Column(Boolean, default=True)
+    # Identifica o evento que gerou o alerta (ex.: orçamento, limiar e período) para evitar duplicatas
+    chave_deduplicacao = Column(String(200))
     criado_em = Column(DateTime(timezone=True), server_default=func.now())
     
     # Constraints
     __table_args__ = (
         CheckConstraint("tipo_alerta IN ('vencimento_fatura', 'vencimento_emprestimo', 'limite_orcamento', 'meta_atingida', 'saldo_baixo')", name="check_tipo_alerta"),
+        # Índices (alertas não lidos do usuário, mais recentes primeiro)
+        Index("idx_alertas_usuario_id", usuario_id),
+        Index("idx_alertas_data", data_alerta),
+        Index("idx_alertas_nao_lidos", usuario_id, data_alerta.desc(), postgresql_where=text("lido = false")),
+        Index(
+            "uq_alertas_chave_deduplicacao",
+            chave_deduplicacao,
+            unique=True,
+            postgresql_where=text("chave_deduplicacao IS NOT NULL")
+        ),
         {"schema": None}
     )
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, Integer, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, Integer, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -26,6 +26,7 @@ class CartaoCredito(Base):
     __table_args__ = (
         CheckConstraint("dia_fechamento BETWEEN 1 AND 31", name="check_dia_fechamento"),
         CheckConstraint("dia_vencimento BETWEEN 1 AND 31", name="check_dia_vencimento"),
+        Index("idx_cartoes_credito_usuario_id", usuario_id),
         {"schema": None}
     )
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, CheckConstraint, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -22,6 +22,7 @@ class Categoria(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("tipo IN ('receita', 'despesa')", name="check_categoria_tipo"),
+        UniqueConstraint("usuario_id", "nome", "tipo", name="uq_categoria_usuario_nome_tipo"),
         {"schema": None}
     )
     
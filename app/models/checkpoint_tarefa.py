@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class CheckpointTarefa(Base):
+    """
+    Posição de tarefas em lote (cursor de retomada ou marca d'água),
+    gravada na mesma transação de cada lote processado
+    """
+    __tablename__ = "checkpoints_tarefas"
+    
+    nome = Column(String(100), primary_key=True)
+    posicao = Column(JSONB)
+    iniciado_em = Column(DateTime(timezone=True))
+    concluido_em = Column(DateTime(timezone=True))
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @property
+    def em_andamento(self):
+        return self.iniciado_em is not None and self.concluido_em is None
+    
+    def __repr__(self):
+        return f"<CheckpointTarefa(nome='{self.nome}', posicao={self.posicao})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -23,6 +23,7 @@ class ContaBancaria(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("tipo_conta IN ('corrente', 'poupanca', 'investimento', 'dinheiro')", name="check_tipo_conta"),
+        Index("idx_contas_bancarias_usuario_id", usuario_id),
         {"schema": None}
     )
     
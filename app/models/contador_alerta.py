@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class ContadorAlerta(Base):
+    """
+    Quantidade de alertas ativos não lidos por usuário.
+    
+    Mantido pelos triggers de alertas (migração 0012); não deve ser alterado
+    pela aplicação. Usuários sem linha não têm alertas não lidos.
+    """
+    __tablename__ = "contadores_alertas"
+    
+    usuario_id = Column(UUID(as_uuid=True), ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True)
+    nao_lidos = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ContadorAlerta(usuario_id={self.usuario_id}, nao_lidos={self.nao_lidos})>"
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, Integer, Date, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Numeric, Integer, Date, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from decimal import Decimal
+from ..core.amortizacao import total_juros
 from ..core.database import Base
 
 class Emprestimo(Base):
@@ -19,6 +20,7 @@ class Emprestimo(Base):
     total_parcelas = Column(Integer, nullable=False)
     parcelas_pagas = Column(Integer, default=0)
     valor_parcela = Column(Numeric(15, 2), nullable=False)
+    sistema_amortizacao = Column(String(10), nullable=False, default="price")
     data_inicio = Column(Date, nullable=False)
     data_fim = Column(Date, nullable=False)
     proximo_vencimento = Column(Date)
@@ -29,6 +31,8 @@ class Emprestimo(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("tipo_emprestimo IN ('pessoal', 'habitacional', 'veiculo', 'estudantil', 'empresarial')", name="check_tipo_emprestimo"),
+        CheckConstraint("sistema_amortizacao IN ('price', 'sac')", name="check_sistema_amortizacao"),
+        Index("idx_emprestimos_usuario_id", usuario_id),
         {"schema": None}
     )
     
@@ -49,9 +53,9 @@ class Emprestimo(Base):
     
     @property
     def valor_total_juros(self):
-        if self.valor_parcela and self.total_parcelas and self.valor_principal:
-            valor_total = float(self.valor_parcela) * self.total_parcelas
-            return valor_total - float(self.valor_principal)
+        # Juros do cronograma pelo sistema de amortização, com o arredondamento das parcelas
+        if self.total_parcelas and self.valor_principal:
+            return float(total_juros(self.valor_principal, self.taxa_juros, self.total_parcelas, self.sistema_amortizacao))
         return 0.0
     
     def __repr__(self):
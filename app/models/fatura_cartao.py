@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -25,6 +25,9 @@ class FaturaCartao(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('aberta', 'fechada', 'paga', 'vencida')", name="check_status_fatura"),
+        # Índices (faturas do cartão por mês e faturas em aberto por vencimento)
+        Index("idx_faturas_cartao_mes", cartao_credito_id, mes_referencia.desc()),
+        Index("idx_faturas_abertas_vencimento", data_vencimento, postgresql_where=text("status IN ('aberta', 'fechada')")),
         {"schema": None}
     )
     
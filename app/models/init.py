@@ -10,6 +10,10 @@ from .orcamento import Orcamento
 from .meta_financeira import MetaFinanceira
 from .alerta import Alerta
 from .configuracao_usuario import ConfiguracaoUsuario
+from .resumo_mensal_transacao import ResumoMensalTransacao
+from .checkpoint_tarefa import CheckpointTarefa
+from .saldo_conta_historico import SaldoContaHistorico
+from .contador_alerta import ContadorAlerta
 
 __all__ = [
     "Usuario",
@@ -23,5 +27,9 @@ __all__ = [
     "Orcamento",
     "MetaFinanceira",
     "Alerta",
-    "ConfiguracaoUsuario"
+    "ConfiguracaoUsuario",
+    "ResumoMensalTransacao",
+    "CheckpointTarefa",
+    "SaldoContaHistorico",
+    "ContadorAlerta"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -14,6 +14,7 @@ class Orcamento(Base):
     categoria_id = Column(UUID(as_uuid=True), ForeignKey("categorias.id", ondelete="CASCADE"))
     nome = Column(String(100), nullable=False)
     valor_limite = Column(Numeric(15, 2), nullable=False)
+    # Mantido pelos triggers de transacoes e orcamentos (migração 0009)
     valor_gasto = Column(Numeric(15, 2), default=Decimal('0.00'))
     tipo_periodo = Column(String(20), nullable=False)
     data_inicio = Column(Date, nullable=False)
@@ -25,6 +26,9 @@ class Orcamento(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("tipo_periodo IN ('mensal', 'anual')", name="check_tipo_periodo"),
+        Index("idx_orcamentos_usuario_periodo", usuario_id, data_inicio, data_fim),
+        # Avaliação incremental de limites (marca d'água em atualizado_em)
+        Index("idx_orcamentos_ativos_atualizado_em", atualizado_em, postgresql_where=(ativo == True)),
         {"schema": None}
     )
     
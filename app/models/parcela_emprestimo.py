@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, Integer, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, ForeignKey, Integer, CheckConstraint, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -26,6 +26,11 @@ class ParcelaEmprestimo(Base):
     __table_args__ = (
         CheckConstraint("status IN ('pendente', 'paga', 'vencida')", name="check_status_parcela"),
         UniqueConstraint("emprestimo_id", "numero_parcela", name="uq_emprestimo_parcela"),
+        # Índices (parcelas em aberto por vencimento, geral e por empréstimo)
+        Index("idx_parcelas_emprestimo_id", emprestimo_id),
+        Index("idx_parcelas_vencimento", data_vencimento),
+        Index("idx_parcelas_pendentes_vencimento", data_vencimento, postgresql_where=text("status = 'pendente'")),
+        Index("idx_parcelas_emprestimo_pendentes", emprestimo_id, data_vencimento, postgresql_where=text("status = 'pendente'")),
         {"schema": None}
     )
     
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, Numeric, Date, Integer, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from decimal import Decimal
+from ..core.database import Base
+
+class ResumoMensalTransacao(Base):
+    """
+    Totais de transações por usuário, mês, categoria, tipo e status.
+    
+    Mantido pelos triggers de transacoes (migração 0004); não deve ser
+    alterado pela aplicação. categoria_id não tem chave estrangeira para que
+    a remoção de uma categoria (que anula transacoes.categoria_id) possa
+    mover os totais para o grupo sem categoria.
+    """
+    __tablename__ = "resumo_mensal_transacoes"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    usuario_id = Column(UUID(as_uuid=True), ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False)
+    mes_referencia = Column(Date, nullable=False)
+    categoria_id = Column(UUID(as_uuid=True))
+    tipo_transacao = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False)
+    total = Column(Numeric(15, 2), nullable=False, default=Decimal('0.00'))
+    quantidade = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Índices
+    __table_args__ = (
+        Index(
+            "uq_resumo_mensal_grupo",
+            usuario_id,
+            mes_referencia,
+            text("COALESCE(categoria_id, '00000000-0000-0000-0000-000000000000'::uuid)"),
+            tipo_transacao,
+            status,
+            unique=True
+        ),
+        {"schema": None}
+    )
+    
+    def __repr__(self):
+        return f"<ResumoMensalTransacao(usuario_id={self.usuario_id}, mes={self.mes_referencia}, tipo='{self.tipo_transacao}', total={self.total})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Numeric, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+class SaldoContaHistorico(Base):
+    """
+    Saldo de uma conta ao final de data_referencia, calculado a partir das
+    transações concluídas (snapshot periódico). Transações retroativas
+    ajustam os snapshots posteriores via trigger (migração 0006).
+    """
+    __tablename__ = "saldos_conta_historico"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    conta_bancaria_id = Column(UUID(as_uuid=True), ForeignKey("contas_bancarias.id", ondelete="CASCADE"), nullable=False)
+    data_referencia = Column(Date, nullable=False)
+    saldo = Column(Numeric(15, 2), nullable=False)
+    criado_em = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("conta_bancaria_id", "data_referencia", name="uq_saldo_conta_data"),
+        {"schema": None}
+    )
+    
+    def __repr__(self):
+        return f"<SaldoContaHistorico(conta_bancaria_id={self.conta_bancaria_id}, data={self.data_referencia}, saldo={self.saldo})>"
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, Text, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Numeric, Date, Boolean, DateTime, Text, ForeignKey, CheckConstraint, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from decimal import Decimal
 from ..core.database import Base
@@ -15,6 +15,8 @@ class Transacao(Base):
     conta_bancaria_id = Column(UUID(as_uuid=True), ForeignKey("contas_bancarias.id", ondelete="SET NULL"))
     cartao_credito_id = Column(UUID(as_uuid=True), ForeignKey("cartoes_credito.id", ondelete="SET NULL"))
     emprestimo_id = Column(UUID(as_uuid=True), ForeignKey("emprestimos.id", ondelete="SET NULL"))
+    # Transação recorrente (modelo) que gerou esta ocorrência
+    transacao_origem_id = Column(UUID(as_uuid=True), ForeignKey("transacoes.id", ondelete="SET NULL"))
     
     descricao = Column(String(255), nullable=False)
     valor = Column(Numeric(15, 2), nullable=False)
@@ -28,7 +30,14 @@ class Transacao(Base):
     
     status = Column(String(20), default="concluida")
     observacoes = Column(Text)
-    etiquetas = Column(ARRAY(String))
+    etiquetas = Column(ARRAY(Text))
+    
+    # Busca textual (gerada pelo banco; não é carregada por padrão)
+    busca = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('portuguese', coalesce(descricao, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(observacoes, '')), 'B')",
+        persisted=True
+    )))
     
     criado_em = Column(DateTime(timezone=True), server_default=func.now())
     atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -38,6 +47,35 @@ class Transacao(Base):
         CheckConstraint("tipo_transacao IN ('receita', 'despesa', 'transferencia', 'pagamento_emprestimo', 'pagamento_cartao')", name="check_tipo_transacao"),
         CheckConstraint("frequencia_recorrencia IN ('diaria', 'semanal', 'mensal', 'anual') OR frequencia_recorrencia IS NULL", name="check_frequencia_recorrencia"),
         CheckConstraint("status IN ('pendente', 'concluida', 'cancelada')", name="check_status_transacao"),
+        # Índices (listagem por usuário e período, ordenada da mais recente)
+        Index("idx_transacoes_usuario_data", usuario_id, data_transacao.desc(), id.desc()),
+        Index("idx_transacoes_data", data_transacao),
+        Index("idx_transacoes_categoria", categoria_id),
+        Index("idx_transacoes_tipo", tipo_transacao),
+        # Saldo por conta em uma data (snapshot + transações posteriores)
+        Index("idx_transacoes_conta_data", conta_bancaria_id, data_transacao),
+        # Busca textual, trechos de descrição (pg_trgm) e etiquetas
+        Index("idx_transacoes_busca", "busca", postgresql_using="gin"),
+        Index(
+            "idx_transacoes_descricao_trgm",
+            descricao,
+            postgresql_using="gin",
+            postgresql_ops={"descricao": "gin_trgm_ops"}
+        ),
+        Index("idx_transacoes_etiquetas", etiquetas, postgresql_using="gin"),
+        # Uma ocorrência por modelo e data (idempotência da materialização)
+        Index(
+            "uq_transacoes_ocorrencia",
+            transacao_origem_id,
+            data_transacao,
+            unique=True,
+            postgresql_where=transacao_origem_id.isnot(None)
+        ),
+        Index(
+            "idx_transacoes_modelos_recorrentes",
+            id,
+            postgresql_where=(eh_recorrente == True) & transacao_origem_id.is_(None)
+        ),
         {"schema": None}
     )
     
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+class AlertaResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    tipo_alerta: str
+    titulo: str
+    mensagem: str
+    data_alerta: datetime
+    lido: Optional[bool] = None
+    eh_urgente: bool
+    icone_alerta: str
+    criado_em: datetime
+
+class AlertaListaResponse(BaseModel):
+    alertas: List[AlertaResponse]
+    nao_lidos: int
+
+class MarcarLidosResponse(BaseModel):
+    marcados: int
+    nao_lidos: int
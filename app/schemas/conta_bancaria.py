@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+import uuid
+
+class SaldoNaDataResponse(BaseModel):
+    conta_bancaria_id: uuid.UUID
+    data: date
+    saldo: Decimal
+    saldo_atual: Decimal
+    snapshot_data: Optional[date] = None
+
+class SaldoHistoricoItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    data_referencia: date
+    saldo: Decimal
+
+class HistoricoSaldoResponse(BaseModel):
+    conta_bancaria_id: uuid.UUID
+    saldos: List[SaldoHistoricoItem]
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+
+class ResumoCategoriaMes(BaseModel):
+    categoria_id: Optional[uuid.UUID] = None
+    categoria_nome: Optional[str] = None
+    tipo_transacao: str
+    total: Decimal
+    quantidade: int
+
+class ResumoMensalResponse(BaseModel):
+    mes_referencia: date
+    receitas: Decimal
+    despesas: Decimal
+    saldo: Decimal
+    quantidade_transacoes: int
+    receitas_pendentes: Decimal
+    despesas_pendentes: Decimal
+    categorias: List[ResumoCategoriaMes]
+
+class EvolucaoMes(BaseModel):
+    mes_referencia: date
+    receitas: Decimal
+    despesas: Decimal
+    saldo: Decimal
+    variacao_receitas_percentual: Optional[float] = None
+    variacao_despesas_percentual: Optional[float] = None
+
+class EvolucaoMensalResponse(BaseModel):
+    meses: List[EvolucaoMes]
+
+class ResumoFinanceiroResponse(BaseModel):
+    usuario_id: uuid.UUID
+    total_contas_bancarias: Decimal
+    total_divida_cartoes: Decimal
+    total_divida_emprestimos: Decimal
+    patrimonio_liquido: Decimal
+    calculado_em: datetime
@@ -0,0 +1,59 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+import uuid
+
+class ParcelaCronograma(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    numero_parcela: int
+    data_vencimento: date
+    valor: Decimal
+    valor_principal: Decimal
+    valor_juros: Decimal
+    saldo_devedor: Decimal
+
+class CronogramaResponse(BaseModel):
+    emprestimo_id: uuid.UUID
+    sistema_amortizacao: str
+    taxa_juros_mensal: float
+    valor_principal: Decimal
+    total_juros: Decimal
+    total_pago: Decimal
+    persistido: bool
+    parcelas: List[ParcelaCronograma]
+
+class RefinanciamentoCenario(BaseModel):
+    taxa_juros: Decimal = Field(..., ge=0, le=1000)  # Anual, em %
+    total_parcelas: int = Field(..., ge=1, le=600)
+    sistema_amortizacao: Optional[str] = Field(None, pattern="^(price|sac)$")
+
+class SimulacaoRequest(BaseModel):
+    # Grade de pagamentos extras: cada valor em cada mês (1 = junto com a próxima parcela)
+    valores_extras: List[Decimal] = Field(default_factory=list, max_length=1000)
+    meses: List[int] = Field(default_factory=lambda: [1], min_length=1, max_length=600)
+    reduzir: str = Field("prazo", pattern="^(prazo|parcela)$")
+    refinanciamentos: List[RefinanciamentoCenario] = Field(default_factory=list, max_length=1000)
+
+class CenarioSimulacao(BaseModel):
+    valor_extra: Optional[Decimal] = None
+    mes: Optional[int] = None
+    taxa_juros: Optional[Decimal] = None
+    sistema_amortizacao: Optional[str] = None
+    parcelas_restantes: int
+    data_fim: date
+    valor_parcela: Decimal
+    total_juros: Decimal
+    juros_economizados: Decimal
+
+class SimulacaoResponse(BaseModel):
+    emprestimo_id: uuid.UUID
+    sistema_amortizacao: str
+    saldo_devedor: Decimal
+    parcelas_restantes: int
+    valor_parcela: Decimal
+    data_fim: date
+    total_juros: Decimal
+    pagamentos_extras: List[CenarioSimulacao]
+    refinanciamentos: List[CenarioSimulacao]
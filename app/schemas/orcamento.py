@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+import uuid
+
+class OrcamentoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    categoria_id: Optional[uuid.UUID] = None
+    nome: str
+    valor_limite: Decimal
+    valor_gasto: Optional[Decimal] = None
+    tipo_periodo: str
+    data_inicio: date
+    data_fim: date
+    ativo: Optional[bool] = None
+    valor_disponivel: float
+    percentual_gasto: float
+    status_orcamento: str
+
+class OrcamentoListaResponse(BaseModel):
+    orcamentos: List[OrcamentoResponse]
@@ -0,0 +1,54 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+
+class TransacaoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    categoria_id: Optional[uuid.UUID] = None
+    conta_bancaria_id: Optional[uuid.UUID] = None
+    cartao_credito_id: Optional[uuid.UUID] = None
+    emprestimo_id: Optional[uuid.UUID] = None
+    transacao_origem_id: Optional[uuid.UUID] = None
+    descricao: str
+    valor: Decimal
+    tipo_transacao: str
+    data_transacao: date
+    data_vencimento: Optional[date] = None
+    eh_recorrente: Optional[bool] = None
+    frequencia_recorrencia: Optional[str] = None
+    data_fim_recorrencia: Optional[date] = None
+    status: Optional[str] = None
+    observacoes: Optional[str] = None
+    etiquetas: Optional[List[str]] = None
+    criado_em: datetime
+    atualizado_em: datetime
+
+class TransacaoPagina(BaseModel):
+    itens: List[TransacaoResponse]
+    proximo_cursor: Optional[str] = None
+    tem_mais: bool
+
+class TransacaoBuscaItem(TransacaoResponse):
+    relevancia: float
+
+class TransacaoBuscaPagina(BaseModel):
+    itens: List[TransacaoBuscaItem]
+    pagina: int
+    tamanho: int
+    tem_mais: bool
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erro: str
+
+class ImportacaoResponse(BaseModel):
+    total_linhas: int
+    importadas: int
+    duplicadas: int
+    rejeitadas: int
+    erros: List[ErroImportacao]
+    saldo_conta: Optional[Decimal] = None
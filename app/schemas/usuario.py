@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, ConfigDict, validator
-from typing import Optional
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -46,6 +46,23 @@ class UsuarioResponse(UsuarioBase):
     def nome_completo(self):
         return f"{self.primeiro_nome} {self.ultimo_nome}"
 
+class UsuarioLoteCreate(BaseModel):
+    # Cada item tem o formato de UsuarioCreate; a validação é feita por linha
+    usuarios: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+class ResultadoRegistroLote(BaseModel):
+    indice: int
+    email: Optional[str] = None
+    sucesso: bool
+    usuario_id: Optional[uuid.UUID] = None
+    erro: Optional[str] = None
+
+class RegistroLoteResponse(BaseModel):
+    total: int
+    criados: int
+    falhas: int
+    resultados: List[ResultadoRegistroLote]
+
 class UsuarioComConfiguracoes(UsuarioResponse):
     configuracao: Optional['ConfiguracaoUsuarioResponse'] = None
 
@@ -0,0 +1,307 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import json
+import time
+import uuid
+
+from app.core.cache import TTLCache, invalidar_apos_commit
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.notificacoes import Assinatura, barramento_alertas, notificar_alteracao_alertas
+from app.core.replicas import roteador_leitura
+from app.models.alerta import Alerta
+from app.models.contador_alerta import ContadorAlerta
+from app.schemas.alerta import AlertaListaResponse, AlertaResponse, MarcarLidosResponse
+from app.services.checkpoint_service import CheckpointService
+
+# Id do usuário -> alertas não lidos (contadores_alertas)
+_cache_nao_lidos = TTLCache(
+    "alertas_nao_lidos",
+    max_itens=settings.ALERTAS_CONTADOR_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.ALERTAS_CONTADOR_CACHE_TTL_SECONDS,
+)
+
+invalidar_apos_commit(
+    _cache_nao_lidos,
+    modelos=[Alerta],
+    chave=lambda alerta: str(alerta.usuario_id),
+    atributos=["lido", "ativo"],
+)
+
+TAREFA_ALERTAS_ORCAMENTO = "alertas_limite_orcamento"
+
+# Reavalia também orçamentos atualizados pouco antes da marca d'água:
+# atualizado_em é o início da transação, que pode ter sido confirmada depois
+# da execução anterior. As chaves de deduplicação tornam a sobreposição inócua.
+MARGEM_MARCA_DAGUA_SEGUNDOS = 300
+
+# Para cada orçamento ativo e vigente atualizado na janela, o maior limiar
+# atingido (80% ou 100%); um alerta por orçamento, limiar e período.
+SQL_ALERTAS_ORCAMENTO = """
+    WITH candidatos AS (
+        SELECT DISTINCT ON (o.id)
+               o.id, o.usuario_id, o.nome, o.valor_limite, o.valor_gasto,
+               o.data_inicio, o.data_fim, l.percentual
+        FROM orcamentos o
+        JOIN (VALUES (80), (100)) AS l(percentual)
+          ON o.valor_gasto >= o.valor_limite * l.percentual / 100
+        WHERE o.ativo = true
+          AND o.atualizado_em > CAST(:desde AS timestamptz) - make_interval(secs => :margem)
+          AND o.atualizado_em <= :ate
+          AND o.valor_limite > 0
+          AND o.data_fim >= CURRENT_DATE
+        ORDER BY o.id, l.percentual DESC
+    ),
+    inseridos AS (
+        INSERT INTO alertas (id, usuario_id, tipo_alerta, titulo, mensagem, data_alerta, chave_deduplicacao)
+        SELECT uuid_generate_v4(),
+               c.usuario_id,
+               'limite_orcamento',
+               CASE WHEN c.percentual >= 100
+                    THEN 'Orçamento estourado: ' || c.nome
+                    ELSE 'Orçamento perto do limite: ' || c.nome
+               END,
+               format(
+                   'Você já gastou R$ %s de R$ %s (%s%%) no orçamento "%s" até %s.',
+                   c.valor_gasto, c.valor_limite,
+                   round(c.valor_gasto * 100 / c.valor_limite),
+                   c.nome, to_char(c.data_fim, 'DD/MM/YYYY')
+               ),
+               :ate,
+               format('limite_orcamento:%s:%s:%s:%s', c.id, c.percentual, c.data_inicio, c.data_fim)
+        FROM candidatos c
+        ON CONFLICT (chave_deduplicacao) WHERE chave_deduplicacao IS NOT NULL DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT count(*) FROM candidatos) AS orcamentos,
+        (SELECT count(*) FROM inseridos) AS alertas
+"""
+
+# Contadores que divergem da contagem dos alertas (mesma regra dos triggers da migração 0012)
+SQL_RECONCILIAR_CONTADORES = """
+    WITH contagem AS (
+        SELECT usuario_id, count(*) AS nao_lidos
+        FROM alertas
+        WHERE lido = false
+          AND ativo = true
+        GROUP BY usuario_id
+    ),
+    divergentes AS (
+        SELECT COALESCE(calc.usuario_id, reg.usuario_id) AS usuario_id,
+               COALESCE(reg.nao_lidos, 0) AS valor_registrado,
+               COALESCE(calc.nao_lidos, 0) AS valor_calculado
+        FROM contagem calc
+        FULL JOIN contadores_alertas reg ON reg.usuario_id = calc.usuario_id
+        WHERE COALESCE(reg.nao_lidos, 0) <> COALESCE(calc.nao_lidos, 0)
+    ){acao}
+    SELECT usuario_id, valor_registrado, valor_calculado
+    FROM divergentes
+    ORDER BY usuario_id
+"""
+
+ACAO_CORRIGIR_CONTADORES = """,
+    corrigidos AS (
+        INSERT INTO contadores_alertas (usuario_id, nao_lidos)
+        SELECT usuario_id, valor_calculado
+        FROM divergentes
+        ON CONFLICT (usuario_id) DO UPDATE
+        SET nao_lidos = EXCLUDED.nao_lidos,
+            atualizado_em = CURRENT_TIMESTAMP
+    )
+"""
+
+
+class AlertaService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.checkpoints = CheckpointService(db)
+    
+    def contar_nao_lidos(self, usuario_id: uuid.UUID, usar_cache: bool = True) -> int:
+        """
+        Alertas ativos não lidos do usuário, lidos do contador mantido por
+        trigger (uma linha por chave primária) e guardados em cache
+        """
+        chave = str(usuario_id)
+        if usar_cache:
+            nao_lidos = _cache_nao_lidos.get(chave)
+            if nao_lidos is not None:
+                return nao_lidos
+        
+        geracao = _cache_nao_lidos.geracao()
+        nao_lidos = self.db.query(ContadorAlerta.nao_lidos).filter(
+            ContadorAlerta.usuario_id == usuario_id
+        ).scalar() or 0
+        _cache_nao_lidos.set(chave, nao_lidos, geracao=geracao)
+        return nao_lidos
+    
+    def marcar_como_lidos(self, usuario_id: uuid.UUID, tipo_alerta: Optional[str] = None) -> MarcarLidosResponse:
+        """
+        Marca como lidos todos os alertas não lidos do usuário (ou só os do
+        tipo informado) em um único UPDATE; o contador é ajustado pelo trigger
+        """
+        query = self.db.query(Alerta).filter(Alerta.usuario_id == usuario_id, Alerta.lido == False)
+        if tipo_alerta:
+            query = query.filter(Alerta.tipo_alerta == tipo_alerta)
+        
+        try:
+            marcados = query.update({Alerta.lido: True}, synchronize_session=False)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        # UPDATE em massa não passa pelos eventos do ORM
+        roteador_leitura.registrar_escrita(usuario_id)
+        _cache_nao_lidos.invalidate(str(usuario_id))
+        if marcados:
+            notificar_alteracao_alertas(str(usuario_id))
+        
+        return MarcarLidosResponse(marcados=marcados, nao_lidos=self.contar_nao_lidos(usuario_id))
+    
+    def reconciliar_contadores(self, corrigir: bool = True) -> List[Dict[str, Any]]:
+        """
+        Compara contadores_alertas com a contagem dos alertas e retorna os
+        usuários divergentes, corrigindo-os quando `corrigir` é verdadeiro.
+        
+        A correção bloqueia o contador (EXCLUSIVE) antes de contar: escritas
+        concorrentes em alertas esperam no trigger e aplicam sua variação
+        depois, sobre o valor corrigido.
+        """
+        acao = ACAO_CORRIGIR_CONTADORES if corrigir else ""
+        try:
+            if corrigir:
+                self.db.execute(text("LOCK TABLE contadores_alertas IN EXCLUSIVE MODE"))
+            linhas = self.db.execute(text(SQL_RECONCILIAR_CONTADORES.format(acao=acao))).mappings().all()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for linha in linhas:
+            _cache_nao_lidos.invalidate(str(linha["usuario_id"]))
+        return [
+            {**linha, "diferenca": linha["valor_registrado"] - linha["valor_calculado"]}
+            for linha in linhas
+        ]
+    
+    def listar(self, usuario_id: uuid.UUID, apenas_nao_lidos: bool = False, limite: int = 50) -> AlertaListaResponse:
+        """Alertas ativos do usuário, mais recentes primeiro, com o total de não lidos"""
+        query = self.db.query(Alerta).filter(Alerta.usuario_id == usuario_id, Alerta.ativo == True)
+        if apenas_nao_lidos:
+            query = query.filter(Alerta.lido == False)
+        
+        alertas = query.order_by(Alerta.data_alerta.desc()).limit(limite).all()
+        return AlertaListaResponse(
+            alertas=[AlertaResponse.from_orm(alerta) for alerta in alertas],
+            nao_lidos=self.contar_nao_lidos(usuario_id)
+        )
+    
+    def gerar_alertas_orcamento(self) -> Dict[str, Any]:
+        """
+        Gera alertas limite_orcamento para os orçamentos que atingiram 80% ou
+        100% do limite, em uma única consulta sobre todos os usuários.
+        
+        Apenas orçamentos atualizados desde a última execução são avaliados
+        (valor_gasto é mantido por trigger, que atualiza atualizado_em); a
+        nova marca d'água é gravada na mesma transação dos alertas.
+        """
+        inicio = time.perf_counter()
+        checkpoint = self.checkpoints.obter(TAREFA_ALERTAS_ORCAMENTO)
+        desde = (checkpoint.posicao or {}).get("marca_dagua") if checkpoint else None
+        
+        try:
+            ate = self.db.execute(text("SELECT now()")).scalar()
+            resultado = self.db.execute(text(SQL_ALERTAS_ORCAMENTO), {
+                "desde": desde or "-infinity",
+                "ate": ate,
+                "margem": MARGEM_MARCA_DAGUA_SEGUNDOS if desde else 0,
+            }).one()
+            self.checkpoints.concluir(TAREFA_ALERTAS_ORCAMENTO, {"marca_dagua": ate.isoformat()})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return {
+            "desde": desde,
+            "ate": ate.isoformat(),
+            "orcamentos_no_limite": resultado.orcamentos,
+            "alertas_criados": resultado.alertas,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
+        }
+
+
+def _contar_nao_lidos(usuario_id: str, usar_cache: bool) -> int:
+    # Primário, como na sincronização: a conexão costuma vir logo após uma escrita
+    db = SessionLocal()
+    try:
+        return AlertaService(db).contar_nao_lidos(usuario_id, usar_cache)
+    finally:
+        db.close()
+
+
+def _contar_nao_lidos_usuarios(usuarios: List[str]) -> Dict[str, int]:
+    """Total de não lidos de vários usuários em uma consulta (sincronização dos streams)"""
+    geracao = _cache_nao_lidos.geracao()
+    db = SessionLocal()
+    try:
+        linhas = db.query(ContadorAlerta.usuario_id, ContadorAlerta.nao_lidos).filter(
+            ContadorAlerta.usuario_id.in_(usuarios)
+        ).all()
+    finally:
+        db.close()
+    
+    contagens = dict.fromkeys(usuarios, 0)
+    contagens.update((str(linha.usuario_id), linha.nao_lidos) for linha in linhas)
+    for usuario_id, nao_lidos in contagens.items():
+        _cache_nao_lidos.set(usuario_id, nao_lidos, geracao=geracao)
+    return contagens
+
+
+barramento_alertas.definir_contador(_contar_nao_lidos_usuarios)
+
+
+def _evento_sse(evento: str, dados: Dict[str, Any]) -> str:
+    return f"event: {evento}\ndata: {json.dumps(dados)}\n\n"
+
+
+async def eventos_alertas(assinatura: Assinatura) -> AsyncIterator[str]:
+    """
+    Stream SSE de uma assinatura do barramento: `nao_lidos` ao conectar e a
+    cada mudança, `alertas` quando chegam alertas novos e um comentário a
+    cada ALERTAS_STREAM_HEARTBEAT_SECONDS para manter a conexão aberta
+    através de proxies. O banco só é consultado ao conectar; as sincronizações
+    chegam prontas do barramento.
+    """
+    try:
+        yield f"retry: {settings.ALERTAS_STREAM_RETRY_MS}\n\n"
+        nao_lidos = await run_in_threadpool(_contar_nao_lidos, assinatura.usuario_id, True)
+        yield _evento_sse("nao_lidos", {"nao_lidos": nao_lidos})
+        
+        while True:
+            try:
+                evento = await asyncio.wait_for(
+                    assinatura.fila.get(),
+                    timeout=settings.ALERTAS_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            
+            if evento is None:
+                break
+            if evento["evento"] == "nao_lidos":
+                # Sincronização feita pelo barramento, uma leitura por usuário
+                yield _evento_sse("nao_lidos", {"nao_lidos": evento["nao_lidos"]})
+                continue
+            
+            dados = evento["dados"]
+            if dados.get("novos"):
+                yield _evento_sse("alertas", {"novos": dados["novos"]})
+            yield _evento_sse("nao_lidos", {"nao_lidos": dados["nao_lidos"]})
+    finally:
+        barramento_alertas.cancelar(assinatura)
@@ -0,0 +1,278 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from dateutil.relativedelta import relativedelta
+from typing import Any, Dict, Optional, Sequence
+from decimal import Decimal
+import io
+import time
+import uuid
+
+import numpy as np
+
+from app.core.amortizacao import Cronogramas, calcular_cronogramas, para_centavos, para_decimal, taxa_mensal
+from app.core.replicas import roteador_leitura
+from app.models.emprestimo import Emprestimo
+from app.models.parcela_emprestimo import ParcelaEmprestimo
+from app.schemas.emprestimo import CronogramaResponse, ParcelaCronograma
+
+# Empréstimos por lote na geração em massa (cada lote é um COPY de lote x prazo linhas)
+LOTE_CRONOGRAMAS = 1000
+
+UUID_INICIAL = "00000000-0000-0000-0000-000000000000"
+
+# Parcelas calculadas são copiadas em centavos; o vencimento é data_inicio + n meses
+# (make_interval ajusta para o último dia do mês quando necessário)
+SQL_INSERIR_PARCELAS = """
+    INSERT INTO parcelas_emprestimo (
+        id, emprestimo_id, numero_parcela, data_vencimento,
+        valor, valor_principal, valor_juros, status, valor_pago
+    )
+    SELECT uuid_generate_v4(),
+           e.id,
+           c.numero_parcela,
+           (e.data_inicio + make_interval(months => c.numero_parcela))::date,
+           c.valor / 100.0,
+           c.principal / 100.0,
+           c.juros / 100.0,
+           CASE WHEN c.numero_parcela <= COALESCE(e.parcelas_pagas, 0) THEN 'paga' ELSE 'pendente' END,
+           CASE WHEN c.numero_parcela <= COALESCE(e.parcelas_pagas, 0) THEN c.valor / 100.0 ELSE 0 END
+    FROM cronograma_parcelas c
+    JOIN unnest(CAST(:ids AS uuid[])) WITH ORDINALITY AS l(id, indice) ON l.indice = c.indice
+    JOIN emprestimos e ON e.id = l.id
+    ON CONFLICT (emprestimo_id, numero_parcela) DO NOTHING
+"""
+
+
+def _cronogramas_dos_emprestimos(emprestimos: Sequence[Any]) -> Cronogramas:
+    return calcular_cronogramas(
+        np.array([para_centavos(e.valor_principal) for e in emprestimos], dtype=np.int64),
+        np.array([float(e.taxa_juros or 0) for e in emprestimos], dtype=np.float64),
+        np.array([e.total_parcelas for e in emprestimos], dtype=np.int64),
+        np.array([e.sistema_amortizacao == "sac" for e in emprestimos], dtype=bool),
+    )
+
+
+def _linhas_copy(cronogramas: Cronogramas) -> io.StringIO:
+    """CSV (índice do empréstimo, número, valor, principal, juros) das parcelas dentro do prazo"""
+    indices, meses = np.nonzero(np.arange(cronogramas.parcela.shape[1]) < cronogramas.prazos[:, None])
+    dados = np.column_stack((
+        indices + 1,
+        meses + 1,
+        cronogramas.parcela[indices, meses],
+        cronogramas.amortizacao[indices, meses],
+        cronogramas.juros[indices, meses],
+    ))
+    buffer = io.StringIO()
+    np.savetxt(buffer, dados, fmt="%d", delimiter=",")
+    buffer.seek(0)
+    return buffer
+
+
+def medir_geracao(quantidade: int = 100000, prazo: int = 360, lote: int = LOTE_CRONOGRAMAS) -> Dict[str, Any]:
+    """
+    Benchmark sem banco: calcula e serializa para COPY os cronogramas de
+    `quantidade` empréstimos sintéticos de `prazo` parcelas, em lotes, e
+    confere que as amortizações somam exatamente o principal
+    """
+    gerador = np.random.default_rng(42)
+    estatisticas = {"emprestimos": 0, "parcelas": 0, "calculo_segundos": 0.0, "serializacao_segundos": 0.0, "conferido": True}
+
+    for inicio in range(0, quantidade, lote):
+        tamanho = min(lote, quantidade - inicio)
+        principais = gerador.integers(100_000, 100_000_000, size=tamanho, dtype=np.int64)
+        taxas = gerador.uniform(0, 40, size=tamanho)
+        sac = gerador.random(tamanho) < 0.5
+
+        antes = time.perf_counter()
+        cronogramas = calcular_cronogramas(principais, taxas, np.full(tamanho, prazo), sac)
+        depois = time.perf_counter()
+        _linhas_copy(cronogramas)
+        estatisticas["calculo_segundos"] += depois - antes
+        estatisticas["serializacao_segundos"] += time.perf_counter() - depois
+
+        estatisticas["conferido"] &= bool(np.array_equal(cronogramas.amortizacao.sum(axis=1), principais))
+        estatisticas["emprestimos"] += tamanho
+        estatisticas["parcelas"] += tamanho * prazo
+
+    total = estatisticas["calculo_segundos"] + estatisticas["serializacao_segundos"]
+    estatisticas["calculo_segundos"] = round(estatisticas["calculo_segundos"], 3)
+    estatisticas["serializacao_segundos"] = round(estatisticas["serializacao_segundos"], 3)
+    estatisticas["parcelas_por_segundo"] = round(estatisticas["parcelas"] / total) if total else 0
+    return estatisticas
+
+
+class AmortizacaoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _obter_emprestimo(self, usuario_id: uuid.UUID, emprestimo_id: uuid.UUID) -> Emprestimo:
+        emprestimo = self.db.query(Emprestimo).filter(
+            Emprestimo.id == emprestimo_id,
+            Emprestimo.usuario_id == usuario_id
+        ).first()
+        if not emprestimo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Empréstimo não encontrado"
+            )
+        return emprestimo
+    
+    def _inserir_parcelas(self, emprestimos: Sequence[Any]) -> int:
+        """Calcula e insere as parcelas dos empréstimos com um COPY e um INSERT ... SELECT (sem commit)"""
+        buffer = _linhas_copy(_cronogramas_dos_emprestimos(emprestimos))
+        
+        self.db.execute(text("""
+            CREATE TEMP TABLE cronograma_parcelas (
+                indice INTEGER NOT NULL,
+                numero_parcela INTEGER NOT NULL,
+                valor BIGINT NOT NULL,
+                principal BIGINT NOT NULL,
+                juros BIGINT NOT NULL
+            ) ON COMMIT DROP
+        """))
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert("COPY cronograma_parcelas FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        
+        resultado = self.db.execute(text(SQL_INSERIR_PARCELAS), {"ids": [str(e.id) for e in emprestimos]})
+        return resultado.rowcount
+    
+    def _simular(self, emprestimo: Emprestimo, sistema: str) -> CronogramaResponse:
+        cronogramas = calcular_cronogramas(
+            np.array([para_centavos(emprestimo.valor_principal)], dtype=np.int64),
+            np.array([float(emprestimo.taxa_juros or 0)], dtype=np.float64),
+            np.array([emprestimo.total_parcelas], dtype=np.int64),
+            np.array([sistema == "sac"], dtype=bool),
+        )
+        parcelas = [
+            ParcelaCronograma(
+                numero_parcela=mes + 1,
+                data_vencimento=emprestimo.data_inicio + relativedelta(months=mes + 1),
+                valor=para_decimal(cronogramas.parcela[0, mes]),
+                valor_principal=para_decimal(cronogramas.amortizacao[0, mes]),
+                valor_juros=para_decimal(cronogramas.juros[0, mes]),
+                saldo_devedor=para_decimal(cronogramas.saldo[0, mes]),
+            )
+            for mes in range(emprestimo.total_parcelas)
+        ]
+        return self._resposta(emprestimo, sistema, parcelas, persistido=False)
+    
+    def _resposta(self, emprestimo: Emprestimo, sistema: str, parcelas, persistido: bool) -> CronogramaResponse:
+        total_juros_parcelas = sum((p.valor_juros for p in parcelas), Decimal("0.00"))
+        return CronogramaResponse(
+            emprestimo_id=emprestimo.id,
+            sistema_amortizacao=sistema,
+            taxa_juros_mensal=round(float(taxa_mensal([float(emprestimo.taxa_juros or 0)])[0]) * 100, 6),
+            valor_principal=emprestimo.valor_principal,
+            total_juros=total_juros_parcelas,
+            total_pago=sum((p.valor for p in parcelas), Decimal("0.00")),
+            persistido=persistido,
+            parcelas=parcelas
+        )
+    
+    def cronograma(self, usuario_id: uuid.UUID, emprestimo_id: uuid.UUID, sistema: Optional[str] = None) -> CronogramaResponse:
+        """
+        Cronograma do empréstimo: as parcelas gravadas, se existirem e o
+        sistema pedido for o do empréstimo; senão, a simulação pelo sistema
+        informado (padrão: o do empréstimo)
+        """
+        emprestimo = self._obter_emprestimo(usuario_id, emprestimo_id)
+        sistema = sistema or emprestimo.sistema_amortizacao
+        
+        if sistema == emprestimo.sistema_amortizacao:
+            registros = self.db.query(ParcelaEmprestimo).filter(
+                ParcelaEmprestimo.emprestimo_id == emprestimo_id
+            ).order_by(ParcelaEmprestimo.numero_parcela).all()
+            if registros:
+                saldo = emprestimo.valor_principal
+                parcelas = []
+                for registro in registros:
+                    saldo -= registro.valor_principal
+                    parcelas.append(ParcelaCronograma(
+                        numero_parcela=registro.numero_parcela,
+                        data_vencimento=registro.data_vencimento,
+                        valor=registro.valor,
+                        valor_principal=registro.valor_principal,
+                        valor_juros=registro.valor_juros,
+                        saldo_devedor=saldo,
+                    ))
+                return self._resposta(emprestimo, sistema, parcelas, persistido=True)
+        
+        return self._simular(emprestimo, sistema)
+    
+    def gerar(self, usuario_id: uuid.UUID, emprestimo_id: uuid.UUID, sistema: Optional[str] = None) -> CronogramaResponse:
+        """
+        Grava as parcelas do empréstimo pelo sistema informado (que passa a ser
+        o do empréstimo); parcelas já pagas (parcelas_pagas) são gravadas como pagas
+        """
+        emprestimo = self._obter_emprestimo(usuario_id, emprestimo_id)
+        possui_parcelas = self.db.query(ParcelaEmprestimo.id).filter(
+            ParcelaEmprestimo.emprestimo_id == emprestimo_id
+        ).first() is not None
+        if possui_parcelas:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Empréstimo já possui parcelas"
+            )
+        if not emprestimo.total_parcelas or emprestimo.total_parcelas < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empréstimo sem número de parcelas"
+            )
+        
+        try:
+            if sistema and sistema != emprestimo.sistema_amortizacao:
+                emprestimo.sistema_amortizacao = sistema
+                self.db.flush()
+            self._inserir_parcelas([emprestimo])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        roteador_leitura.registrar_escrita(usuario_id)
+        return self.cronograma(usuario_id, emprestimo_id)
+    
+    def gerar_pendentes(self, lote: int = LOTE_CRONOGRAMAS) -> Dict[str, Any]:
+        """
+        Grava o cronograma de todos os empréstimos ativos que ainda não têm
+        parcelas, em lotes pelo id; cada lote é confirmado separadamente e
+        executar de novo apenas continua os que faltam
+        """
+        estatisticas = {"lotes": 0, "emprestimos": 0, "parcelas": 0}
+        inicio = time.perf_counter()
+        ultimo_id = UUID_INICIAL
+        
+        while True:
+            emprestimos = self.db.execute(text("""
+                SELECT e.id, e.valor_principal, e.taxa_juros, e.total_parcelas, e.sistema_amortizacao
+                FROM emprestimos e
+                WHERE e.id > :ultimo_id
+                  AND e.ativo = true
+                  AND e.total_parcelas > 0
+                  AND NOT EXISTS (SELECT 1 FROM parcelas_emprestimo p WHERE p.emprestimo_id = e.id)
+                ORDER BY e.id
+                LIMIT :lote
+            """), {"ultimo_id": ultimo_id, "lote": lote}).all()
+            if not emprestimos:
+                break
+            
+            try:
+                parcelas = self._inserir_parcelas(emprestimos)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            ultimo_id = str(emprestimos[-1].id)
+            estatisticas["lotes"] += 1
+            estatisticas["emprestimos"] += len(emprestimos)
+            estatisticas["parcelas"] += parcelas
+        
+        duracao = time.perf_counter() - inicio
+        estatisticas["duracao_segundos"] = round(duracao, 3)
+        estatisticas["parcelas_por_segundo"] = round(estatisticas["parcelas"] / duracao, 1) if duracao else 0.0
+        return estatisticas
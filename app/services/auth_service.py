@@ -1,59 +1,122 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from fastapi import HTTPException, status
-from typing import Optional
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 from datetime import datetime, timedelta
 
 from app.models.usuario import Usuario
 from app.models.configuracao_usuario import ConfiguracaoUsuario
 from app.models.categoria import Categoria
-from app.core.security import get_password_hash, verify_password, create_access_token
-from app.schemas.usuario import UsuarioCreate, UsuarioResponse
+from app.core.security import (
+    HashPoolSaturadoError,
+    create_access_token,
+    get_password_hash_async,
+    get_password_hashes_async,
+    verify_password_async,
+)
+from app.schemas.usuario import UsuarioCreate, UsuarioResponse, ResultadoRegistroLote, RegistroLoteResponse
 from app.schemas.auth import Token
 
+# Valores padrão criados junto com cada novo usuário
+CONFIGURACAO_PADRAO = {
+    'moeda': 'BRL',
+    'formato_data': 'DD/MM/YYYY',
+    'tema': 'auto',
+    'notificacoes_email': True,
+    'notificacoes_push': True,
+    'dia_fechamento_mes': 1
+}
+
+CATEGORIAS_PADRAO = [
+    # Categorias de Despesa
+    {
+        'nome': 'Alimentação',
+        'descricao': 'Gastos com comida e bebida',
+        'tipo': 'despesa',
+        'cor': '#FF6B6B',
+        'icone': 'restaurant'
+    },
+    {
+        'nome': 'Transporte',
+        'descricao': 'Gastos com locomoção',
+        'tipo': 'despesa',
+        'cor': '#4ECDC4',
+        'icone': 'directions_car'
+    },
+    {
+        'nome': 'Moradia',
+        'descricao': 'Aluguel, financiamento, condomínio',
+        'tipo': 'despesa',
+        'cor': '#45B7D1',
+        'icone': 'home'
+    },
+    {
+        'nome': 'Saúde',
+        'descricao': 'Médicos, medicamentos, plano de saúde',
+        'tipo': 'despesa',
+        'cor': '#96CEB4',
+        'icone': 'local_hospital'
+    },
+    # Categorias de Receita
+    {
+        'nome': 'Salário',
+        'descricao': 'Salário e bonificações',
+        'tipo': 'receita',
+        'cor': '#55A3FF',
+        'icone': 'work'
+    },
+    {
+        'nome': 'Freelance',
+        'descricao': 'Trabalhos extras',
+        'tipo': 'receita',
+        'cor': '#26DE81',
+        'icone': 'business_center'
+    }
+]
+
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def criar_usuario_completo(self, usuario_data: UsuarioCreate) -> UsuarioResponse:
+    async def criar_usuario_completo(self, usuario_data: UsuarioCreate) -> UsuarioResponse:
         """
         Cria um usuário completo com configurações padrão e categorias iniciais
         """
+        # Email já cadastrado responde 400 sem ocupar o pool de hash; o
+        # ON CONFLICT continua cobrindo cadastros simultâneos do mesmo email
+        if await run_in_threadpool(self._emails_cadastrados, [usuario_data.email]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email já cadastrado no sistema"
+            )
+        senha_hash = await self._executar_hash(get_password_hash_async(usuario_data.senha))
+        return await run_in_threadpool(self._persistir_usuario_completo, usuario_data, senha_hash)
+    
+    def _persistir_usuario_completo(self, usuario_data: UsuarioCreate, senha_hash: str) -> UsuarioResponse:
+        """Grava o usuário, configurações e categorias (executado no threadpool)"""
         try:
-            # Verificar se email já existe
-            if self.db.query(Usuario).filter(Usuario.email == usuario_data.email).first():
+            criados = self._provisionar_usuarios([self._linha_usuario(usuario_data, senha_hash)])
+            
+            # Email já existente: o INSERT ... ON CONFLICT não retornou nenhuma linha
+            if not criados:
+                self.db.rollback()
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email já cadastrado no sistema"
                 )
             
-            # Criar o usuário
-            senha_hash = get_password_hash(usuario_data.senha)
-            
-            novo_usuario = Usuario(
-                email=usuario_data.email,
-                senha_hash=senha_hash,
-                primeiro_nome=usuario_data.primeiro_nome,
-                ultimo_nome=usuario_data.ultimo_nome,
-                telefone=usuario_data.telefone
-            )
-            
-            self.db.add(novo_usuario)
-            self.db.flush()  # Para obter o ID sem fazer commit
-            
-            # Criar configurações padrão
-            self._criar_configuracoes_padrao(novo_usuario.id)
-            
-            # Criar categorias padrão
-            self._criar_categorias_padrao(novo_usuario.id)
-            
-            # Commit final
+            # Montada antes do commit, que expira o objeto e forçaria um novo SELECT
+            resposta = UsuarioResponse.from_orm(criados[0])
             self.db.commit()
-            self.db.refresh(novo_usuario)
-            
-            return UsuarioResponse.from_orm(novo_usuario)
+            return resposta
             
+        except HTTPException:
+            raise
         except IntegrityError:
             self.db.rollback()
             raise HTTPException(
@@ -67,93 +130,202 @@ class AuthService:
                 detail=f"Erro interno: {str(e)}"
             )
     
-    def _criar_configuracoes_padrao(self, usuario_id: uuid.UUID):
-        """Cria configurações padrão para o usuário"""
-        configuracao = ConfiguracaoUsuario(
-            usuario_id=usuario_id,
-            moeda='BRL',
-            formato_data='DD/MM/YYYY',
-            tema='auto',
-            notificacoes_email=True,
-            notificacoes_push=True,
-            dia_fechamento_mes=1
+    async def criar_usuarios_em_lote(self, usuarios: List[Dict[str, Any]]) -> RegistroLoteResponse:
+        """
+        Cria vários usuários com configurações e categorias padrão.
+        
+        Cada linha é validada individualmente e os erros são reportados por
+        linha, sem interromper o restante do lote.
+        """
+        resultados: Dict[int, ResultadoRegistroLote] = {}
+        validos: List[Tuple[int, UsuarioCreate]] = []
+        emails_no_lote = set()
+        
+        for indice, dados in enumerate(usuarios):
+            email = dados.get('email') if isinstance(dados, dict) else None
+            try:
+                usuario_data = UsuarioCreate.model_validate(dados)
+            except ValidationError as e:
+                mensagens = "; ".join(erro["msg"] for erro in e.errors())
+                resultados[indice] = ResultadoRegistroLote(indice=indice, email=email, sucesso=False, erro=mensagens)
+                continue
+            
+            if usuario_data.email in emails_no_lote:
+                resultados[indice] = ResultadoRegistroLote(
+                    indice=indice, email=usuario_data.email, sucesso=False, erro="Email duplicado no lote"
+                )
+                continue
+            
+            emails_no_lote.add(usuario_data.email)
+            validos.append((indice, usuario_data))
+        
+        cadastrados = await run_in_threadpool(
+            self._emails_cadastrados, [usuario_data.email for _, usuario_data in validos]
+        ) if validos else set()
+        for indice, usuario_data in validos:
+            if usuario_data.email in cadastrados:
+                resultados[indice] = ResultadoRegistroLote(
+                    indice=indice, email=usuario_data.email, sucesso=False, erro="Email já cadastrado no sistema"
+                )
+        validos = [(indice, usuario_data) for indice, usuario_data in validos if usuario_data.email not in cadastrados]
+        
+        if validos:
+            senhas_hash = await self._executar_hash(
+                get_password_hashes_async([usuario_data.senha for _, usuario_data in validos])
+            )
+            linhas = [
+                (indice, self._linha_usuario(usuario_data, senha_hash))
+                for (indice, usuario_data), senha_hash in zip(validos, senhas_hash)
+            ]
+            resultados.update(await run_in_threadpool(self._persistir_lote, linhas))
+        
+        ordenados = [resultados[indice] for indice in sorted(resultados)]
+        criados = sum(1 for resultado in ordenados if resultado.sucesso)
+        return RegistroLoteResponse(
+            total=len(ordenados),
+            criados=criados,
+            falhas=len(ordenados) - criados,
+            resultados=ordenados
         )
-        self.db.add(configuracao)
     
-    def _criar_categorias_padrao(self, usuario_id: uuid.UUID):
-        """Cria categorias padrão para o usuário"""
-        categorias_padrao = [
-            # Categorias de Despesa
-            {
-                'nome': 'Alimentação',
-                'descricao': 'Gastos com comida e bebida',
-                'tipo': 'despesa',
-                'cor': '#FF6B6B',
-                'icone': 'restaurant'
-            },
-            {
-                'nome': 'Transporte',
-                'descricao': 'Gastos com locomoção',
-                'tipo': 'despesa',
-                'cor': '#4ECDC4',
-                'icone': 'directions_car'
-            },
-            {
-                'nome': 'Moradia',
-                'descricao': 'Aluguel, financiamento, condomínio',
-                'tipo': 'despesa',
-                'cor': '#45B7D1',
-                'icone': 'home'
-            },
-            {
-                'nome': 'Saúde',
-                'descricao': 'Médicos, medicamentos, plano de saúde',
-                'tipo': 'despesa',
-                'cor': '#96CEB4',
-                'icone': 'local_hospital'
-            },
-            # Categorias de Receita
-            {
-                'nome': 'Salário',
-                'descricao': 'Salário e bonificações',
-                'tipo': 'receita',
-                'cor': '#55A3FF',
-                'icone': 'work'
-            },
-            {
-                'nome': 'Freelance',
-                'descricao': 'Trabalhos extras',
-                'tipo': 'receita',
-                'cor': '#26DE81',
-                'icone': 'business_center'
-            }
-        ]
+    def _persistir_lote(self, linhas: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, ResultadoRegistroLote]:
+        """
+        Grava o lote com INSERTs em conjunto; se o lote inteiro falhar (ex.: valor
+        fora do tamanho da coluna), grava linha a linha isolando as inválidas
+        """
+        try:
+            criados = self._provisionar_usuarios([linha for _, linha in linhas])
+            # Lidos antes do commit: depois dele cada atributo expirado custaria um SELECT
+            ids_por_email = {usuario.email: usuario.id for usuario in criados}
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            return self._persistir_linha_a_linha(linhas)
         
-        for cat_data in categorias_padrao:
-            categoria = Categoria(
+        resultados = {}
+        for indice, linha in linhas:
+            usuario_id = ids_por_email.get(linha['email'])
+            resultados[indice] = ResultadoRegistroLote(
+                indice=indice,
+                email=linha['email'],
+                sucesso=usuario_id is not None,
+                usuario_id=usuario_id,
+                erro=None if usuario_id else "Email já cadastrado no sistema"
+            )
+        return resultados
+    
+    def _persistir_linha_a_linha(self, linhas: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, ResultadoRegistroLote]:
+        resultados = {}
+        for indice, linha in linhas:
+            try:
+                with self.db.begin_nested():
+                    criados = self._provisionar_usuarios([linha])
+                    usuario_id = criados[0].id if criados else None
+            except SQLAlchemyError as e:
+                resultados[indice] = ResultadoRegistroLote(
+                    indice=indice, email=linha['email'], sucesso=False, erro=str(getattr(e, 'orig', None) or e)
+                )
+                continue
+            
+            resultados[indice] = ResultadoRegistroLote(
+                indice=indice,
+                email=linha['email'],
+                sucesso=usuario_id is not None,
                 usuario_id=usuario_id,
-                **cat_data
+                erro=None if usuario_id else "Email já cadastrado no sistema"
+            )
+        self.db.commit()
+        return resultados
+    
+    def _emails_cadastrados(self, emails: List[str]) -> set:
+        """Emails que já existem, consultados antes do hash (executado no threadpool)"""
+        try:
+            return {email for (email,) in self.db.query(Usuario.email).filter(Usuario.email.in_(emails))}
+        finally:
+            # Libera a conexão enquanto as senhas são processadas
+            self.db.rollback()
+    
+    def _linha_usuario(self, usuario_data: UsuarioCreate, senha_hash: str) -> Dict[str, Any]:
+        return {
+            'id': uuid.uuid4(),
+            'email': usuario_data.email,
+            'senha_hash': senha_hash,
+            'primeiro_nome': usuario_data.primeiro_nome,
+            'ultimo_nome': usuario_data.ultimo_nome,
+            'telefone': usuario_data.telefone
+        }
+    
+    def _provisionar_usuarios(self, linhas: List[Dict[str, Any]]) -> List[Usuario]:
+        """
+        Insere usuários, configurações e categorias padrão com um INSERT por tabela.
+        
+        Emails já cadastrados são ignorados pelo ON CONFLICT e ficam fora do
+        RETURNING; a consulta feita antes do hash não cobre cadastros simultâneos.
+        """
+        stmt = (
+            pg_insert(Usuario)
+            .values(linhas)
+            .on_conflict_do_nothing(index_elements=[Usuario.email])
+            .returning(Usuario)
+        )
+        criados = list(self.db.scalars(stmt))
+        if not criados:
+            return criados
+        
+        self.db.execute(
+            insert(ConfiguracaoUsuario),
+            [{'usuario_id': usuario.id, **CONFIGURACAO_PADRAO} for usuario in criados]
+        )
+        self.db.execute(
+            insert(Categoria),
+            [
+                {'usuario_id': usuario.id, **cat_data}
+                for usuario in criados
+                for cat_data in CATEGORIAS_PADRAO
+            ]
+        )
+        return criados
+    
+    async def _executar_hash(self, operacao):
+        """Aguarda uma operação do pool de bcrypt, respondendo 503 se ele estiver cheio"""
+        try:
+            return await operacao
+        except HashPoolSaturadoError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
             )
-            self.db.add(categoria)
     
-    def autenticar_usuario(self, email: str, senha: str) -> Optional[Usuario]:
+    def _buscar_usuario_ativo_por_email(self, email: str) -> Optional[Usuario]:
+        """Carrega o usuário e devolve a conexão ao pool antes da verificação da senha"""
+        try:
+            usuario = self.db.query(Usuario).filter(
+                Usuario.email == email,
+                Usuario.ativo == True
+            ).first()
+            if usuario is not None:
+                # Desanexado, o rollback não expira os atributos já carregados
+                self.db.expunge(usuario)
+            return usuario
+        finally:
+            self.db.rollback()
+    
+    async def autenticar_usuario(self, email: str, senha: str) -> Optional[Usuario]:
         """Autentica um usuário"""
-        usuario = self.db.query(Usuario).filter(
-            Usuario.email == email,
-            Usuario.ativo == True
-        ).first()
+        usuario = await run_in_threadpool(self._buscar_usuario_ativo_por_email, email)
         
         if not usuario:
             return None
         
-        if not verify_password(senha, usuario.senha_hash):
+        if not await self._executar_hash(verify_password_async(senha, usuario.senha_hash)):
             return None
         
         return usuario
     
-    def fazer_login(self, email: str, senha: str) -> Token:
+    async def fazer_login(self, email: str, senha: str) -> Token:
         """Realiza o login e retorna o token"""
-        usuario = self.autenticar_usuario(email, senha)
+        usuario = await self.autenticar_usuario(email, senha)
         
         if not usuario:
             raise HTTPException(
@@ -0,0 +1,39 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+
+from app.models.checkpoint_tarefa import CheckpointTarefa
+
+
+class CheckpointService:
+    """
+    Leitura e gravação de checkpoints de tarefas em lote. Os métodos de
+    escrita não fazem commit: o checkpoint deve ser confirmado na mesma
+    transação do lote que ele descreve.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def obter(self, nome: str) -> Optional[CheckpointTarefa]:
+        return self.db.get(CheckpointTarefa, nome, populate_existing=True)
+    
+    def _gravar(self, nome: str, valores: Dict[str, Any]):
+        self.db.execute(
+            pg_insert(CheckpointTarefa)
+            .values(nome=nome, **valores)
+            .on_conflict_do_update(
+                index_elements=[CheckpointTarefa.nome],
+                set_={**valores, "atualizado_em": func.now()}
+            )
+        )
+    
+    def iniciar(self, nome: str, posicao: Optional[Dict[str, Any]] = None):
+        self._gravar(nome, {"posicao": posicao, "iniciado_em": func.now(), "concluido_em": None})
+    
+    def salvar(self, nome: str, posicao: Optional[Dict[str, Any]]):
+        self._gravar(nome, {"posicao": posicao})
+    
+    def concluir(self, nome: str, posicao: Optional[Dict[str, Any]] = None):
+        self._gravar(nome, {"posicao": posicao, "concluido_em": func.now()})
@@ -0,0 +1,71 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from datetime import date
+import uuid
+
+# Massa de dados para benchmarks e testes contra o banco. Nada aqui faz
+# commit: quem chama mede dentro da transação e desfaz com rollback.
+
+# Descrições variadas o bastante para a busca textual e por trecho
+DESCRICOES = [
+    "Supermercado Pão de Açúcar",
+    "Posto de gasolina Shell",
+    "Farmácia São João",
+    "Restaurante japonês",
+    "Uber viagem centro",
+    "Assinatura Netflix",
+    "Salário mensal",
+    "Aluguel do apartamento",
+    "Conta de luz",
+    "Mensalidade da academia",
+]
+
+SQL_TRANSACOES = """
+    INSERT INTO transacoes (
+        id, usuario_id, descricao, valor, tipo_transacao, data_transacao, status, etiquetas
+    )
+    SELECT uuid_generate_v4(),
+           :usuario_id,
+           (CAST(:descricoes AS varchar[]))[1 + g % :total_descricoes] || ' ' || g,
+           round((1 + random() * 999)::numeric, 2),
+           CASE WHEN g % :total_descricoes = 6 THEN 'receita' ELSE 'despesa' END,
+           CAST(:hoje AS date) - (g % :dias),
+           CASE WHEN g % 50 = 0 THEN 'pendente' ELSE 'concluida' END,
+           CASE
+               WHEN g % 20 = 0 THEN ARRAY['viagem', 'reembolso']::varchar[]
+               WHEN g % 7 = 0 THEN ARRAY['trabalho']::varchar[]
+               ELSE ARRAY[]::varchar[]
+           END
+    FROM generate_series(1, :quantidade) AS g
+"""
+
+
+def criar_usuario(db: Session) -> uuid.UUID:
+    """Usuário descartável, com email único, dono da massa gerada"""
+    usuario_id = uuid.uuid4()
+    db.execute(text("""
+        INSERT INTO usuarios (id, email, senha_hash, primeiro_nome, ultimo_nome)
+        VALUES (:id, :email, '!', 'Dados', 'Sintéticos')
+    """), {"id": usuario_id, "email": f"sintetico-{usuario_id}@exemplo.invalid"})
+    return usuario_id
+
+
+def gerar_transacoes(db: Session, usuario_id: uuid.UUID, quantidade: int, dias: int = 3650) -> None:
+    """
+    Insere `quantidade` transações do usuário com um único INSERT ... SELECT,
+    espalhadas pelos últimos `dias` dias, e atualiza as estatísticas da
+    tabela para o planejador considerar o volume novo
+    """
+    # Sem conta bancária não há saldo a ajustar; o trigger por linha é dispensado
+    db.execute(text("SELECT set_config('app.importacao_em_lote', 'on', true)"))
+    db.execute(text("SELECT setseed(0.42)"))
+    db.execute(text(SQL_TRANSACOES), {
+        "usuario_id": usuario_id,
+        "descricoes": DESCRICOES,
+        "total_descricoes": len(DESCRICOES),
+        "hoje": date.today(),
+        "dias": dias,
+        "quantidade": quantidade,
+    })
+    db.execute(text("SELECT set_config('app.importacao_em_lote', 'off', true)"))
+    db.execute(text("ANALYZE transacoes"))
@@ -0,0 +1,150 @@
+from sqlalchemy import select
+from typing import Iterator, Optional
+from datetime import date
+import csv
+import io
+import json
+import uuid
+import zlib
+
+from app.models.transacao import Transacao
+from app.models.categoria import Categoria
+from app.models.conta_bancaria import ContaBancaria
+from app.models.cartao_credito import CartaoCredito
+from app.core.replicas import roteador_leitura
+
+# Linhas trazidas do cursor do servidor por vez
+LOTE_EXPORTACAO = 1000
+
+# Tamanho aproximado de cada bloco enviado ao cliente
+TAMANHO_BLOCO = 64 * 1024
+
+COLUNAS_EXPORTACAO = [
+    "id",
+    "data_transacao",
+    "descricao",
+    "valor",
+    "tipo_transacao",
+    "status",
+    "categoria",
+    "conta_bancaria",
+    "cartao_credito",
+    "data_vencimento",
+    "observacoes",
+    "etiquetas",
+]
+
+
+def _consulta_exportacao(
+    usuario_id: uuid.UUID,
+    data_inicio: Optional[date],
+    data_fim: Optional[date],
+    tipo_transacao: Optional[str]
+):
+    """Transações do usuário com os nomes de categoria, conta e cartão (como em vw_transacoes_mes_atual)"""
+    consulta = (
+        select(
+            Transacao.id,
+            Transacao.data_transacao,
+            Transacao.descricao,
+            Transacao.valor,
+            Transacao.tipo_transacao,
+            Transacao.status,
+            Categoria.nome.label("categoria"),
+            ContaBancaria.nome.label("conta_bancaria"),
+            CartaoCredito.nome.label("cartao_credito"),
+            Transacao.data_vencimento,
+            Transacao.observacoes,
+            Transacao.etiquetas,
+        )
+        .outerjoin(Categoria, Transacao.categoria_id == Categoria.id)
+        .outerjoin(ContaBancaria, Transacao.conta_bancaria_id == ContaBancaria.id)
+        .outerjoin(CartaoCredito, Transacao.cartao_credito_id == CartaoCredito.id)
+        .where(Transacao.usuario_id == usuario_id)
+    )
+    if data_inicio:
+        consulta = consulta.where(Transacao.data_transacao >= data_inicio)
+    if data_fim:
+        consulta = consulta.where(Transacao.data_transacao <= data_fim)
+    if tipo_transacao:
+        consulta = consulta.where(Transacao.tipo_transacao == tipo_transacao)
+
+    return consulta.order_by(Transacao.data_transacao, Transacao.id)
+
+
+def _linhas_exportacao(usuario_id: uuid.UUID, **filtros) -> Iterator[dict]:
+    """
+    Percorre o resultado com um cursor do servidor (yield_per), mantendo em
+    memória apenas um lote por vez. A sessão é aberta aqui, e não na
+    dependência da rota, porque precisa durar até o fim do streaming.
+    """
+    db = roteador_leitura.criar_sessao(usuario_id)
+    try:
+        resultado = db.execute(
+            _consulta_exportacao(usuario_id, **filtros).execution_options(yield_per=LOTE_EXPORTACAO)
+        )
+        for linha in resultado:
+            yield linha._asdict()
+    finally:
+        db.close()
+
+
+def _blocos_csv(linhas: Iterator[dict]) -> Iterator[str]:
+    saida = io.StringIO()
+    escritor = csv.writer(saida)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+    for linha in linhas:
+        etiquetas = linha["etiquetas"]
+        linha["etiquetas"] = "|".join(etiquetas) if etiquetas else ""
+        escritor.writerow([linha[coluna] for coluna in COLUNAS_EXPORTACAO])
+        if saida.tell() >= TAMANHO_BLOCO:
+            yield saida.getvalue()
+            saida.seek(0)
+            saida.truncate()
+    yield saida.getvalue()
+
+
+def _blocos_ndjson(linhas: Iterator[dict]) -> Iterator[str]:
+    partes = []
+    tamanho = 0
+    for linha in linhas:
+        registro = json.dumps(linha, default=str, ensure_ascii=False) + "\n"
+        partes.append(registro)
+        tamanho += len(registro)
+        if tamanho >= TAMANHO_BLOCO:
+            yield "".join(partes)
+            partes = []
+            tamanho = 0
+    yield "".join(partes)
+
+
+def _compactar_gzip(blocos: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+    for bloco in blocos:
+        compactado = compressor.compress(bloco)
+        if compactado:
+            yield compactado
+    yield compressor.flush()
+
+
+def exportar_transacoes(
+    usuario_id: uuid.UUID,
+    formato: str = "csv",
+    compactar: bool = False,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    tipo_transacao: Optional[str] = None
+) -> Iterator[bytes]:
+    """
+    Gera o arquivo de exportação em blocos, para uso em um StreamingResponse.
+    Nada é consultado até o primeiro bloco ser pedido.
+    """
+    linhas = _linhas_exportacao(
+        usuario_id,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        tipo_transacao=tipo_transacao
+    )
+    blocos = _blocos_ndjson(linhas) if formato == "ndjson" else _blocos_csv(linhas)
+    blocos = (bloco.encode("utf-8") for bloco in blocos if bloco)
+    return _compactar_gzip(blocos) if compactar else blocos
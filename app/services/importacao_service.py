@@ -0,0 +1,374 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+import codecs
+import csv
+import io
+import re
+import uuid
+
+from app.models.conta_bancaria import ContaBancaria
+from app.models.categoria import Categoria
+from app.core.replicas import roteador_leitura
+from app.services.resumo_financeiro_service import invalidar_resumo_financeiro
+from app.schemas.transacao import ErroImportacao, ImportacaoResponse
+
+# Tamanho dos blocos lidos do arquivo enviado
+TAMANHO_BLOCO = 64 * 1024
+
+# Limite de erros detalhados na resposta (os demais são apenas contados)
+MAX_ERROS_REPORTADOS = 100
+
+# Maior valor absoluto que cabe em NUMERIC(15, 2)
+VALOR_LIMITE = Decimal("1e13")
+
+# (linha, data_transacao, descricao, valor com sinal)
+LinhaImportada = Tuple[int, date, str, Decimal]
+
+
+class LinhaInvalidaError(ValueError):
+    pass
+
+
+def _converter_data(valor: str) -> date:
+    valor = valor.strip()
+    for formato in ("%d/%m/%Y", "%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise LinhaInvalidaError(f"Data inválida: {valor!r}")
+
+
+def _converter_valor(valor: str) -> Decimal:
+    """Aceita 1234.56, -1234,56 e 1.234,56"""
+    valor = valor.strip().replace(" ", "")
+    if "," in valor:
+        valor = valor.replace(".", "").replace(",", ".")
+    try:
+        convertido = Decimal(valor).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise LinhaInvalidaError(f"Valor inválido: {valor!r}")
+    # NaN passa pelo quantize e valores grandes demais fariam o COPY do lote inteiro falhar
+    if not convertido.is_finite() or abs(convertido) >= VALOR_LIMITE:
+        raise LinhaInvalidaError(f"Valor inválido: {valor!r}")
+    return convertido
+
+
+def ler_csv(arquivo: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Lê um CSV com as colunas data, descricao e valor (separador ';' ou ',').
+    Valores negativos são despesas. Produz (linha, LinhaImportada) ou
+    (linha, LinhaInvalidaError) sem carregar o arquivo em memória.
+    """
+    texto = codecs.getreader("utf-8-sig")(arquivo)
+    cabecalho = texto.readline()
+    delimitador = ";" if cabecalho.count(";") >= cabecalho.count(",") else ","
+    colunas = [coluna.strip().lower() for coluna in next(csv.reader([cabecalho], delimiter=delimitador), [])]
+
+    faltando = {"data", "descricao", "valor"} - set(colunas)
+    if faltando:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Colunas obrigatórias ausentes no CSV: {', '.join(sorted(faltando))}"
+        )
+
+    for numero, registro in enumerate(csv.DictReader(texto, fieldnames=colunas, delimiter=delimitador), start=2):
+        try:
+            descricao = (registro.get("descricao") or "").strip()
+            if not descricao:
+                raise LinhaInvalidaError("Descrição vazia")
+            yield numero, (
+                numero,
+                _converter_data(registro.get("data") or ""),
+                descricao,
+                _converter_valor(registro.get("valor") or ""),
+            )
+        except LinhaInvalidaError as e:
+            yield numero, e
+
+
+_TAG_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def ler_ofx(arquivo: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Lê os lançamentos (<STMTTRN>) de um extrato OFX, SGML ou XML, em blocos.
+    A numeração de linha é a posição do lançamento no extrato.
+    """
+    decodificador = codecs.getincrementaldecoder("latin-1")()
+    pendente = ""
+    lancamento = None
+    numero = 0
+
+    while True:
+        bloco = arquivo.read(TAMANHO_BLOCO)
+        pendente += decodificador.decode(bloco, final=not bloco)
+
+        # Mantém a última tag (possivelmente incompleta) para o próximo bloco
+        corte = len(pendente) if not bloco else pendente.rfind("<")
+        if corte <= 0:
+            if not bloco:
+                break
+            continue
+        trecho, pendente = pendente[:corte], pendente[corte:]
+
+        for fechamento, tag, conteudo in _TAG_OFX.findall(trecho):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not fechamento:
+                    lancamento = {}
+                elif lancamento is not None:
+                    numero += 1
+                    try:
+                        yield numero, _lancamento_ofx(numero, lancamento)
+                    except LinhaInvalidaError as e:
+                        yield numero, e
+                    lancamento = None
+            elif lancamento is not None and not fechamento:
+                lancamento[tag] = conteudo.strip()
+
+        if not bloco:
+            break
+
+
+def _lancamento_ofx(numero: int, lancamento: dict) -> LinhaImportada:
+    descricao = (lancamento.get("MEMO") or lancamento.get("NAME") or "").strip()
+    if not descricao:
+        raise LinhaInvalidaError("Lançamento sem descrição")
+    return (
+        numero,
+        _converter_data((lancamento.get("DTPOSTED") or "")[:8]),
+        descricao,
+        _converter_valor(lancamento.get("TRNAMT") or ""),
+    )
+
+
+class _FluxoCopy:
+    """Objeto arquivo para COPY FROM STDIN alimentado por um gerador de linhas"""
+
+    def __init__(self, linhas: Iterator[str]):
+        self._linhas = linhas
+        self._buffer = ""
+
+    def read(self, tamanho: int = -1) -> str:
+        while tamanho < 0 or len(self._buffer) < tamanho:
+            try:
+                self._buffer += next(self._linhas)
+            except StopIteration:
+                break
+        if tamanho < 0:
+            dados, self._buffer = self._buffer, ""
+        else:
+            dados, self._buffer = self._buffer[:tamanho], self._buffer[tamanho:]
+        return dados
+
+
+class ImportacaoService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.total_linhas = 0
+        self.rejeitadas = 0
+        self.erros: List[ErroImportacao] = []
+
+    def _registrar_erro(self, linha: int, erro: str):
+        self.rejeitadas += 1
+        if len(self.erros) < MAX_ERROS_REPORTADOS:
+            self.erros.append(ErroImportacao(linha=linha, erro=erro))
+
+    def _linhas_copy(self, registros: Iterator[Tuple[int, object]]) -> Iterator[str]:
+        """Converte os registros lidos em linhas CSV para o COPY, contando os inválidos"""
+        saida = io.StringIO()
+        escritor = csv.writer(saida, lineterminator="\n")
+        for numero, registro in registros:
+            self.total_linhas += 1
+            if isinstance(registro, LinhaInvalidaError):
+                self._registrar_erro(numero, str(registro))
+                continue
+
+            linha, data_transacao, descricao, valor = registro
+            escritor.writerow([
+                linha,
+                data_transacao.isoformat(),
+                descricao[:255],
+                abs(valor),
+                "despesa" if valor < 0 else "receita",
+            ])
+            yield saida.getvalue()
+            saida.seek(0)
+            saida.truncate()
+
+    def _validar_destino(self, usuario_id: uuid.UUID, conta_bancaria_id: uuid.UUID, categoria_id: Optional[uuid.UUID]):
+        conta = self.db.query(ContaBancaria.id).filter(
+            ContaBancaria.id == conta_bancaria_id,
+            ContaBancaria.usuario_id == usuario_id,
+            ContaBancaria.ativo == True
+        ).first()
+        if not conta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conta bancária não encontrada"
+            )
+
+        if categoria_id:
+            categoria = self.db.query(Categoria.id).filter(
+                Categoria.id == categoria_id,
+                Categoria.usuario_id == usuario_id
+            ).first()
+            if not categoria:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Categoria não encontrada"
+                )
+
+    def importar(
+        self,
+        usuario_id: uuid.UUID,
+        arquivo: BinaryIO,
+        formato: str,
+        conta_bancaria_id: uuid.UUID,
+        categoria_id: Optional[uuid.UUID] = None
+    ) -> ImportacaoResponse:
+        """
+        Importa um extrato CSV ou OFX para a conta informada.
+
+        O arquivo é lido em streaming e carregado com COPY em uma tabela
+        temporária; validação, deduplicação e inserção são feitas em SQL
+        sobre o conjunto, e o saldo de cada conta recebe um único UPDATE
+        agregado (o trigger por linha fica desligado nesta transação).
+
+        A deduplicação usa a chave natural (data, descrição, valor, tipo) na
+        conta: uma linha é inserida somente se o arquivo tem mais ocorrências
+        dela do que as já existentes, então reimportar o mesmo extrato não
+        duplica lançamentos e lançamentos iguais legítimos são preservados.
+        Importações na mesma conta são serializadas por um advisory lock da
+        transação, senão duas delas contariam as mesmas existentes e ambas
+        inseririam as linhas repetidas.
+        """
+        self._validar_destino(usuario_id, conta_bancaria_id, categoria_id)
+        registros = ler_ofx(arquivo) if formato == "ofx" else ler_csv(arquivo)
+
+        try:
+            self.db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:conta_bancaria_id))"),
+                {"conta_bancaria_id": str(conta_bancaria_id)}
+            )
+            self.db.execute(text("SELECT set_config('app.importacao_em_lote', 'on', true)"))
+            self.db.execute(text("""
+                CREATE TEMP TABLE importacao_transacoes (
+                    linha INTEGER NOT NULL,
+                    data_transacao DATE NOT NULL,
+                    descricao VARCHAR(255) NOT NULL,
+                    valor NUMERIC(15, 2) NOT NULL,
+                    tipo_transacao VARCHAR(20) NOT NULL
+                ) ON COMMIT DROP
+            """))
+
+            cursor = self.db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    "COPY importacao_transacoes (linha, data_transacao, descricao, valor, tipo_transacao) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    _FluxoCopy(self._linhas_copy(registros))
+                )
+            finally:
+                cursor.close()
+
+            # Validação sobre o conjunto
+            for linha, erro in self.db.execute(text("""
+                DELETE FROM importacao_transacoes
+                WHERE valor = 0
+                RETURNING linha, 'Valor zerado'
+            """)):
+                self._registrar_erro(linha, erro)
+
+            resultado = self.db.execute(text("""
+                WITH numeradas AS (
+                    SELECT s.*,
+                           row_number() OVER (
+                               PARTITION BY data_transacao, descricao, valor, tipo_transacao
+                               ORDER BY linha
+                           ) AS ocorrencia
+                    FROM importacao_transacoes s
+                ),
+                existentes AS (
+                    SELECT t.data_transacao, t.descricao, t.valor, t.tipo_transacao, count(*) AS total
+                    FROM transacoes t
+                    WHERE t.conta_bancaria_id = :conta_bancaria_id
+                      AND t.usuario_id = :usuario_id
+                      AND t.data_transacao BETWEEN (SELECT min(data_transacao) FROM importacao_transacoes)
+                                               AND (SELECT max(data_transacao) FROM importacao_transacoes)
+                    GROUP BY t.data_transacao, t.descricao, t.valor, t.tipo_transacao
+                ),
+                inseridas AS (
+                    INSERT INTO transacoes (
+                        id, usuario_id, conta_bancaria_id, categoria_id,
+                        descricao, valor, tipo_transacao, data_transacao, status
+                    )
+                    SELECT uuid_generate_v4(), :usuario_id, :conta_bancaria_id, :categoria_id,
+                           n.descricao, n.valor, n.tipo_transacao, n.data_transacao, 'concluida'
+                    FROM numeradas n
+                    LEFT JOIN existentes e
+                      ON e.data_transacao = n.data_transacao
+                     AND e.descricao = n.descricao
+                     AND e.valor = n.valor
+                     AND e.tipo_transacao = n.tipo_transacao
+                    WHERE n.ocorrencia > COALESCE(e.total, 0)
+                    ORDER BY n.linha
+                    RETURNING conta_bancaria_id, tipo_transacao, valor
+                ),
+                saldos AS (
+                    SELECT conta_bancaria_id,
+                           sum(CASE tipo_transacao
+                                   WHEN 'receita' THEN valor
+                                   WHEN 'despesa' THEN -valor
+                                   ELSE 0
+                               END) AS variacao
+                    FROM inseridas
+                    GROUP BY conta_bancaria_id
+                ),
+                -- Executado mesmo sem ser referenciado (CTE de escrita)
+                contas AS (
+                    UPDATE contas_bancarias c
+                    SET saldo = c.saldo + s.variacao
+                    FROM saldos s
+                    WHERE c.id = s.conta_bancaria_id
+                    RETURNING c.saldo
+                )
+                SELECT
+                    (SELECT count(*) FROM importacao_transacoes) AS validas,
+                    (SELECT count(*) FROM inseridas) AS importadas
+            """), {
+                "usuario_id": usuario_id,
+                "conta_bancaria_id": conta_bancaria_id,
+                "categoria_id": categoria_id,
+            }).one()
+
+            self.db.commit()
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erro ao importar extrato: {str(e)}"
+            )
+
+        # Escritas em SQL não passam pelos eventos do ORM
+        roteador_leitura.registrar_escrita(usuario_id)
+        invalidar_resumo_financeiro(usuario_id)
+
+        saldo = self.db.query(ContaBancaria.saldo).filter(ContaBancaria.id == conta_bancaria_id).scalar()
+
+        return ImportacaoResponse(
+            total_linhas=self.total_linhas,
+            importadas=resultado.importadas,
+            duplicadas=resultado.validas - resultado.importadas,
+            rejeitadas=self.rejeitadas,
+            erros=self.erros,
+            saldo_conta=saldo
+        )
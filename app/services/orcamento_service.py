@@ -0,0 +1,91 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from datetime import date
+import uuid
+
+from app.models.orcamento import Orcamento
+from app.schemas.orcamento import OrcamentoListaResponse, OrcamentoResponse
+
+# Gasto esperado de cada orçamento ativo (mesma regra dos triggers da migração 0009)
+SQL_CORRIGIR_GASTO = """
+    WITH calculado AS (
+        SELECT o.id,
+               o.valor_gasto,
+               (
+                   SELECT COALESCE(sum(t.valor), 0)
+                   FROM transacoes t
+                   WHERE t.usuario_id = o.usuario_id
+                     AND t.tipo_transacao = 'despesa'
+                     AND COALESCE(t.status, 'concluida') = 'concluida'
+                     AND t.data_transacao BETWEEN o.data_inicio AND o.data_fim
+                     AND (o.categoria_id IS NULL OR t.categoria_id = o.categoria_id)
+               ) AS valor_calculado
+        FROM orcamentos o
+        WHERE o.ativo = true
+    ),
+    divergentes AS (
+        SELECT * FROM calculado
+        WHERE COALESCE(valor_gasto, 0) <> valor_calculado
+    )
+    {acao}
+"""
+
+ACAO_RELATORIO = """
+    SELECT o.id, o.usuario_id, o.nome, d.valor_gasto AS valor_registrado, d.valor_calculado
+    FROM divergentes d
+    JOIN orcamentos o ON o.id = d.id
+"""
+
+ACAO_CORRECAO = """
+    UPDATE orcamentos o
+    SET valor_gasto = d.valor_calculado
+    FROM divergentes d
+    WHERE o.id = d.id
+    RETURNING o.id, o.usuario_id, o.nome, d.valor_gasto AS valor_registrado, d.valor_calculado
+"""
+
+
+class OrcamentoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def listar(self, usuario_id: uuid.UUID, ativo: Optional[bool] = True, data: Optional[date] = None) -> OrcamentoListaResponse:
+        """
+        Orçamentos do usuário com o gasto já calculado; leitura simples pelo
+        índice (usuario_id, data_inicio, data_fim)
+        """
+        query = self.db.query(Orcamento).filter(Orcamento.usuario_id == usuario_id)
+        if ativo is not None:
+            query = query.filter(Orcamento.ativo == ativo)
+        if data:
+            query = query.filter(Orcamento.data_inicio <= data, Orcamento.data_fim >= data)
+        
+        orcamentos = query.order_by(Orcamento.data_inicio.desc(), Orcamento.nome).all()
+        return OrcamentoListaResponse(
+            orcamentos=[OrcamentoResponse.from_orm(orcamento) for orcamento in orcamentos]
+        )
+    
+    def recalcular_gastos(self, corrigir: bool = True) -> List[Dict[str, Any]]:
+        """
+        Recalcula o gasto de todos os orçamentos ativos a partir das
+        transações e retorna os que divergiam de valor_gasto, corrigindo-os
+        quando `corrigir` é verdadeiro
+        """
+        acao = ACAO_CORRECAO if corrigir else ACAO_RELATORIO
+        try:
+            if corrigir:
+                # Bloqueia os ajustes dos triggers (0009) até o commit: um delta de
+                # outra transação não é sobrescrito pelo valor absoluto calculado,
+                # e as transações pendentes são vistas ou aplicam o delta depois
+                self.db.execute(text("LOCK TABLE orcamentos IN SHARE ROW EXCLUSIVE MODE"))
+            linhas = self.db.execute(text(SQL_CORRIGIR_GASTO.format(acao=acao))).mappings().all()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return [
+            {**linha, "diferenca": (linha["valor_registrado"] or 0) - linha["valor_calculado"]}
+            for linha in linhas
+        ]
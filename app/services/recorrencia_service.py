@@ -0,0 +1,184 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from datetime import date, timedelta
+import time
+
+from app.core.config import settings
+from app.services.checkpoint_service import CheckpointService
+
+NOME_TAREFA = "materializar_recorrencias"
+
+# Posição inicial do cursor (menor UUID possível)
+UUID_INICIAL = "00000000-0000-0000-0000-000000000000"
+
+# Intervalo entre mensagens de progresso
+LOTES_POR_PROGRESSO = 50
+
+
+def _passos(coluna_data: str) -> str:
+    """Número de períodos completos entre a data do modelo e `coluna_data`"""
+    return f"""
+        CASE j.frequencia_recorrencia
+            WHEN 'diaria' THEN ({coluna_data} - j.data_transacao)
+            WHEN 'semanal' THEN ({coluna_data} - j.data_transacao) / 7
+            WHEN 'mensal' THEN (
+                EXTRACT(YEAR FROM age({coluna_data}, j.data_transacao)) * 12
+                + EXTRACT(MONTH FROM age({coluna_data}, j.data_transacao))
+            )::int
+            WHEN 'anual' THEN EXTRACT(YEAR FROM age({coluna_data}, j.data_transacao))::int
+        END
+    """
+
+
+# Um lote: próximos modelos pelo cursor (id), ocorrências via generate_series
+# a partir da última já materializada e INSERT idempotente pela chave
+# (transacao_origem_id, data_transacao). A ocorrência k é calculada a partir
+# da data do modelo (data + k * período), então dias 29-31 não se deslocam.
+SQL_MATERIALIZAR_LOTE = f"""
+    WITH modelos AS (
+        SELECT t.*
+        FROM transacoes t
+        WHERE t.eh_recorrente = true
+          AND t.transacao_origem_id IS NULL
+          AND t.id > :ultimo_id
+        ORDER BY t.id
+        LIMIT :lote
+    ),
+    janelas AS (
+        SELECT m.*,
+               CASE m.frequencia_recorrencia
+                   WHEN 'diaria' THEN INTERVAL '1 day'
+                   WHEN 'semanal' THEN INTERVAL '7 days'
+                   WHEN 'mensal' THEN INTERVAL '1 month'
+                   WHEN 'anual' THEN INTERVAL '1 year'
+               END AS passo,
+               GREATEST(
+                   COALESCE(
+                       (SELECT max(o.data_transacao) FROM transacoes o WHERE o.transacao_origem_id = m.id),
+                       m.data_transacao
+                   ),
+                   m.data_transacao,
+                   CAST(:hoje AS date) - 1
+               ) AS ultima,
+               LEAST(CAST(:horizonte AS date), COALESCE(m.data_fim_recorrencia, CAST(:horizonte AS date))) AS limite
+        FROM modelos m
+        WHERE m.frequencia_recorrencia IS NOT NULL
+          AND COALESCE(m.status, 'concluida') <> 'cancelada'
+    ),
+    ocorrencias AS (
+        SELECT j.*, (j.data_transacao + k * j.passo)::date AS data_ocorrencia
+        FROM janelas j
+        CROSS JOIN LATERAL generate_series({_passos('j.ultima')}, {_passos('j.limite')} + 1) AS k
+        WHERE j.limite > j.ultima
+    ),
+    novas AS (
+        INSERT INTO transacoes (
+            id, usuario_id, categoria_id, conta_bancaria_id, cartao_credito_id, emprestimo_id,
+            transacao_origem_id, descricao, valor, tipo_transacao, data_transacao, data_vencimento,
+            eh_recorrente, status, observacoes, etiquetas
+        )
+        SELECT uuid_generate_v4(), o.usuario_id, o.categoria_id, o.conta_bancaria_id,
+               o.cartao_credito_id, o.emprestimo_id, o.id, o.descricao, o.valor, o.tipo_transacao,
+               o.data_ocorrencia, o.data_vencimento + (o.data_ocorrencia - o.data_transacao),
+               false, 'pendente', o.observacoes, o.etiquetas
+        FROM ocorrencias o
+        WHERE o.data_ocorrencia > o.ultima
+          AND o.data_ocorrencia <= o.limite
+        ON CONFLICT (transacao_origem_id, data_transacao) WHERE transacao_origem_id IS NOT NULL
+        DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT id FROM modelos ORDER BY id DESC LIMIT 1) AS ultimo_id,
+        (SELECT count(*) FROM modelos) AS modelos,
+        (SELECT count(*) FROM novas) AS ocorrencias
+"""
+
+
+class RecorrenciaService:
+    """
+    Gera as próximas ocorrências (status 'pendente') das transações
+    recorrentes de todos os usuários até o horizonte configurado.
+    
+    Os modelos são percorridos em lotes pelo id; cada lote é um único
+    INSERT ... SELECT confirmado junto com o checkpoint, então uma execução
+    interrompida continua do último lote confirmado com as mesmas datas de
+    referência. Executar de novo não duplica ocorrências.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.checkpoints = CheckpointService(db)
+    
+    def materializar(
+        self,
+        horizonte_dias: Optional[int] = None,
+        lote: Optional[int] = None
+    ) -> Dict[str, Any]:
+        horizonte_dias = horizonte_dias or settings.RECORRENCIA_HORIZONTE_DIAS
+        lote = lote or settings.RECORRENCIA_LOTE
+        
+        checkpoint = self.checkpoints.obter(NOME_TAREFA)
+        if checkpoint is not None and checkpoint.em_andamento and checkpoint.posicao:
+            posicao = dict(checkpoint.posicao)
+            print(f"↩️ Retomando materialização após o modelo {posicao['ultimo_id']}")
+        else:
+            hoje = date.today()
+            posicao = {
+                "ultimo_id": UUID_INICIAL,
+                "hoje": hoje.isoformat(),
+                "horizonte": (hoje + timedelta(days=horizonte_dias)).isoformat(),
+            }
+            self.checkpoints.iniciar(NOME_TAREFA, posicao)
+            self.db.commit()
+        
+        estatisticas = {
+            "lotes": 0,
+            "modelos": 0,
+            "ocorrencias": 0,
+            "lote_mais_lento_ms": 0.0,
+        }
+        inicio = time.perf_counter()
+        
+        while True:
+            inicio_lote = time.perf_counter()
+            try:
+                resultado = self.db.execute(text(SQL_MATERIALIZAR_LOTE), {
+                    "ultimo_id": posicao["ultimo_id"],
+                    "lote": lote,
+                    "hoje": posicao["hoje"],
+                    "horizonte": posicao["horizonte"],
+                }).one()
+                
+                if resultado.modelos == 0:
+                    self.checkpoints.concluir(NOME_TAREFA, posicao)
+                    self.db.commit()
+                    break
+                
+                posicao["ultimo_id"] = str(resultado.ultimo_id)
+                self.checkpoints.salvar(NOME_TAREFA, posicao)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            duracao_lote_ms = (time.perf_counter() - inicio_lote) * 1000
+            estatisticas["lotes"] += 1
+            estatisticas["modelos"] += resultado.modelos
+            estatisticas["ocorrencias"] += resultado.ocorrencias
+            estatisticas["lote_mais_lento_ms"] = round(max(estatisticas["lote_mais_lento_ms"], duracao_lote_ms), 2)
+            
+            if estatisticas["lotes"] % LOTES_POR_PROGRESSO == 0:
+                decorrido = time.perf_counter() - inicio
+                print(
+                    f"   {estatisticas['modelos']} modelos, {estatisticas['ocorrencias']} ocorrências "
+                    f"({estatisticas['modelos'] / decorrido:.0f} modelos/s)"
+                )
+        
+        duracao = time.perf_counter() - inicio
+        estatisticas["duracao_segundos"] = round(duracao, 3)
+        estatisticas["modelos_por_segundo"] = round(estatisticas["modelos"] / duracao, 1) if duracao else 0.0
+        estatisticas["ocorrencias_por_segundo"] = round(estatisticas["ocorrencias"] / duracao, 1) if duracao else 0.0
+        estatisticas["horizonte"] = posicao["horizonte"]
+        return estatisticas
@@ -0,0 +1,78 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime, timezone
+import uuid
+
+from app.core.cache import TTLCache, invalidar_apos_commit
+from app.core.config import settings
+from app.models.conta_bancaria import ContaBancaria
+from app.models.cartao_credito import CartaoCredito
+from app.models.emprestimo import Emprestimo
+from app.models.transacao import Transacao
+from app.schemas.dashboard import ResumoFinanceiroResponse
+
+# Id do usuário -> resumo financeiro
+_cache_resumo = TTLCache(
+    "resumo_financeiro",
+    max_itens=settings.RESUMO_FINANCEIRO_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.RESUMO_FINANCEIRO_CACHE_TTL_SECONDS,
+)
+
+# Transações alteram o saldo das contas (trigger atualizar_saldo_conta)
+invalidar_apos_commit(
+    _cache_resumo,
+    modelos=[ContaBancaria, CartaoCredito, Emprestimo, Transacao],
+    chave=lambda obj: str(obj.usuario_id),
+)
+
+
+def invalidar_resumo_financeiro(usuario_id: uuid.UUID):
+    """
+    Descarta o resumo em cache do usuário; usado por escritas em SQL que não
+    passam pelos eventos do ORM (ex.: importação de extratos)
+    """
+    _cache_resumo.invalidate(str(usuario_id))
+
+
+def _soma(coluna, modelo, usuario_id):
+    return select(func.coalesce(func.sum(coluna), 0)).where(
+        modelo.usuario_id == usuario_id,
+        modelo.ativo == True
+    ).scalar_subquery()
+
+
+class ResumoFinanceiroService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _calcular(self, usuario_id: uuid.UUID) -> ResumoFinanceiroResponse:
+        """
+        Mesmos totais de vw_resumo_financeiro, mas somente do usuário: três
+        subconsultas escalares pelo índice de usuario_id, sem agrupar a
+        tabela inteira
+        """
+        contas, cartoes, emprestimos = self.db.execute(select(
+            _soma(ContaBancaria.saldo, ContaBancaria, usuario_id),
+            _soma(CartaoCredito.saldo_atual, CartaoCredito, usuario_id),
+            _soma(Emprestimo.saldo_devedor, Emprestimo, usuario_id)
+        )).one()
+        
+        return ResumoFinanceiroResponse(
+            usuario_id=usuario_id,
+            total_contas_bancarias=contas,
+            total_divida_cartoes=cartoes,
+            total_divida_emprestimos=emprestimos,
+            patrimonio_liquido=contas - cartoes - emprestimos,
+            calculado_em=datetime.now(timezone.utc)
+        )
+    
+    def obter(self, usuario_id: uuid.UUID) -> ResumoFinanceiroResponse:
+        """Resumo financeiro do usuário, lido do cache quando disponível"""
+        resumo: Optional[ResumoFinanceiroResponse] = _cache_resumo.get(str(usuario_id))
+        if resumo is None:
+            # Geração obtida antes do cálculo: uma invalidação durante a leitura descarta o resultado
+            geracao = _cache_resumo.geracao()
+            resumo = self._calcular(usuario_id)
+            _cache_resumo.set(str(usuario_id), resumo, geracao=geracao)
+        return resumo
@@ -0,0 +1,157 @@
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
+from datetime import date
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+import uuid
+
+from app.models.resumo_mensal_transacao import ResumoMensalTransacao
+from app.models.categoria import Categoria
+from app.schemas.dashboard import (
+    EvolucaoMensalResponse,
+    EvolucaoMes,
+    ResumoCategoriaMes,
+    ResumoMensalResponse,
+)
+
+ZERO = Decimal('0.00')
+
+
+def _variacao_percentual(atual: Decimal, anterior: Decimal) -> Optional[float]:
+    if not anterior:
+        return None
+    return round(float((atual - anterior) / anterior) * 100, 2)
+
+
+class ResumoMensalService:
+    """
+    Consultas do dashboard sobre resumo_mensal_transacoes, que os triggers
+    de transacoes mantêm atualizado; o custo depende do número de meses e
+    categorias, não do número de transações.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def resumo_do_mes(self, usuario_id: uuid.UUID, mes_referencia: date) -> ResumoMensalResponse:
+        mes_referencia = mes_referencia.replace(day=1)
+        linhas = self.db.query(
+            ResumoMensalTransacao.categoria_id,
+            Categoria.nome,
+            ResumoMensalTransacao.tipo_transacao,
+            ResumoMensalTransacao.status,
+            ResumoMensalTransacao.total,
+            ResumoMensalTransacao.quantidade
+        ).outerjoin(
+            Categoria, ResumoMensalTransacao.categoria_id == Categoria.id
+        ).filter(
+            ResumoMensalTransacao.usuario_id == usuario_id,
+            ResumoMensalTransacao.mes_referencia == mes_referencia
+        ).all()
+        
+        totais: Dict[str, Decimal] = {}
+        quantidade = 0
+        categorias = []
+        for categoria_id, categoria_nome, tipo, status, total, qtd in linhas:
+            chave = tipo if status == 'concluida' else f"{tipo}_{status}"
+            totais[chave] = totais.get(chave, ZERO) + total
+            if status == 'concluida':
+                quantidade += qtd
+                categorias.append(ResumoCategoriaMes(
+                    categoria_id=categoria_id,
+                    categoria_nome=categoria_nome,
+                    tipo_transacao=tipo,
+                    total=total,
+                    quantidade=qtd
+                ))
+        
+        receitas = totais.get('receita', ZERO)
+        despesas = totais.get('despesa', ZERO)
+        categorias.sort(key=lambda categoria: categoria.total, reverse=True)
+        
+        return ResumoMensalResponse(
+            mes_referencia=mes_referencia,
+            receitas=receitas,
+            despesas=despesas,
+            saldo=receitas - despesas,
+            quantidade_transacoes=quantidade,
+            receitas_pendentes=totais.get('receita_pendente', ZERO),
+            despesas_pendentes=totais.get('despesa_pendente', ZERO),
+            categorias=categorias
+        )
+    
+    def evolucao_mensal(self, usuario_id: uuid.UUID, meses: int = 12, ate: Optional[date] = None) -> EvolucaoMensalResponse:
+        """Receitas e despesas concluídas mês a mês, com a variação sobre o mês anterior"""
+        ultimo_mes = (ate or date.today()).replace(day=1)
+        # Um mês a mais para calcular a variação do primeiro
+        primeiro_mes = ultimo_mes - relativedelta(months=meses)
+        
+        linhas = self.db.query(
+            ResumoMensalTransacao.mes_referencia,
+            func.coalesce(func.sum(ResumoMensalTransacao.total).filter(
+                ResumoMensalTransacao.tipo_transacao == 'receita'
+            ), 0),
+            func.coalesce(func.sum(ResumoMensalTransacao.total).filter(
+                ResumoMensalTransacao.tipo_transacao == 'despesa'
+            ), 0)
+        ).filter(
+            ResumoMensalTransacao.usuario_id == usuario_id,
+            ResumoMensalTransacao.status == 'concluida',
+            ResumoMensalTransacao.mes_referencia >= primeiro_mes,
+            ResumoMensalTransacao.mes_referencia <= ultimo_mes
+        ).group_by(ResumoMensalTransacao.mes_referencia).all()
+        
+        por_mes = {mes: (receitas, despesas) for mes, receitas, despesas in linhas}
+        anterior = por_mes.get(primeiro_mes, (ZERO, ZERO))
+        
+        evolucao = []
+        for indice in range(1, meses + 1):
+            mes = primeiro_mes + relativedelta(months=indice)
+            receitas, despesas = por_mes.get(mes, (ZERO, ZERO))
+            evolucao.append(EvolucaoMes(
+                mes_referencia=mes,
+                receitas=receitas,
+                despesas=despesas,
+                saldo=receitas - despesas,
+                variacao_receitas_percentual=_variacao_percentual(receitas, anterior[0]),
+                variacao_despesas_percentual=_variacao_percentual(despesas, anterior[1])
+            ))
+            anterior = (receitas, despesas)
+        
+        return EvolucaoMensalResponse(meses=evolucao)
+    
+    def reconstruir(self, usuario_id: Optional[uuid.UUID] = None) -> int:
+        """
+        Recalcula o resumo a partir de transacoes (de um usuário ou de todos).
+        
+        O lock EXCLUSIVE espera as transações que já alteraram o resumo e
+        bloqueia os triggers das novas até o commit, então nenhuma variação
+        é perdida ou aplicada duas vezes durante a reconstrução.
+        """
+        filtro = "WHERE usuario_id = :usuario_id" if usuario_id else ""
+        parametros = {"usuario_id": usuario_id} if usuario_id else {}
+        
+        try:
+            self.db.execute(text("LOCK TABLE resumo_mensal_transacoes IN EXCLUSIVE MODE"))
+            self.db.execute(text(f"DELETE FROM resumo_mensal_transacoes {filtro}"), parametros)
+            resultado = self.db.execute(text(f"""
+                INSERT INTO resumo_mensal_transacoes
+                    (usuario_id, mes_referencia, categoria_id, tipo_transacao, status, total, quantidade)
+                SELECT usuario_id,
+                       date_trunc('month', data_transacao)::date,
+                       categoria_id,
+                       tipo_transacao,
+                       COALESCE(status, 'concluida'),
+                       sum(valor),
+                       count(*)
+                FROM transacoes
+                {filtro}
+                GROUP BY 1, 2, 3, 4, 5
+            """), parametros)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return resultado.rowcount
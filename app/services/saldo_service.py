@@ -0,0 +1,200 @@
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Any, Dict, List, Optional
+from datetime import date, timedelta
+from decimal import Decimal
+import uuid
+
+from app.models.conta_bancaria import ContaBancaria
+from app.models.saldo_conta_historico import SaldoContaHistorico
+from app.models.transacao import Transacao
+from app.schemas.conta_bancaria import HistoricoSaldoResponse, SaldoHistoricoItem, SaldoNaDataResponse
+
+# Contas por lote na geração de snapshots
+LOTE_SNAPSHOT = 1000
+
+UUID_INICIAL = "00000000-0000-0000-0000-000000000000"
+
+# Efeito de uma transação concluída no saldo (mesma regra do trigger atualizar_saldo_conta)
+EFEITO_SALDO_SQL = """
+    CASE WHEN COALESCE(t.status, 'concluida') = 'concluida' THEN
+        CASE t.tipo_transacao WHEN 'receita' THEN t.valor WHEN 'despesa' THEN -t.valor ELSE 0 END
+    ELSE 0 END
+"""
+
+# Um lote de contas: saldo = snapshot anterior (ou saldo_inicial) + transações até a data.
+# O lock impede que triggers de transações concorrentes deixem de ajustar o
+# snapshot que está sendo gravado (veja a migração 0006).
+SQL_SNAPSHOT_LOTE = f"""
+    WITH contas AS (
+        SELECT id, saldo_inicial
+        FROM contas_bancarias
+        WHERE id > :ultimo_id
+        ORDER BY id
+        LIMIT :lote
+    ),
+    gravados AS (
+        INSERT INTO saldos_conta_historico (conta_bancaria_id, data_referencia, saldo)
+        SELECT c.id,
+               :data_referencia,
+               COALESCE(s.saldo, c.saldo_inicial, 0) + COALESCE((
+                   SELECT sum({EFEITO_SALDO_SQL})
+                   FROM transacoes t
+                   WHERE t.conta_bancaria_id = c.id
+                     AND t.data_transacao <= :data_referencia
+                     AND (s.data_referencia IS NULL OR t.data_transacao > s.data_referencia)
+               ), 0)
+        FROM contas c
+        LEFT JOIN LATERAL (
+            SELECT h.data_referencia, h.saldo
+            FROM saldos_conta_historico h
+            WHERE h.conta_bancaria_id = c.id
+              AND h.data_referencia < :data_referencia
+            ORDER BY h.data_referencia DESC
+            LIMIT 1
+        ) s ON true
+        ON CONFLICT (conta_bancaria_id, data_referencia) DO UPDATE
+        SET saldo = EXCLUDED.saldo
+        RETURNING 1
+    )
+    SELECT
+        (SELECT id FROM contas ORDER BY id DESC LIMIT 1) AS ultimo_id,
+        (SELECT count(*) FROM gravados) AS gravados
+"""
+
+SQL_DIVERGENCIAS_SALDO = f"""
+    SELECT c.id AS conta_bancaria_id,
+           c.usuario_id,
+           c.nome,
+           c.saldo,
+           COALESCE(c.saldo_inicial, 0) + COALESCE(l.total, 0) AS saldo_calculado
+    FROM contas_bancarias c
+    LEFT JOIN (
+        SELECT t.conta_bancaria_id, sum({EFEITO_SALDO_SQL}) AS total
+        FROM transacoes t
+        WHERE t.conta_bancaria_id IS NOT NULL
+        GROUP BY t.conta_bancaria_id
+    ) l ON l.conta_bancaria_id = c.id
+    WHERE COALESCE(c.saldo, 0) <> COALESCE(c.saldo_inicial, 0) + COALESCE(l.total, 0)
+    ORDER BY abs(COALESCE(c.saldo, 0) - COALESCE(c.saldo_inicial, 0) - COALESCE(l.total, 0)) DESC
+"""
+
+
+class SaldoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _obter_conta(self, usuario_id: uuid.UUID, conta_bancaria_id: uuid.UUID) -> ContaBancaria:
+        conta = self.db.query(ContaBancaria).filter(
+            ContaBancaria.id == conta_bancaria_id,
+            ContaBancaria.usuario_id == usuario_id
+        ).first()
+        if not conta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conta bancária não encontrada"
+            )
+        return conta
+    
+    def saldo_na_data(self, usuario_id: uuid.UUID, conta_bancaria_id: uuid.UUID, data: date) -> SaldoNaDataResponse:
+        """
+        Saldo ao final da data: snapshot mais recente até a data somado às
+        transações concluídas entre o snapshot e a data. O custo é limitado
+        pelo intervalo entre snapshots, não pela idade da conta.
+        """
+        conta = self._obter_conta(usuario_id, conta_bancaria_id)
+        
+        snapshot = self.db.query(SaldoContaHistorico).filter(
+            SaldoContaHistorico.conta_bancaria_id == conta_bancaria_id,
+            SaldoContaHistorico.data_referencia <= data
+        ).order_by(SaldoContaHistorico.data_referencia.desc()).first()
+        
+        efeito = case(
+            (Transacao.tipo_transacao == 'receita', Transacao.valor),
+            (Transacao.tipo_transacao == 'despesa', -Transacao.valor),
+            else_=0
+        )
+        query = self.db.query(func.coalesce(func.sum(efeito), 0)).filter(
+            Transacao.conta_bancaria_id == conta_bancaria_id,
+            func.coalesce(Transacao.status, 'concluida') == 'concluida',
+            Transacao.data_transacao <= data
+        )
+        if snapshot:
+            query = query.filter(Transacao.data_transacao > snapshot.data_referencia)
+            base = snapshot.saldo
+        else:
+            base = conta.saldo_inicial or Decimal('0.00')
+        
+        return SaldoNaDataResponse(
+            conta_bancaria_id=conta_bancaria_id,
+            data=data,
+            saldo=base + query.scalar(),
+            saldo_atual=conta.saldo or Decimal('0.00'),
+            snapshot_data=snapshot.data_referencia if snapshot else None
+        )
+    
+    def historico(
+        self,
+        usuario_id: uuid.UUID,
+        conta_bancaria_id: uuid.UUID,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> HistoricoSaldoResponse:
+        """Snapshots da conta no período (para gráficos de saldo)"""
+        self._obter_conta(usuario_id, conta_bancaria_id)
+        
+        query = self.db.query(SaldoContaHistorico).filter(
+            SaldoContaHistorico.conta_bancaria_id == conta_bancaria_id
+        )
+        if data_inicio:
+            query = query.filter(SaldoContaHistorico.data_referencia >= data_inicio)
+        if data_fim:
+            query = query.filter(SaldoContaHistorico.data_referencia <= data_fim)
+        
+        snapshots = query.order_by(SaldoContaHistorico.data_referencia).all()
+        return HistoricoSaldoResponse(
+            conta_bancaria_id=conta_bancaria_id,
+            saldos=[SaldoHistoricoItem.from_orm(snapshot) for snapshot in snapshots]
+        )
+    
+    def gerar_snapshots(self, data_referencia: Optional[date] = None, lote: int = LOTE_SNAPSHOT) -> int:
+        """
+        Grava o saldo de todas as contas ao final de data_referencia (padrão:
+        ontem), em lotes de contas. Pode ser executado novamente para a mesma
+        data.
+        """
+        data_referencia = data_referencia or date.today() - timedelta(days=1)
+        ultimo_id = UUID_INICIAL
+        total = 0
+        
+        while True:
+            try:
+                self.db.execute(text("LOCK TABLE saldos_conta_historico IN SHARE ROW EXCLUSIVE MODE"))
+                resultado = self.db.execute(text(SQL_SNAPSHOT_LOTE), {
+                    "ultimo_id": ultimo_id,
+                    "lote": lote,
+                    "data_referencia": data_referencia,
+                }).one()
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            if resultado.ultimo_id is None:
+                break
+            ultimo_id = str(resultado.ultimo_id)
+            total += resultado.gravados
+        
+        return total
+    
+    def verificar_consistencia(self) -> List[Dict[str, Any]]:
+        """
+        Recalcula o saldo de todas as contas a partir das transações
+        concluídas e retorna as que divergem de contas_bancarias.saldo
+        """
+        linhas = self.db.execute(text(SQL_DIVERGENCIAS_SALDO)).mappings().all()
+        return [
+            {**linha, "diferenca": linha["saldo"] - linha["saldo_calculado"]}
+            for linha in linhas
+        ]
@@ -0,0 +1,260 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from dateutil.relativedelta import relativedelta
+from typing import Any, NamedTuple, Tuple
+from datetime import date
+import uuid
+
+import numpy as np
+
+from app.core.amortizacao import (
+    calcular_cronogramas,
+    para_centavos,
+    para_decimal,
+    simular_pagamentos_extras,
+    taxa_mensal,
+)
+from app.core.cache import TTLCache, invalidar_apos_commit
+from app.core.config import settings
+from app.models.emprestimo import Emprestimo
+from app.models.parcela_emprestimo import ParcelaEmprestimo
+from app.schemas.emprestimo import CenarioSimulacao, SimulacaoRequest, SimulacaoResponse
+
+
+class BaseSimulacao(NamedTuple):
+    """Situação em aberto de um empréstimo, em centavos, usada pelas simulações"""
+    usuario_id: str
+    versao: Tuple[Any, ...]
+    sistema: str
+    taxa: float
+    saldo: int
+    prazo: int
+    valor_parcela: int
+    amortizacao_sac: int
+    vencimentos: Tuple[date, ...]
+
+
+# Id do empréstimo -> BaseSimulacao
+_cache_bases = TTLCache(
+    "simulacao_emprestimo_bases",
+    max_itens=settings.SIMULACAO_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.SIMULACAO_BASE_CACHE_TTL_SECONDS,
+)
+
+# (id do empréstimo, versão da base, cenários) -> SimulacaoResponse; uma base
+# nova (parcela paga, empréstimo alterado) muda a versão e deixa as entradas
+# antigas inalcançáveis até expirarem
+_cache_simulacoes = TTLCache(
+    "simulacao_emprestimo_resultados",
+    max_itens=settings.SIMULACAO_CACHE_MAX_ITEMS,
+    ttl_segundos=settings.SIMULACAO_CACHE_TTL_SECONDS,
+)
+
+
+def _chave_emprestimo(obj) -> str:
+    return str(obj.id if isinstance(obj, Emprestimo) else obj.emprestimo_id)
+
+
+invalidar_apos_commit(
+    _cache_bases,
+    modelos=[Emprestimo, ParcelaEmprestimo],
+    chave=_chave_emprestimo,
+)
+
+
+class SimulacaoEmprestimoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _carregar_base(self, emprestimo: Emprestimo) -> BaseSimulacao:
+        """Base a partir das parcelas em aberto ou, sem parcelas gravadas, do cronograma calculado"""
+        taxa = float(taxa_mensal([float(emprestimo.taxa_juros or 0)])[0])
+        abertas = self.db.query(
+            ParcelaEmprestimo.data_vencimento,
+            ParcelaEmprestimo.valor,
+            ParcelaEmprestimo.valor_principal,
+            ParcelaEmprestimo.atualizado_em
+        ).filter(
+            ParcelaEmprestimo.emprestimo_id == emprestimo.id,
+            ParcelaEmprestimo.status.is_distinct_from("paga")
+        ).order_by(ParcelaEmprestimo.numero_parcela).all()
+        
+        if abertas:
+            return BaseSimulacao(
+                usuario_id=str(emprestimo.usuario_id),
+                versao=(emprestimo.atualizado_em, max(p.atualizado_em for p in abertas), len(abertas)),
+                sistema=emprestimo.sistema_amortizacao,
+                taxa=taxa,
+                saldo=sum(para_centavos(p.valor_principal) for p in abertas),
+                prazo=len(abertas),
+                valor_parcela=para_centavos(abertas[0].valor),
+                amortizacao_sac=para_centavos(abertas[0].valor_principal),
+                vencimentos=tuple(p.data_vencimento for p in abertas),
+            )
+        
+        possui_parcelas = self.db.query(func.count(ParcelaEmprestimo.id)).filter(
+            ParcelaEmprestimo.emprestimo_id == emprestimo.id
+        ).scalar()
+        pagas = emprestimo.parcelas_pagas or 0
+        if possui_parcelas or not emprestimo.total_parcelas or pagas >= emprestimo.total_parcelas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empréstimo sem parcelas em aberto"
+            )
+        
+        cronogramas = calcular_cronogramas(
+            np.array([para_centavos(emprestimo.valor_principal)], dtype=np.int64),
+            np.array([float(emprestimo.taxa_juros or 0)], dtype=np.float64),
+            np.array([emprestimo.total_parcelas], dtype=np.int64),
+            np.array([emprestimo.sistema_amortizacao == "sac"], dtype=bool),
+        )
+        return BaseSimulacao(
+            usuario_id=str(emprestimo.usuario_id),
+            versao=(emprestimo.atualizado_em, None, emprestimo.total_parcelas - pagas),
+            sistema=emprestimo.sistema_amortizacao,
+            taxa=taxa,
+            saldo=int(cronogramas.saldo[0, pagas - 1]) if pagas else para_centavos(emprestimo.valor_principal),
+            prazo=emprestimo.total_parcelas - pagas,
+            valor_parcela=int(cronogramas.parcela[0, pagas]),
+            amortizacao_sac=int(cronogramas.amortizacao[0, pagas]),
+            vencimentos=tuple(
+                emprestimo.data_inicio + relativedelta(months=mes + 1)
+                for mes in range(pagas, emprestimo.total_parcelas)
+            ),
+        )
+    
+    def _obter_base(self, usuario_id: uuid.UUID, emprestimo_id: uuid.UUID) -> BaseSimulacao:
+        base = _cache_bases.get(str(emprestimo_id))
+        if base is None:
+            geracao = _cache_bases.geracao()
+            emprestimo = self.db.query(Emprestimo).filter(
+                Emprestimo.id == emprestimo_id,
+                Emprestimo.usuario_id == usuario_id
+            ).first()
+            if not emprestimo:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Empréstimo não encontrado"
+                )
+            base = self._carregar_base(emprestimo)
+            _cache_bases.set(str(emprestimo_id), base, geracao=geracao)
+        
+        if base.usuario_id != str(usuario_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Empréstimo não encontrado"
+            )
+        return base
+    
+    def simular(self, usuario_id: uuid.UUID, emprestimo_id: uuid.UUID, simulacao: SimulacaoRequest) -> SimulacaoResponse:
+        """
+        Avalia em uma chamada a grade de pagamentos extras (valores x meses) e
+        os refinanciamentos sobre o saldo em aberto do empréstimo, comparando
+        cada cenário com a situação atual
+        """
+        base = self._obter_base(usuario_id, emprestimo_id)
+        
+        extras = [para_centavos(valor) for valor in simulacao.valores_extras]
+        if any(valor <= 0 for valor in extras):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Valores extras devem ser positivos"
+            )
+        if any(mes < 1 or mes > base.prazo for mes in simulacao.meses):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Mês do pagamento extra deve estar entre 1 e {base.prazo} (parcelas em aberto)"
+            )
+        cenarios = len(extras) * len(simulacao.meses) + len(simulacao.refinanciamentos)
+        if cenarios > settings.SIMULACAO_MAX_CENARIOS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Simulação limitada a {settings.SIMULACAO_MAX_CENARIOS} cenários"
+            )
+        
+        refinanciamentos = [
+            (r.taxa_juros, r.total_parcelas, r.sistema_amortizacao or base.sistema)
+            for r in simulacao.refinanciamentos
+        ]
+        chave = (
+            str(emprestimo_id),
+            base.versao,
+            tuple(extras),
+            tuple(simulacao.meses),
+            simulacao.reduzir,
+            tuple(refinanciamentos),
+        )
+        resposta = _cache_simulacoes.get(chave)
+        if resposta is None:
+            resposta = self._calcular(emprestimo_id, base, extras, simulacao.meses, simulacao.reduzir, refinanciamentos)
+            _cache_simulacoes.set(chave, resposta)
+        return resposta
+    
+    def _calcular(self, emprestimo_id, base: BaseSimulacao, extras, meses, reduzir: str, refinanciamentos) -> SimulacaoResponse:
+        # Grade valor x mês, mais um cenário sem pagamento extra (situação atual) no fim
+        extras_grade = np.append(np.repeat(np.array(extras, dtype=np.int64), len(meses)), 0)
+        meses_grade = np.append(np.tile(np.array(meses, dtype=np.int64), len(extras)), 0)
+        resultado = simular_pagamentos_extras(
+            base.saldo,
+            base.taxa,
+            base.prazo,
+            base.valor_parcela,
+            base.amortizacao_sac,
+            base.sistema == "sac",
+            extras_grade,
+            meses_grade,
+            reduzir_parcela=reduzir == "parcela",
+        )
+        extras_cenarios = extras_grade.tolist()
+        meses_cenarios = meses_grade.tolist()
+        prazos = resultado.prazos.tolist()
+        juros = resultado.juros.tolist()
+        parcelas = resultado.parcelas_seguintes.tolist()
+        juros_atuais = juros[-1]
+        
+        pagamentos_extras = [
+            CenarioSimulacao(
+                valor_extra=para_decimal(extras_cenarios[k]),
+                mes=meses_cenarios[k],
+                parcelas_restantes=prazos[k],
+                data_fim=base.vencimentos[prazos[k] - 1],
+                valor_parcela=para_decimal(parcelas[k]),
+                total_juros=para_decimal(juros[k]),
+                juros_economizados=para_decimal(juros_atuais - juros[k]),
+            )
+            for k in range(len(prazos) - 1)
+        ]
+        
+        cenarios_refinanciamento = []
+        if refinanciamentos:
+            cronogramas = calcular_cronogramas(
+                np.full(len(refinanciamentos), base.saldo, dtype=np.int64),
+                np.array([float(taxa) for taxa, _, _ in refinanciamentos], dtype=np.float64),
+                np.array([prazo for _, prazo, _ in refinanciamentos], dtype=np.int64),
+                np.array([sistema == "sac" for _, _, sistema in refinanciamentos], dtype=bool),
+            )
+            juros_refinanciamento = cronogramas.juros.sum(axis=1).tolist()
+            primeiras_parcelas = cronogramas.parcela[:, 0].tolist()
+            for k, (taxa, prazo, sistema) in enumerate(refinanciamentos):
+                cenarios_refinanciamento.append(CenarioSimulacao(
+                    taxa_juros=taxa,
+                    sistema_amortizacao=sistema,
+                    parcelas_restantes=prazo,
+                    data_fim=base.vencimentos[0] + relativedelta(months=prazo - 1),
+                    valor_parcela=para_decimal(primeiras_parcelas[k]),
+                    total_juros=para_decimal(juros_refinanciamento[k]),
+                    juros_economizados=para_decimal(juros_atuais - juros_refinanciamento[k]),
+                ))
+        
+        return SimulacaoResponse(
+            emprestimo_id=emprestimo_id,
+            sistema_amortizacao=base.sistema,
+            saldo_devedor=para_decimal(base.saldo),
+            parcelas_restantes=base.prazo,
+            valor_parcela=para_decimal(base.valor_parcela),
+            data_fim=base.vencimentos[-1],
+            total_juros=para_decimal(juros_atuais),
+            pagamentos_extras=pagamentos_extras,
+            refinanciamentos=cenarios_refinanciamento,
+        )
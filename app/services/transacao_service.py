@@ -0,0 +1,247 @@
+from sqlalchemy import func, literal, or_, tuple_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Any, Dict, List, Optional
+from datetime import date
+import base64
+import json
+import time
+import uuid
+
+from app.models.transacao import Transacao
+from app.services.dados_sinteticos import criar_usuario, gerar_transacoes
+from app.schemas.transacao import TransacaoPagina, TransacaoResponse, TransacaoBuscaItem, TransacaoBuscaPagina
+
+# Buscas medidas por medir_busca: (nome, termo, etiquetas)
+CENARIOS_BUSCA = [
+    ("palavra", "farmácia", None),
+    ("trecho", "mercad", None),
+    ("etiqueta", None, ["viagem"]),
+    ("palavra_e_etiqueta", "supermercado", ["viagem"]),
+]
+
+def _escapar_like(termo: str) -> str:
+    return termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class TransacaoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def _codificar_cursor(transacao: Transacao) -> str:
+        """Cursor opaco com a posição (data_transacao, id) do último item da página"""
+        posicao = {"d": transacao.data_transacao.isoformat(), "i": str(transacao.id)}
+        return base64.urlsafe_b64encode(json.dumps(posicao).encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decodificar_cursor(cursor: str):
+        try:
+            preenchimento = "=" * (-len(cursor) % 4)
+            posicao = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+            return date.fromisoformat(posicao["d"]), uuid.UUID(posicao["i"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+    
+    def listar(
+        self,
+        usuario_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        tipo_transacao: Optional[str] = None,
+        status_transacao: Optional[str] = None,
+        categoria_id: Optional[uuid.UUID] = None,
+        conta_bancaria_id: Optional[uuid.UUID] = None,
+        cartao_credito_id: Optional[uuid.UUID] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> TransacaoPagina:
+        """
+        Lista as transações do usuário da mais recente para a mais antiga.
+        
+        Paginação por keyset em (data_transacao, id): a página seguinte começa
+        logo após a posição do cursor, usando o índice (usuario_id,
+        data_transacao DESC, id DESC) sem OFFSET, então o custo de cada página
+        não depende da profundidade.
+        """
+        query = self.db.query(Transacao).filter(Transacao.usuario_id == usuario_id)
+        
+        if tipo_transacao:
+            query = query.filter(Transacao.tipo_transacao == tipo_transacao)
+        if status_transacao:
+            query = query.filter(Transacao.status == status_transacao)
+        if categoria_id:
+            query = query.filter(Transacao.categoria_id == categoria_id)
+        if conta_bancaria_id:
+            query = query.filter(Transacao.conta_bancaria_id == conta_bancaria_id)
+        if cartao_credito_id:
+            query = query.filter(Transacao.cartao_credito_id == cartao_credito_id)
+        if data_inicio:
+            query = query.filter(Transacao.data_transacao >= data_inicio)
+        if data_fim:
+            query = query.filter(Transacao.data_transacao <= data_fim)
+        
+        if cursor:
+            data_cursor, id_cursor = self._decodificar_cursor(cursor)
+            query = query.filter(
+                tuple_(Transacao.data_transacao, Transacao.id) < tuple_(data_cursor, id_cursor)
+            )
+        
+        # Busca um item a mais para saber se existe próxima página
+        transacoes = query.order_by(
+            Transacao.data_transacao.desc(),
+            Transacao.id.desc()
+        ).limit(limite + 1).all()
+        
+        tem_mais = len(transacoes) > limite
+        transacoes = transacoes[:limite]
+        
+        return TransacaoPagina(
+            itens=[TransacaoResponse.from_orm(transacao) for transacao in transacoes],
+            proximo_cursor=self._codificar_cursor(transacoes[-1]) if tem_mais else None,
+            tem_mais=tem_mais
+        )
+    
+    def medir_paginacao(self, linhas: int = 1_000_000, limite: int = 50) -> Dict[str, Any]:
+        """
+        Benchmark: gera `linhas` transações de um usuário e percorre todas as
+        páginas de `listar` pelo cursor, comparando a latência por faixa de
+        profundidade com a mesma página buscada por OFFSET. Tudo é feito em
+        uma transação desfeita ao final.
+        """
+        try:
+            usuario_id = criar_usuario(self.db)
+            inicio = time.perf_counter()
+            gerar_transacoes(self.db, usuario_id, linhas)
+            estatisticas = {"linhas": linhas, "limite": limite, "geracao_segundos": round(time.perf_counter() - inicio, 1)}
+            
+            latencias = []
+            cursor = None
+            while True:
+                inicio = time.perf_counter()
+                pagina = self.listar(usuario_id, cursor=cursor, limite=limite)
+                latencias.append(time.perf_counter() - inicio)
+                if not pagina.tem_mais:
+                    break
+                cursor = pagina.proximo_cursor
+            
+            estatisticas["paginas"] = len(latencias)
+            estatisticas["faixas"] = []
+            faixas = 5
+            for faixa in range(faixas):
+                primeira = faixa * len(latencias) // faixas
+                trecho = sorted(latencias[primeira:(faixa + 1) * len(latencias) // faixas])
+                if not trecho:
+                    continue
+                
+                # A mesma profundidade buscada por OFFSET, para comparação
+                inicio = time.perf_counter()
+                self.db.query(Transacao).filter(Transacao.usuario_id == usuario_id).order_by(
+                    Transacao.data_transacao.desc(),
+                    Transacao.id.desc()
+                ).offset(primeira * limite).limit(limite + 1).all()
+                offset = time.perf_counter() - inicio
+                
+                estatisticas["faixas"].append({
+                    "pagina_inicial": primeira + 1,
+                    "keyset_p50_ms": round(trecho[len(trecho) // 2] * 1000, 2),
+                    "keyset_p99_ms": round(trecho[int(0.99 * (len(trecho) - 1))] * 1000, 2),
+                    "offset_ms": round(offset * 1000, 2),
+                })
+            estatisticas["paginacao_segundos"] = round(sum(latencias), 1)
+            return estatisticas
+        finally:
+            self.db.rollback()
+    
+    def medir_busca(self, linhas: int = 2_000_000, usuarios: int = 100, repeticoes: int = 20) -> Dict[str, Any]:
+        """
+        Benchmark: gera `linhas` transações divididas entre `usuarios` usuários
+        e mede a primeira página de `buscar` de um deles em cada cenário de
+        CENARIOS_BUSCA. Tudo é feito em uma transação desfeita ao final.
+        """
+        try:
+            inicio = time.perf_counter()
+            ids = []
+            for _ in range(usuarios):
+                usuario_id = criar_usuario(self.db)
+                gerar_transacoes(self.db, usuario_id, linhas // usuarios)
+                ids.append(usuario_id)
+            estatisticas = {
+                "linhas": linhas,
+                "linhas_por_usuario": linhas // usuarios,
+                "geracao_segundos": round(time.perf_counter() - inicio, 1),
+                "cenarios": [],
+            }
+            
+            for nome, termo, etiquetas in CENARIOS_BUSCA:
+                self.buscar(ids[0], termo=termo, etiquetas=etiquetas)  # aquece o cache do banco
+                latencias = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    pagina = self.buscar(ids[0], termo=termo, etiquetas=etiquetas)
+                    latencias.append(time.perf_counter() - inicio)
+                latencias.sort()
+                estatisticas["cenarios"].append({
+                    "nome": nome,
+                    "resultados": len(pagina.itens),
+                    "p50_ms": round(latencias[len(latencias) // 2] * 1000, 2),
+                    "p99_ms": round(latencias[int(0.99 * (len(latencias) - 1))] * 1000, 2),
+                })
+            return estatisticas
+        finally:
+            self.db.rollback()
+    
+    def buscar(
+        self,
+        usuario_id: uuid.UUID,
+        termo: Optional[str] = None,
+        etiquetas: Optional[List[str]] = None,
+        pagina: int = 1,
+        tamanho: int = 20
+    ) -> TransacaoBuscaPagina:
+        """
+        Busca transações do usuário por texto e/ou etiquetas.
+        
+        O termo casa pela busca textual em português (coluna busca, índice
+        GIN) ou como trecho da descrição (ILIKE com índice pg_trgm); as
+        etiquetas informadas devem estar todas presentes (@>, índice GIN).
+        Os resultados são ordenados por relevância e depois pela data.
+        """
+        query = self.db.query(Transacao).filter(Transacao.usuario_id == usuario_id)
+        relevancia = literal(0.0)
+        ordem = [Transacao.data_transacao.desc(), Transacao.id.desc()]
+        
+        if termo:
+            consulta_textual = func.websearch_to_tsquery('portuguese', termo)
+            query = query.filter(or_(
+                Transacao.busca.op("@@")(consulta_textual),
+                Transacao.descricao.ilike(f"%{_escapar_like(termo)}%", escape="\\")
+            ))
+            relevancia = func.ts_rank_cd(Transacao.busca, consulta_textual) + func.similarity(Transacao.descricao, termo)
+            # Só ordena pela relevância com termo: sem ele ela é constante, e o PostgreSQL não ordena por constante
+            ordem.insert(0, relevancia.desc())
+        
+        if etiquetas:
+            query = query.filter(Transacao.etiquetas.contains(etiquetas))
+        
+        resultados = query.add_columns(relevancia.label("relevancia")).order_by(*ordem).offset(
+            (pagina - 1) * tamanho
+        ).limit(tamanho + 1).all()
+        
+        tem_mais = len(resultados) > tamanho
+        resultados = resultados[:tamanho]
+        
+        return TransacaoBuscaPagina(
+            itens=[
+                TransacaoBuscaItem(
+                    **TransacaoResponse.from_orm(transacao).model_dump(),
+                    relevancia=round(float(nota), 4)
+                )
+                for transacao, nota in resultados
+            ],
+            pagina=pagina,
+            tamanho=tamanho,
+            tem_mais=tem_mais
+        )
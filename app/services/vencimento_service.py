@@ -0,0 +1,226 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from datetime import date, timedelta
+import time
+
+from app.core.config import settings
+from app.services.checkpoint_service import CheckpointService
+
+NOME_TAREFA = "processar_vencimentos"
+
+# Posição inicial do cursor (menor UUID possível)
+UUID_INICIAL = "00000000-0000-0000-0000-000000000000"
+
+# Fragmentos SQL de cada tipo de documento; `x` é o documento e `d` o cartão
+# ou empréstimo (dono do alerta). Os filtros de status repetem o predicado dos
+# índices parciais de vencimento para que as consultas por faixa os utilizem.
+DOCUMENTOS = {
+    "faturas": {
+        "tabela": "faturas_cartao",
+        "em_aberto": "x.status IN ('aberta', 'fechada')",
+        "dono": "cartoes_credito d ON d.id = x.cartao_credito_id",
+        "tipo_alerta": "vencimento_fatura",
+        "descricao": "format('Fatura do cartão %s', d.nome)",
+        "valor_em_aberto": "x.valor_total - COALESCE(x.valor_pago, 0)",
+    },
+    "parcelas": {
+        "tabela": "parcelas_emprestimo",
+        "em_aberto": "x.status = 'pendente'",
+        "dono": "emprestimos d ON d.id = x.emprestimo_id",
+        "tipo_alerta": "vencimento_emprestimo",
+        "descricao": "format('Parcela %s do empréstimo %s', x.numero_parcela, d.nome)",
+        "valor_em_aberto": "x.valor - COALESCE(x.valor_pago, 0)",
+    },
+}
+
+
+def _inserir_alertas(documento: Dict[str, str], situacao: str, verbo: str, prefixo: str) -> str:
+    """Um alerta por documento, vencimento e situação (chave de deduplicação)"""
+    return f"""
+        INSERT INTO alertas (id, usuario_id, tipo_alerta, titulo, mensagem, data_alerta, chave_deduplicacao)
+        SELECT uuid_generate_v4(),
+               d.usuario_id,
+               '{documento["tipo_alerta"]}',
+               '{prefixo}: ' || {documento["descricao"]},
+               format(
+                   '%s {verbo} em %s. Valor em aberto: R$ %s.',
+                   {documento["descricao"]},
+                   to_char(x.data_vencimento, 'DD/MM/YYYY'),
+                   {documento["valor_em_aberto"]}
+               ),
+               now(),
+               format('{documento["tipo_alerta"]}:%s:%s:{situacao}', x.id, x.data_vencimento)
+        FROM documentos x
+        JOIN {documento["dono"]}
+        ON CONFLICT (chave_deduplicacao) WHERE chave_deduplicacao IS NOT NULL DO NOTHING
+        RETURNING 1
+    """
+
+
+def _sql_vencidos(documento: Dict[str, str]) -> str:
+    """
+    Marca como 'vencida' um lote de documentos em aberto com vencimento
+    anterior a :hoje e alerta os donos. Os documentos atualizados saem do
+    índice parcial, então o próximo lote não precisa de cursor; linhas
+    bloqueadas por outras transações ficam para a próxima execução.
+    """
+    return f"""
+        WITH lote AS (
+            SELECT x.id
+            FROM {documento["tabela"]} x
+            WHERE {documento["em_aberto"]}
+              AND x.data_vencimento < CAST(:hoje AS date)
+            ORDER BY x.data_vencimento
+            LIMIT :lote
+            FOR UPDATE SKIP LOCKED
+        ),
+        documentos AS (
+            UPDATE {documento["tabela"]} t
+            SET status = 'vencida'
+            FROM lote
+            WHERE t.id = lote.id
+            RETURNING t.*
+        ),
+        inseridos AS ({_inserir_alertas(documento, 'vencida', 'venceu', 'Vencida')})
+        SELECT
+            (SELECT count(*) FROM documentos) AS documentos,
+            (SELECT count(*) FROM inseridos) AS alertas,
+            NULL::date AS cursor_data,
+            NULL::uuid AS cursor_id
+    """
+
+
+def _sql_a_vencer(documento: Dict[str, str]) -> str:
+    """
+    Alerta os donos de um lote de documentos em aberto que vencem entre
+    :hoje e :limite, percorridos pelo cursor (data_vencimento, id).
+    """
+    return f"""
+        WITH documentos AS (
+            SELECT x.*
+            FROM {documento["tabela"]} x
+            WHERE {documento["em_aberto"]}
+              AND x.data_vencimento BETWEEN CAST(:hoje AS date) AND CAST(:limite AS date)
+              AND (x.data_vencimento, x.id) > (CAST(:cursor_data AS date), CAST(:cursor_id AS uuid))
+            ORDER BY x.data_vencimento, x.id
+            LIMIT :lote
+        ),
+        inseridos AS ({_inserir_alertas(documento, 'a_vencer', 'vence', 'Vence em breve')})
+        SELECT
+            (SELECT count(*) FROM documentos) AS documentos,
+            (SELECT count(*) FROM inseridos) AS alertas,
+            ultimo.data_vencimento AS cursor_data,
+            ultimo.id AS cursor_id
+        FROM (SELECT 1) AS um
+        LEFT JOIN (
+            SELECT data_vencimento, id FROM documentos ORDER BY data_vencimento DESC, id DESC LIMIT 1
+        ) ultimo ON true
+    """
+
+
+# Etapas na ordem de execução; os vencidos vêm primeiro por serem os mais urgentes
+ETAPAS = {
+    "faturas_vencidas": _sql_vencidos(DOCUMENTOS["faturas"]),
+    "parcelas_vencidas": _sql_vencidos(DOCUMENTOS["parcelas"]),
+    "faturas_a_vencer": _sql_a_vencer(DOCUMENTOS["faturas"]),
+    "parcelas_a_vencer": _sql_a_vencer(DOCUMENTOS["parcelas"]),
+}
+
+
+class VencimentoService:
+    """
+    Tarefa agendada de vencimentos de todos os usuários: marca faturas e
+    parcelas em aberto já vencidas como 'vencida' e gera alertas
+    vencimento_fatura / vencimento_emprestimo para as vencidas e para as que
+    vencem nos próximos dias.
+    
+    Cada lote é um único comando (UPDATE/INSERT ... SELECT) confirmado junto
+    com o checkpoint. Ao esgotar o tempo limite a execução para entre lotes e
+    a próxima continua da mesma etapa e cursor, desde que no mesmo dia; as
+    chaves de deduplicação tornam seguro reprocessar.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.checkpoints = CheckpointService(db)
+    
+    def processar(
+        self,
+        dias_antecedencia: Optional[int] = None,
+        lote: Optional[int] = None,
+        tempo_limite_segundos: Optional[int] = None
+    ) -> Dict[str, Any]:
+        dias_antecedencia = dias_antecedencia or settings.VENCIMENTO_DIAS_ANTECEDENCIA
+        lote = lote or settings.VENCIMENTO_LOTE
+        tempo_limite_segundos = tempo_limite_segundos or settings.VENCIMENTO_TEMPO_LIMITE_SECONDS
+        inicio = time.perf_counter()
+        
+        hoje = date.today()
+        checkpoint = self.checkpoints.obter(NOME_TAREFA)
+        if (
+            checkpoint is not None and checkpoint.em_andamento and checkpoint.posicao
+            and checkpoint.posicao.get("hoje") == hoje.isoformat()
+        ):
+            posicao = dict(checkpoint.posicao)
+            print(f"↩️ Retomando vencimentos na etapa {posicao['etapa']}")
+        else:
+            posicao = {
+                "hoje": hoje.isoformat(),
+                "limite": (hoje + timedelta(days=dias_antecedencia)).isoformat(),
+                "etapa": next(iter(ETAPAS)),
+                "cursor_data": hoje.isoformat(),
+                "cursor_id": UUID_INICIAL,
+            }
+            self.checkpoints.iniciar(NOME_TAREFA, posicao)
+            self.db.commit()
+        
+        estatisticas = {etapa: 0 for etapa in ETAPAS}
+        estatisticas.update({"alertas_criados": 0, "lotes": 0, "concluido": False})
+        etapas = list(ETAPAS)
+        
+        while True:
+            if time.perf_counter() - inicio >= tempo_limite_segundos:
+                print(f"⏱️ Tempo limite atingido na etapa {posicao['etapa']}; a próxima execução continua daqui")
+                break
+            
+            etapa = posicao["etapa"]
+            try:
+                resultado = self.db.execute(text(ETAPAS[etapa]), {
+                    "hoje": posicao["hoje"],
+                    "limite": posicao["limite"],
+                    "cursor_data": posicao["cursor_data"],
+                    "cursor_id": posicao["cursor_id"],
+                    "lote": lote,
+                }).one()
+                
+                if resultado.cursor_id is not None:
+                    posicao["cursor_data"] = resultado.cursor_data.isoformat()
+                    posicao["cursor_id"] = str(resultado.cursor_id)
+                
+                ultima_etapa = etapas.index(etapa) == len(etapas) - 1
+                if resultado.documentos < lote:
+                    if ultima_etapa:
+                        self.checkpoints.concluir(NOME_TAREFA, posicao)
+                    else:
+                        posicao["etapa"] = etapas[etapas.index(etapa) + 1]
+                        posicao["cursor_data"] = posicao["hoje"]
+                        posicao["cursor_id"] = UUID_INICIAL
+                        self.checkpoints.salvar(NOME_TAREFA, posicao)
+                else:
+                    self.checkpoints.salvar(NOME_TAREFA, posicao)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            estatisticas["lotes"] += 1
+            estatisticas[etapa] += resultado.documentos
+            estatisticas["alertas_criados"] += resultado.alertas
+            
+            if resultado.documentos < lote and ultima_etapa:
+                estatisticas["concluido"] = True
+                break
+        
+        estatisticas["duracao_segundos"] = round(time.perf_counter() - inicio, 3)
+        return estatisticas
@@ -47,6 +47,282 @@ def run_development():
             log_level="info"
         )
 
+def run_production():
+    """Executa a aplicação em modo produção (múltiplos workers, uvloop/httptools)"""
+    print("🚀 Iniciando servidor de produção...")
+    os.environ.setdefault("PYTHONPATH", str(ROOT_DIR))
+    
+    from app.core.server import UvicornWorker, run_gunicorn, run_uvicorn_workers
+    if UvicornWorker is not None:
+        run_gunicorn()
+    else:
+        print("⚠️ gunicorn não disponível, usando uvicorn com múltiplos workers (sem preload)")
+        run_uvicorn_workers()
+
+def run_migrations(revisao: str = "head"):
+    """Aplica as migrações do banco de dados (Alembic)"""
+    print(f"🗄️ Aplicando migrações até '{revisao}'...")
+    from app.core.migrations import aplicar_migracoes
+    aplicar_migracoes(revisao)
+    print("✅ Migrações aplicadas com sucesso!")
+
+def rebuild_monthly_summary():
+    """Reconstrói o resumo mensal de transações a partir da tabela transacoes"""
+    print("📊 Reconstruindo resumo mensal de transações...")
+    from app.core.database import SessionLocal
+    from app.services.resumo_mensal_service import ResumoMensalService
+    
+    db = SessionLocal()
+    try:
+        grupos = ResumoMensalService(db).reconstruir()
+        print(f"✅ Resumo mensal reconstruído ({grupos} grupos)")
+    finally:
+        db.close()
+
+def materialize_recurring_transactions():
+    """Gera as próximas ocorrências das transações recorrentes"""
+    print("🔁 Materializando transações recorrentes...")
+    from app.core.database import SessionLocal
+    from app.services.recorrencia_service import RecorrenciaService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = RecorrenciaService(db).materializar()
+        print(
+            f"✅ {estatisticas['ocorrencias']} ocorrências geradas para {estatisticas['modelos']} modelos "
+            f"até {estatisticas['horizonte']} em {estatisticas['duracao_segundos']}s "
+            f"({estatisticas['modelos_por_segundo']} modelos/s, {estatisticas['ocorrencias_por_segundo']} ocorrências/s, "
+            f"{estatisticas['lotes']} lotes, lote mais lento {estatisticas['lote_mais_lento_ms']} ms)"
+        )
+    finally:
+        db.close()
+
+def snapshot_balances(data_referencia: str = None):
+    """Grava o saldo de todas as contas ao final do dia (padrão: ontem)"""
+    from datetime import date
+    from app.core.database import SessionLocal
+    from app.services.saldo_service import SaldoService
+    
+    data = date.fromisoformat(data_referencia) if data_referencia else None
+    print(f"🏦 Gravando snapshots de saldo ({data_referencia or 'ontem'})...")
+    db = SessionLocal()
+    try:
+        total = SaldoService(db).gerar_snapshots(data)
+        print(f"✅ {total} snapshots gravados")
+    finally:
+        db.close()
+
+def check_balances():
+    """Compara o saldo das contas com o recalculado a partir das transações"""
+    print("🔍 Verificando saldos das contas...")
+    from app.core.database import SessionLocal
+    from app.services.saldo_service import SaldoService
+    
+    db = SessionLocal()
+    try:
+        divergencias = SaldoService(db).verificar_consistencia()
+    finally:
+        db.close()
+    
+    for divergencia in divergencias:
+        print(
+            f"⚠️ Conta {divergencia['conta_bancaria_id']} ({divergencia['nome']}): "
+            f"saldo {divergencia['saldo']}, calculado {divergencia['saldo_calculado']}, "
+            f"diferença {divergencia['diferenca']}"
+        )
+    if divergencias:
+        print(f"❌ {len(divergencias)} contas com saldo divergente")
+        sys.exit(1)
+    print("✅ Todos os saldos conferem com as transações")
+
+def recalculate_budgets(corrigir: bool = True):
+    """Recalcula o gasto dos orçamentos ativos e informa as divergências"""
+    print("🎯 Recalculando gastos dos orçamentos..." if corrigir else "🔍 Verificando gastos dos orçamentos...")
+    from app.core.database import SessionLocal
+    from app.services.orcamento_service import OrcamentoService
+    
+    db = SessionLocal()
+    try:
+        divergencias = OrcamentoService(db).recalcular_gastos(corrigir)
+    finally:
+        db.close()
+    
+    for divergencia in divergencias:
+        print(
+            f"⚠️ Orçamento {divergencia['id']} ({divergencia['nome']}): "
+            f"registrado {divergencia['valor_registrado']}, calculado {divergencia['valor_calculado']}, "
+            f"diferença {divergencia['diferenca']}"
+        )
+    if corrigir:
+        print(f"✅ {len(divergencias)} orçamentos corrigidos")
+    elif divergencias:
+        print(f"❌ {len(divergencias)} orçamentos com gasto divergente")
+        sys.exit(1)
+    else:
+        print("✅ Todos os orçamentos conferem com as transações")
+
+def evaluate_budget_alerts():
+    """Gera alertas para orçamentos que atingiram 80% ou 100% do limite"""
+    print("🔔 Avaliando limites dos orçamentos...")
+    from app.core.database import SessionLocal
+    from app.services.alerta_service import AlertaService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = AlertaService(db).gerar_alertas_orcamento()
+        print(
+            f"✅ {estatisticas['alertas_criados']} alertas criados para "
+            f"{estatisticas['orcamentos_no_limite']} orçamentos no limite "
+            f"(desde {estatisticas['desde'] or 'o início'}) em {estatisticas['duracao_segundos']}s"
+        )
+    finally:
+        db.close()
+
+def process_due_dates():
+    """Marca faturas e parcelas vencidas e gera os alertas de vencimento"""
+    print("📅 Processando vencimentos de faturas e parcelas...")
+    from app.core.database import SessionLocal
+    from app.services.vencimento_service import VencimentoService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = VencimentoService(db).processar()
+        print(
+            f"{'✅' if estatisticas['concluido'] else '⏸️'} "
+            f"{estatisticas['faturas_vencidas']} faturas e {estatisticas['parcelas_vencidas']} parcelas vencidas, "
+            f"{estatisticas['faturas_a_vencer']} faturas e {estatisticas['parcelas_a_vencer']} parcelas a vencer, "
+            f"{estatisticas['alertas_criados']} alertas criados em {estatisticas['duracao_segundos']}s "
+            f"({estatisticas['lotes']} lotes)"
+        )
+    finally:
+        db.close()
+
+def reconcile_alert_counters(corrigir: bool = True):
+    """Recalcula os contadores de alertas não lidos e informa as divergências"""
+    print("🔔 Recalculando contadores de alertas..." if corrigir else "🔍 Verificando contadores de alertas...")
+    from app.core.database import SessionLocal
+    from app.services.alerta_service import AlertaService
+    
+    db = SessionLocal()
+    try:
+        divergencias = AlertaService(db).reconciliar_contadores(corrigir)
+    finally:
+        db.close()
+    
+    for divergencia in divergencias:
+        print(
+            f"⚠️ Usuário {divergencia['usuario_id']}: "
+            f"registrado {divergencia['valor_registrado']}, calculado {divergencia['valor_calculado']}, "
+            f"diferença {divergencia['diferenca']}"
+        )
+    if corrigir:
+        print(f"✅ {len(divergencias)} contadores corrigidos")
+    elif divergencias:
+        print(f"❌ {len(divergencias)} contadores divergentes")
+        sys.exit(1)
+    else:
+        print("✅ Todos os contadores conferem com os alertas")
+
+def generate_loan_schedules():
+    """Grava o cronograma de parcelas dos empréstimos ativos que ainda não têm parcelas"""
+    print("🏠 Gerando cronogramas de empréstimos...")
+    from app.core.database import SessionLocal
+    from app.services.amortizacao_service import AmortizacaoService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = AmortizacaoService(db).gerar_pendentes()
+        print(
+            f"✅ {estatisticas['parcelas']} parcelas de {estatisticas['emprestimos']} empréstimos "
+            f"gravadas em {estatisticas['duracao_segundos']}s "
+            f"({estatisticas['parcelas_por_segundo']} parcelas/s, {estatisticas['lotes']} lotes)"
+        )
+    finally:
+        db.close()
+
+def benchmark_amortization(quantidade: int = 100000, prazo: int = 360):
+    """Mede o cálculo e a serialização de cronogramas sintéticos, sem banco"""
+    print(f"⏱️ Calculando {quantidade} cronogramas de {prazo} parcelas...")
+    from app.services.amortizacao_service import medir_geracao
+    
+    estatisticas = medir_geracao(quantidade, prazo)
+    print(
+        f"{'✅' if estatisticas['conferido'] else '❌'} {estatisticas['parcelas']} parcelas: "
+        f"cálculo {estatisticas['calculo_segundos']}s, serialização {estatisticas['serializacao_segundos']}s "
+        f"({estatisticas['parcelas_por_segundo']} parcelas/s)"
+    )
+    if not estatisticas["conferido"]:
+        print("❌ Amortizações não somam o principal")
+        sys.exit(1)
+
+def benchmark_loan_simulation(cenarios: int = 1000, prazo: int = 360):
+    """Mede a simulação de uma grade de pagamentos extras, sem banco"""
+    print(f"⏱️ Simulando {cenarios} cenários de pagamento extra sobre {prazo} parcelas...")
+    from app.core.amortizacao import medir_simulacao
+    
+    estatisticas = medir_simulacao(cenarios, prazo)
+    print(
+        f"✅ Reduzindo o prazo: {estatisticas['reduzir_prazo_ms']} ms, "
+        f"reduzindo a parcela: {estatisticas['reduzir_parcela_ms']} ms"
+    )
+
+def benchmark_login(logins: int = 100, concorrencia: int = 16):
+    """Mede a latência do login e de outra rota com logins concorrentes, sem banco"""
+    print(f"⏱️ {logins} logins com {concorrencia} clientes simultâneos...")
+    from app.core.security import medir_login
+    
+    for estatisticas in medir_login(logins, concorrencia):
+        print(
+            f"✅ {estatisticas['modo']}: {estatisticas['logins']} logins em {estatisticas['duracao_segundos']}s "
+            f"({estatisticas['recusados']} recusados), login p50 {estatisticas['login_p50_ms']} ms / "
+            f"p99 {estatisticas['login_p99_ms']} ms, outra rota p50 {estatisticas['outras_p50_ms']} ms / "
+            f"p99 {estatisticas['outras_p99_ms']} ms"
+        )
+
+def benchmark_pagination(linhas: int = 1000000, limite: int = 50):
+    """Mede a paginação por cursor sobre transações geradas e desfeitas ao final"""
+    print(f"⏱️ Gerando {linhas} transações e percorrendo páginas de {limite}...")
+    from app.core.database import SessionLocal
+    from app.models import init  # noqa: F401 - registra todos os models
+    from app.services.transacao_service import TransacaoService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = TransacaoService(db).medir_paginacao(linhas, limite)
+        print(
+            f"✅ {estatisticas['paginas']} páginas em {estatisticas['paginacao_segundos']}s "
+            f"(geração {estatisticas['geracao_segundos']}s)"
+        )
+        for faixa in estatisticas["faixas"]:
+            print(
+                f"   a partir da página {faixa['pagina_inicial']}: cursor p50 {faixa['keyset_p50_ms']} ms / "
+                f"p99 {faixa['keyset_p99_ms']} ms, OFFSET {faixa['offset_ms']} ms"
+            )
+    finally:
+        db.close()
+
+def benchmark_search(linhas: int = 2000000, usuarios: int = 100):
+    """Mede a busca de transações sobre uma tabela gerada e desfeita ao final"""
+    print(f"⏱️ Gerando {linhas} transações de {usuarios} usuários e medindo a busca...")
+    from app.core.database import SessionLocal
+    from app.models import init  # noqa: F401 - registra todos os models
+    from app.services.transacao_service import TransacaoService
+    
+    db = SessionLocal()
+    try:
+        estatisticas = TransacaoService(db).medir_busca(linhas, usuarios)
+        print(
+            f"✅ {estatisticas['linhas']} linhas ({estatisticas['linhas_por_usuario']} por usuário) "
+            f"geradas em {estatisticas['geracao_segundos']}s"
+        )
+        for cenario in estatisticas["cenarios"]:
+            print(
+                f"   {cenario['nome']}: p50 {cenario['p50_ms']} ms / p99 {cenario['p99_ms']} ms "
+                f"({cenario['resultados']} resultados na primeira página)"
+            )
+    finally:
+        db.close()
+
 def main():
     """Função principal"""
     if len(sys.argv) > 1:
@@ -56,11 +332,59 @@ def main():
             install_dependencies()
         elif command == "dev":
             run_development()
+        elif command == "prod":
+            run_production()
+        elif command == "migrate":
+            run_migrations(sys.argv[2] if len(sys.argv) > 2 else "head")
+        elif command == "resumo-mensal":
+            rebuild_monthly_summary()
+        elif command == "recorrencias":
+            materialize_recurring_transactions()
+        elif command == "snapshot-saldos":
+            snapshot_balances(sys.argv[2] if len(sys.argv) > 2 else None)
+        elif command == "verificar-saldos":
+            check_balances()
+        elif command == "orcamentos":
+            recalculate_budgets(corrigir="--verificar" not in sys.argv[2:])
+        elif command == "alertas-orcamento":
+            evaluate_budget_alerts()
+        elif command == "vencimentos":
+            process_due_dates()
+        elif command == "contadores-alertas":
+            reconcile_alert_counters(corrigir="--verificar" not in sys.argv[2:])
+        elif command == "cronogramas":
+            generate_loan_schedules()
+        elif command == "benchmark-amortizacao":
+            benchmark_amortization(*(int(arg) for arg in sys.argv[2:4]))
+        elif command == "benchmark-simulacao":
+            benchmark_loan_simulation(*(int(arg) for arg in sys.argv[2:4]))
+        elif command == "benchmark-login":
+            benchmark_login(*(int(arg) for arg in sys.argv[2:4]))
+        elif command == "benchmark-paginacao":
+            benchmark_pagination(*(int(arg) for arg in sys.argv[2:4]))
+        elif command == "benchmark-busca":
+            benchmark_search(*(int(arg) for arg in sys.argv[2:4]))
         elif command == "help":
             print("""
 Comandos disponíveis:
   install  - Instala as dependências
   dev      - Executa em modo desenvolvimento
+  prod     - Executa em modo produção (workers, keep-alive e backlog via SERVER_*)
+  migrate  - Aplica as migrações do banco (opcional: revisão, padrão head)
+  resumo-mensal - Reconstrói o resumo mensal de transações
+  recorrencias  - Gera as próximas ocorrências das transações recorrentes (tarefa noturna)
+  snapshot-saldos  - Grava o saldo das contas ao final do dia (opcional: AAAA-MM-DD, padrão ontem)
+  verificar-saldos - Informa contas cujo saldo diverge das transações
+  orcamentos    - Recalcula o gasto dos orçamentos ativos (--verificar: apenas informa divergências)
+  alertas-orcamento - Gera alertas de orçamentos que atingiram 80% ou 100% do limite
+  vencimentos   - Marca faturas/parcelas vencidas e gera alertas de vencimento (tarefa diária)
+  contadores-alertas - Recalcula os contadores de alertas não lidos (--verificar: apenas informa divergências)
+  cronogramas   - Grava as parcelas (Price/SAC) dos empréstimos que ainda não as têm
+  benchmark-amortizacao - Mede o cálculo de cronogramas sem banco (opcional: quantidade prazo, padrão 100000 360)
+  benchmark-simulacao   - Mede a simulação de pagamentos extras sem banco (opcional: cenários prazo, padrão 1000 360)
+  benchmark-login       - Mede o p99 do login e de outra rota com logins concorrentes, sem banco (opcional: logins concorrência, padrão 100 16)
+  benchmark-paginacao   - Mede a paginação por cursor contra OFFSET sobre transações geradas e desfeitas (opcional: linhas limite, padrão 1000000 50)
+  benchmark-busca       - Mede a busca de transações por texto, trecho e etiquetas sobre transações geradas e desfeitas (opcional: linhas usuários, padrão 2000000 100)
   help     - Mostra esta ajuda
             """)
         else:
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(scope="module")
+def sessao_banco():
+    """
+    Sessão em um banco PostgreSQL migrado (TEST_DATABASE_URL), dentro de uma
+    transação desfeita ao final: os dados gerados pelo teste não são gravados.
+    Sem TEST_DATABASE_URL, ou com o banco inacessível, o teste é pulado.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL não definida")
+
+    engine = create_engine(url)
+    try:
+        conexao = engine.connect()
+    except OperationalError as e:
+        engine.dispose()
+        pytest.skip(f"Banco de testes inacessível: {e.orig}")
+
+    transacao = conexao.begin()
+    sessao = Session(bind=conexao, join_transaction_mode="create_savepoint")
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+        transacao.rollback()
+        conexao.close()
+        engine.dispose()
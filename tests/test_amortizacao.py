@@ -0,0 +1,189 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.core.amortizacao import (
+    calcular_cronogramas,
+    para_centavos,
+    para_decimal,
+    simular_pagamentos_extras,
+    taxa_mensal,
+    total_juros,
+)
+
+
+def test_conversao_de_centavos():
+    assert para_centavos(Decimal("10.005")) == 1001
+    assert para_centavos("0.01") == 1
+    assert para_centavos(12) == 1200
+    assert para_decimal(1001) == Decimal("10.01")
+    assert para_decimal(np.int64(-5)) == Decimal("-0.05")
+
+
+def test_taxa_mensal_equivalente():
+    taxa = taxa_mensal([12.0])[0]
+
+    assert (1 + taxa) ** 12 == pytest.approx(1.12)
+
+
+def test_price_com_parcela_constante():
+    cronogramas = calcular_cronogramas([1_000_000], [12.0], [12], [False])
+
+    # 10.000,00 a 12% a.a. em 12 meses: parcela de 885,62 (fórmula: 885,6207)
+    assert cronogramas.parcela[0].tolist() == [88562] * 12
+    assert cronogramas.juros.sum() == 62744
+    assert cronogramas.juros[0, 0] == 9489
+    assert cronogramas.saldo[0, -1] == 0
+
+
+def test_sac_com_amortizacao_constante_e_parcela_decrescente():
+    cronogramas = calcular_cronogramas([1_000_000], [12.0], [12], [True])
+
+    assert cronogramas.amortizacao[0, :-1].tolist() == [83333] * 11
+    # A última amortiza exatamente o saldo restante
+    assert cronogramas.amortizacao[0, -1] == 83337
+    assert cronogramas.parcela[0, 0] == 83333 + 9489
+    assert np.all(np.diff(cronogramas.parcela[0]) < 0)
+    assert cronogramas.juros.sum() == 61677
+
+
+def test_sem_juros_divide_o_principal():
+    cronogramas = calcular_cronogramas([100_000, 100_000], [0.0, 0.0], [3, 3], [False, True])
+
+    assert cronogramas.juros.sum() == 0
+    assert cronogramas.parcela.tolist() == [[33333, 33333, 33334], [33333, 33333, 33334]]
+
+
+def test_prazos_diferentes_preenchem_com_zeros():
+    cronogramas = calcular_cronogramas([500_000, 500_000], [10.0, 10.0], [2, 5], [False, True])
+
+    assert cronogramas.parcela.shape == (2, 5)
+    assert cronogramas.parcela[0, 2:].tolist() == [0, 0, 0]
+    assert cronogramas.juros[0, 2:].tolist() == [0, 0, 0]
+    assert cronogramas.saldo[0, 1] == 0
+    assert cronogramas.saldo[1, 4] == 0
+    assert cronogramas.prazos.tolist() == [2, 5]
+
+
+def test_lista_vazia():
+    cronogramas = calcular_cronogramas([], [], [], [])
+
+    assert cronogramas.parcela.shape == (0, 0)
+
+
+def _referencia(principal: int, taxa_anual: float, prazo: int, sac: bool):
+    """Cronograma de um empréstimo calculado parcela a parcela, sem vetorização"""
+    taxa = (1 + taxa_anual / 100) ** (1 / 12) - 1
+    arredondar = lambda valor: int(np.floor(valor + 0.5))
+    if taxa > 0:
+        parcela_price = arredondar(principal * taxa / (1 - (1 + taxa) ** -prazo))
+    else:
+        parcela_price = arredondar(principal / prazo)
+    saldo = principal
+    parcelas, juros_mes = [], []
+    for mes in range(prazo):
+        juros = arredondar(saldo * taxa)
+        amortizacao = arredondar(principal / prazo) if sac else parcela_price - juros
+        amortizacao = saldo if mes == prazo - 1 else min(max(amortizacao, 0), saldo)
+        saldo -= amortizacao
+        parcelas.append(amortizacao + juros)
+        juros_mes.append(juros)
+    return parcelas, juros_mes
+
+
+def test_vetorizado_igual_ao_calculo_por_emprestimo():
+    gerador = np.random.default_rng(7)
+    quantidade = 200
+    principais = gerador.integers(100_00, 1_000_000_00, size=quantidade, dtype=np.int64)
+    taxas = gerador.uniform(0, 60, size=quantidade).round(2)
+    taxas[:10] = 0
+    prazos = gerador.integers(1, 420, size=quantidade, dtype=np.int64)
+    sac = gerador.random(quantidade) < 0.5
+
+    cronogramas = calcular_cronogramas(principais, taxas, prazos, sac)
+
+    np.testing.assert_array_equal(cronogramas.amortizacao.sum(axis=1), principais)
+    for k in range(quantidade):
+        parcelas, juros = _referencia(int(principais[k]), float(taxas[k]), int(prazos[k]), bool(sac[k]))
+        assert cronogramas.parcela[k, :prazos[k]].tolist() == parcelas
+        assert cronogramas.juros[k, :prazos[k]].tolist() == juros
+        assert cronogramas.saldo[k, prazos[k] - 1] == 0
+
+
+def test_total_juros():
+    assert total_juros(Decimal("10000.00"), Decimal("12.00"), 12, "price") == Decimal("627.44")
+    assert total_juros(Decimal("10000.00"), Decimal("12.00"), 12, "sac") == Decimal("616.77")
+    assert total_juros(Decimal("10000.00"), None, 12, "price") == Decimal("0.00")
+
+
+SALDO = 5_000_000
+TAXA_ANUAL = 18.0
+PRAZO = 48
+
+
+def _simular(extras, meses, sac=False, reduzir_parcela=False):
+    base = calcular_cronogramas([SALDO], [TAXA_ANUAL], [PRAZO], [sac])
+    resultado = simular_pagamentos_extras(
+        SALDO,
+        float(taxa_mensal([TAXA_ANUAL])[0]),
+        PRAZO,
+        int(base.parcela[0, 0]),
+        int(base.amortizacao[0, 0]),
+        sac,
+        np.array(extras, dtype=np.int64),
+        np.array(meses, dtype=np.int64),
+        reduzir_parcela=reduzir_parcela,
+    )
+    return base, resultado
+
+
+@pytest.mark.parametrize("sac", [False, True])
+def test_sem_pagamento_extra_reproduz_o_cronograma(sac):
+    base, resultado = _simular([0], [0], sac=sac)
+
+    assert resultado.prazos.tolist() == [PRAZO]
+    assert resultado.juros.tolist() == [base.juros.sum()]
+    assert resultado.parcelas_seguintes.tolist() == [0]
+
+
+@pytest.mark.parametrize("sac", [False, True])
+def test_pagamento_extra_reduzindo_o_prazo(sac):
+    base, resultado = _simular([200_000, 500_000, 1_000_000, 500_000], [6, 6, 6, 1], sac=sac)
+
+    prazos = resultado.prazos.tolist()
+    juros = resultado.juros.tolist()
+    # Quanto maior e mais cedo o pagamento extra, menor o prazo e os juros
+    assert PRAZO > prazos[0] >= prazos[1] >= prazos[2]
+    assert base.juros.sum() > juros[0] > juros[1] > juros[2]
+    assert juros[3] < juros[1]
+    if not sac:
+        # A parcela é mantida
+        assert resultado.parcelas_seguintes.tolist()[:3] == [base.parcela[0, 6]] * 3
+
+
+@pytest.mark.parametrize("sac", [False, True])
+def test_pagamento_extra_reduzindo_a_parcela_recalcula_o_cronograma(sac):
+    mes, extra = 12, 1_000_000
+    base, resultado = _simular([extra], [mes], sac=sac, reduzir_parcela=True)
+
+    # Equivale a um cronograma novo sobre o saldo após o pagamento extra
+    restante = calcular_cronogramas([base.saldo[0, mes - 1] - extra], [TAXA_ANUAL], [PRAZO - mes], [sac])
+    assert resultado.prazos.tolist() == [PRAZO]
+    assert resultado.parcelas_seguintes.tolist() == [restante.parcela[0, 0]]
+    assert resultado.juros.tolist() == [base.juros[0, :mes].sum() + restante.juros.sum()]
+
+
+@pytest.mark.parametrize("reduzir_parcela", [False, True])
+def test_pagamento_extra_que_quita_o_saldo(reduzir_parcela):
+    _, resultado = _simular([SALDO, SALDO], [1, 10], reduzir_parcela=reduzir_parcela)
+
+    assert resultado.prazos.tolist() == [1, 10]
+    assert resultado.parcelas_seguintes.tolist() == [0, 0]
+
+
+def test_pagamento_extra_no_ultimo_mes_nao_altera_o_cronograma():
+    base, resultado = _simular([100_000], [PRAZO])
+
+    assert resultado.prazos.tolist() == [PRAZO]
+    assert resultado.juros.tolist() == [base.juros.sum()]
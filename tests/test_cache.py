@@ -0,0 +1,176 @@
+import itertools
+import time
+
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.core.cache import TTLCache, estatisticas_caches, invalidar_apos_commit
+
+_nomes = itertools.count()
+
+
+def _cache(max_itens: int = 10, ttl_segundos: float = 60) -> TTLCache:
+    return TTLCache(f"teste_cache_{next(_nomes)}", max_itens=max_itens, ttl_segundos=ttl_segundos)
+
+
+def test_get_e_set_contam_acertos_e_falhas():
+    cache = _cache()
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.estatisticas()["acertos"] == 1
+    assert cache.estatisticas()["falhas"] == 1
+    assert estatisticas_caches()[cache.nome]["itens"] == 1
+
+
+def test_remove_a_entrada_menos_usada_acima_do_limite():
+    cache = _cache(max_itens=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.estatisticas()["remocoes"] == 1
+
+
+def test_entrada_expira_apos_o_ttl():
+    cache = _cache(ttl_segundos=0.05)
+    cache.set("a", 1)
+
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+    assert cache.estatisticas()["expiracoes"] == 1
+
+
+def test_ttl_da_entrada_nao_passa_do_ttl_do_cache():
+    cache = _cache(ttl_segundos=0.05)
+    cache.set("a", 1, ttl_segundos=60)
+
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+
+
+def test_set_com_geracao_anterior_a_invalidacao_e_ignorado():
+    cache = _cache()
+    geracao = cache.geracao()
+
+    # Invalidação confirmada enquanto o valor era calculado
+    cache.invalidate("a")
+    cache.set("a", "antigo", geracao=geracao)
+
+    assert cache.get("a") is None
+
+
+def test_set_com_geracao_posterior_a_invalidacao_grava():
+    cache = _cache()
+    cache.invalidate("a")
+    geracao = cache.geracao()
+
+    cache.set("a", "novo", geracao=geracao)
+
+    assert cache.get("a") == "novo"
+
+
+def test_invalidacao_de_outra_chave_nao_bloqueia_o_set():
+    cache = _cache()
+    geracao = cache.geracao()
+
+    cache.invalidate("b")
+    cache.set("a", 1, geracao=geracao)
+
+    assert cache.get("a") == 1
+
+
+def test_invalidate_where_bloqueia_sets_das_chaves_removidas():
+    cache = _cache()
+    cache.set(("u1", 1), "x")
+    cache.set(("u2", 1), "y")
+    geracao = cache.geracao()
+
+    cache.invalidate_where(lambda chave, _: chave[0] == "u1")
+    cache.set(("u1", 1), "antigo", geracao=geracao)
+    cache.set(("u2", 2), "z", geracao=geracao)
+
+    assert cache.get(("u1", 1)) is None
+    assert cache.get(("u2", 1)) == "y"
+    assert cache.get(("u2", 2)) == "z"
+
+
+def test_clear_bloqueia_sets_de_geracoes_anteriores():
+    cache = _cache()
+    geracao = cache.geracao()
+
+    cache.clear()
+    cache.set("a", 1, geracao=geracao)
+    assert cache.get("a") is None
+
+    cache.set("a", 2, geracao=cache.geracao())
+    assert cache.get("a") == 2
+
+
+def test_invalidacoes_descartadas_pelo_limite_continuam_bloqueando():
+    cache = _cache(max_itens=2)
+    geracao = cache.geracao()
+
+    # "a" sai do registro de invalidações, mas a geração mínima sobe junto
+    for chave in ("a", "b", "c"):
+        cache.invalidate(chave)
+    cache.set("a", 1, geracao=geracao)
+
+    assert cache.get("a") is None
+
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "itens"
+
+    id = Column(Integer, primary_key=True)
+    nome = Column(String(50))
+
+
+_cache_itens = _cache()
+invalidar_apos_commit(_cache_itens, modelos=[Item], chave=lambda item: item.id)
+
+
+def _sessao() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return Session(engine)
+
+
+def test_invalida_somente_apos_o_commit():
+    sessao = _sessao()
+    item = Item(id=1, nome="a")
+    sessao.add(item)
+    sessao.commit()
+    _cache_itens.set(1, "a")
+
+    item.nome = "b"
+    sessao.flush()
+    assert _cache_itens.get(1) == "a"
+
+    sessao.commit()
+    assert _cache_itens.get(1) is None
+
+
+def test_rollback_descarta_a_invalidacao():
+    sessao = _sessao()
+    sessao.add(Item(id=2, nome="a"))
+    sessao.commit()
+    _cache_itens.set(2, "a")
+
+    sessao.get(Item, 2).nome = "b"
+    sessao.flush()
+    sessao.rollback()
+
+    assert _cache_itens.get(2) == "a"
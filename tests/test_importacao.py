@@ -0,0 +1,201 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import importacao_service
+from app.services.importacao_service import (
+    ImportacaoService,
+    LinhaInvalidaError,
+    _converter_valor,
+    _FluxoCopy,
+    ler_csv,
+    ler_ofx,
+)
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("1234.56", Decimal("1234.56")),
+    ("-1234,56", Decimal("-1234.56")),
+    ("1.234,56", Decimal("1234.56")),
+    (" 1 234,56 ", Decimal("1234.56")),
+    ("10", Decimal("10.00")),
+    ("+0,5", Decimal("0.50")),
+    ("9999999999999.99", Decimal("9999999999999.99")),
+])
+def test_converter_valor(valor, esperado):
+    convertido = _converter_valor(valor)
+
+    assert convertido == esperado
+    assert convertido.as_tuple().exponent == -2
+
+
+@pytest.mark.parametrize("valor", [
+    "",
+    "abc",
+    "12,34,56",
+    "NaN",
+    "sNaN",
+    "Infinity",
+    "-inf",
+    "1e13",
+    "-10000000000000",
+    "1e400",
+])
+def test_converter_valor_invalido(valor):
+    with pytest.raises(LinhaInvalidaError):
+        _converter_valor(valor)
+
+
+def _csv(conteudo: str, codificacao: str = "utf-8") -> io.BytesIO:
+    return io.BytesIO(conteudo.encode(codificacao))
+
+
+def test_ler_csv_com_ponto_e_virgula():
+    registros = list(ler_csv(_csv(
+        "data;descricao;valor\n"
+        "31/01/2024;Mercado;-1.234,56\n"
+        "2024-02-01;Salário;5000,00\n"
+    )))
+
+    assert registros == [
+        (2, (2, date(2024, 1, 31), "Mercado", Decimal("-1234.56"))),
+        (3, (3, date(2024, 2, 1), "Salário", Decimal("5000.00"))),
+    ]
+
+
+def test_ler_csv_com_virgula_bom_e_colunas_em_outra_ordem():
+    registros = list(ler_csv(_csv(
+        "Valor,Data,Descricao\n"
+        '-10.50,20240105,"Padaria, centro"\n',
+        "utf-8-sig",
+    )))
+
+    assert registros == [(2, (2, date(2024, 1, 5), "Padaria, centro", Decimal("-10.50")))]
+
+
+def test_ler_csv_produz_erros_sem_interromper_a_leitura():
+    registros = list(ler_csv(_csv(
+        "data;descricao;valor\n"
+        "32/01/2024;Data errada;10\n"
+        "01/02/2024;;10\n"
+        "01/02/2024;Valor errado;dez\n"
+        "01/02/2024;Linha curta\n"
+        "01/02/2024;Válida;1\n"
+    )))
+
+    assert [numero for numero, _ in registros] == [2, 3, 4, 5, 6]
+    erros = [str(registro) for _, registro in registros[:4]]
+    assert erros[0].startswith("Data inválida")
+    assert erros[1] == "Descrição vazia"
+    assert erros[2].startswith("Valor inválido")
+    assert erros[3].startswith("Valor inválido")
+    assert all(isinstance(registro, LinhaInvalidaError) for _, registro in registros[:4])
+    assert registros[4][1] == (6, date(2024, 2, 1), "Válida", Decimal("1.00"))
+
+
+def test_ler_csv_sem_colunas_obrigatorias_responde_400():
+    with pytest.raises(HTTPException) as erro:
+        list(ler_csv(_csv("data;historico\n01/01/2024;x\n")))
+
+    assert erro.value.status_code == 400
+    assert "descricao, valor" in erro.value.detail
+
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240131120000[-3:BRT]
+<TRNAMT>-52.30
+<MEMO>Farmácia
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240201
+<TRNAMT>1500,00
+<NAME>Transferência recebida
+</STMTTRN>
+<STMTTRN>
+<DTPOSTED>20240202
+<TRNAMT>10.00
+</STMTTRN>
+<STMTTRN>
+<DTPOSTED>20240203
+<TRNAMT>NaN
+<MEMO>Valor inválido
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+OFX_XML = (
+    "<OFX><STMTTRN><DTPOSTED>20240131</DTPOSTED><TRNAMT>-52.30</TRNAMT><MEMO>Farmácia</MEMO></STMTTRN>"
+    "<STMTTRN><DTPOSTED>20240201</DTPOSTED><TRNAMT>1500.00</TRNAMT><NAME>Transferência recebida</NAME></STMTTRN></OFX>"
+)
+
+
+def _ofx(conteudo: str) -> io.BytesIO:
+    return io.BytesIO(conteudo.encode("latin-1"))
+
+
+def test_ler_ofx_sgml():
+    registros = list(ler_ofx(_ofx(OFX_SGML)))
+
+    assert [numero for numero, _ in registros] == [1, 2, 3, 4]
+    assert registros[0][1] == (1, date(2024, 1, 31), "Farmácia", Decimal("-52.30"))
+    assert registros[1][1] == (2, date(2024, 2, 1), "Transferência recebida", Decimal("1500.00"))
+    assert str(registros[2][1]) == "Lançamento sem descrição"
+    assert isinstance(registros[3][1], LinhaInvalidaError)
+
+
+def test_ler_ofx_xml():
+    registros = list(ler_ofx(_ofx(OFX_XML)))
+
+    assert [registro for _, registro in registros] == [
+        (1, date(2024, 1, 31), "Farmácia", Decimal("-52.30")),
+        (2, date(2024, 2, 1), "Transferência recebida", Decimal("1500.00")),
+    ]
+
+
+def _normalizar(registros):
+    return [(numero, str(registro) if isinstance(registro, Exception) else registro) for numero, registro in registros]
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 3, 7, 64])
+def test_ler_ofx_com_tags_divididas_entre_blocos(monkeypatch, tamanho_bloco):
+    esperado = {conteudo: _normalizar(ler_ofx(_ofx(conteudo))) for conteudo in (OFX_SGML, OFX_XML)}
+    monkeypatch.setattr(importacao_service, "TAMANHO_BLOCO", tamanho_bloco)
+
+    for conteudo, registros in esperado.items():
+        assert _normalizar(ler_ofx(_ofx(conteudo))) == registros
+
+
+def test_linhas_copy_separa_tipo_e_conta_erros():
+    servico = ImportacaoService(db=None)
+    registros = [
+        (2, (2, date(2024, 1, 31), 'Mercado "central"', Decimal("-10.50"))),
+        (3, LinhaInvalidaError("Descrição vazia")),
+        (4, (4, date(2024, 2, 1), "x" * 300, Decimal("20.00"))),
+    ]
+
+    linhas = list(servico._linhas_copy(iter(registros)))
+
+    assert linhas == [
+        '2,2024-01-31,"Mercado ""central""",10.50,despesa\n',
+        f"4,2024-02-01,{'x' * 255},20.00,receita\n",
+    ]
+    assert servico.total_linhas == 3
+    assert servico.rejeitadas == 1
+    assert servico.erros[0].linha == 3
+
+
+def test_fluxo_copy_le_em_blocos_do_tamanho_pedido():
+    fluxo = _FluxoCopy(iter(["abc\n", "de\n", "f\n"]))
+
+    assert fluxo.read(5) == "abc\nd"
+    assert fluxo.read(5) == "e\nf\n"
+    assert fluxo.read(5) == ""
+    assert _FluxoCopy(iter(["a", "b"])).read() == "ab"
@@ -0,0 +1,175 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.services.dados_sinteticos import criar_usuario, gerar_transacoes
+
+# Volume suficiente para o planejador preferir os índices a varreduras
+USUARIOS = 10
+TRANSACOES_POR_USUARIO = 10_000
+EMPRESTIMOS_POR_USUARIO = 20
+PARCELAS_POR_EMPRESTIMO = 240
+ALERTAS_POR_USUARIO = 2_000
+
+SQL_EMPRESTIMOS = """
+    INSERT INTO emprestimos (
+        usuario_id, nome, tipo_emprestimo, valor_principal, saldo_devedor,
+        taxa_juros, total_parcelas, parcelas_pagas, valor_parcela, data_inicio, data_fim
+    )
+    SELECT :usuario_id, 'Empréstimo ' || g, 'pessoal', 100000, 50000,
+           12, :parcelas, :parcelas - 40, 700,
+           CAST(:hoje AS date) - make_interval(months => :parcelas - 40),
+           CAST(:hoje AS date) + make_interval(months => 40)
+    FROM generate_series(1, :quantidade) AS g
+"""
+
+# Parcelas já vencidas são pagas; das em aberto, uma a cada 50 está atrasada
+SQL_PARCELAS = """
+    INSERT INTO parcelas_emprestimo (
+        emprestimo_id, numero_parcela, data_vencimento, valor, valor_principal, valor_juros, status
+    )
+    SELECT e.id, n, (e.data_inicio + make_interval(months => n))::date, 700, 600, 100,
+           CASE
+               WHEN n > e.parcelas_pagas THEN 'pendente'
+               WHEN n % 50 = 0 THEN 'pendente'
+               ELSE 'paga'
+           END
+    FROM emprestimos e
+    CROSS JOIN generate_series(1, e.total_parcelas) AS n
+    WHERE e.usuario_id = :usuario_id
+"""
+
+# Um alerta não lido a cada 20
+SQL_ALERTAS = """
+    INSERT INTO alertas (usuario_id, tipo_alerta, titulo, mensagem, data_alerta, lido)
+    SELECT :usuario_id, 'saldo_baixo', 'Alerta ' || g, 'Mensagem', now() - make_interval(hours => g), g % 20 <> 0
+    FROM generate_series(1, :quantidade) AS g
+"""
+
+
+@pytest.fixture(scope="module")
+def massa(sessao_banco):
+    """Usuários com transações, empréstimos com parcelas e alertas"""
+    hoje = date.today()
+    usuarios = []
+    for _ in range(USUARIOS):
+        usuario_id = criar_usuario(sessao_banco)
+        gerar_transacoes(sessao_banco, usuario_id, TRANSACOES_POR_USUARIO)
+        sessao_banco.execute(text(SQL_EMPRESTIMOS), {
+            "usuario_id": usuario_id,
+            "parcelas": PARCELAS_POR_EMPRESTIMO,
+            "hoje": hoje,
+            "quantidade": EMPRESTIMOS_POR_USUARIO,
+        })
+        sessao_banco.execute(text(SQL_PARCELAS), {"usuario_id": usuario_id})
+        sessao_banco.execute(text(SQL_ALERTAS), {"usuario_id": usuario_id, "quantidade": ALERTAS_POR_USUARIO})
+        usuarios.append(usuario_id)
+    sessao_banco.execute(text("ANALYZE emprestimos, parcelas_emprestimo, alertas"))
+
+    emprestimo_id = sessao_banco.execute(
+        text("SELECT id FROM emprestimos WHERE usuario_id = :usuario_id LIMIT 1"),
+        {"usuario_id": usuarios[0]}
+    ).scalar()
+    return {"usuario_id": usuarios[0], "emprestimo_id": emprestimo_id, "hoje": hoje}
+
+
+def _indices_do_plano(sessao, sql: str, parametros: dict) -> set:
+    """Nomes dos índices usados em qualquer nó do plano"""
+    plano = sessao.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), parametros).scalar()
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+
+    indices = set()
+    pendentes = [plano[0]["Plan"]]
+    while pendentes:
+        no = pendentes.pop()
+        if "Index Name" in no:
+            indices.add(no["Index Name"])
+        pendentes.extend(no.get("Plans", []))
+    return indices
+
+
+def test_listagem_de_transacoes_usa_indice_usuario_data(sessao_banco, massa):
+    indices = _indices_do_plano(sessao_banco, """
+        SELECT * FROM transacoes
+        WHERE usuario_id = :usuario_id
+        ORDER BY data_transacao DESC, id DESC
+        LIMIT 51
+    """, {"usuario_id": massa["usuario_id"]})
+
+    assert "idx_transacoes_usuario_data" in indices
+
+
+def test_pagina_profunda_de_transacoes_usa_indice_usuario_data(sessao_banco, massa):
+    cursor_data, cursor_id = sessao_banco.execute(text("""
+        SELECT data_transacao, id FROM transacoes
+        WHERE usuario_id = :usuario_id
+        ORDER BY data_transacao, id
+        LIMIT 1 OFFSET 100
+    """), {"usuario_id": massa["usuario_id"]}).one()
+
+    indices = _indices_do_plano(sessao_banco, """
+        SELECT * FROM transacoes
+        WHERE usuario_id = :usuario_id
+          AND (data_transacao, id) < (:cursor_data, :cursor_id)
+        ORDER BY data_transacao DESC, id DESC
+        LIMIT 51
+    """, {"usuario_id": massa["usuario_id"], "cursor_data": cursor_data, "cursor_id": cursor_id})
+
+    assert "idx_transacoes_usuario_data" in indices
+
+
+def test_transacoes_do_mes_usam_indice_usuario_data(sessao_banco, massa):
+    inicio = massa["hoje"].replace(day=1)
+
+    indices = _indices_do_plano(sessao_banco, """
+        SELECT tipo_transacao, sum(valor) FROM transacoes
+        WHERE usuario_id = :usuario_id
+          AND data_transacao BETWEEN :inicio AND :fim
+        GROUP BY tipo_transacao
+    """, {"usuario_id": massa["usuario_id"], "inicio": inicio, "fim": inicio + timedelta(days=31)})
+
+    assert "idx_transacoes_usuario_data" in indices
+
+
+def test_parcelas_vencidas_usam_indice_parcial(sessao_banco, massa):
+    indices = _indices_do_plano(sessao_banco, """
+        SELECT x.id FROM parcelas_emprestimo x
+        WHERE x.status = 'pendente'
+          AND x.data_vencimento < :hoje
+        ORDER BY x.data_vencimento
+        LIMIT 500
+    """, {"hoje": massa["hoje"]})
+
+    assert "idx_parcelas_pendentes_vencimento" in indices
+
+
+def test_parcelas_em_aberto_do_emprestimo_usam_indice_parcial(sessao_banco, massa):
+    indices = _indices_do_plano(sessao_banco, """
+        SELECT * FROM parcelas_emprestimo
+        WHERE emprestimo_id = :emprestimo_id
+          AND status = 'pendente'
+        ORDER BY data_vencimento
+    """, {"emprestimo_id": massa["emprestimo_id"]})
+
+    assert "idx_parcelas_emprestimo_pendentes" in indices
+
+
+def test_alertas_nao_lidos_usam_indice_parcial(sessao_banco, massa):
+    parametros = {"usuario_id": massa["usuario_id"]}
+
+    listagem = _indices_do_plano(sessao_banco, """
+        SELECT * FROM alertas
+        WHERE usuario_id = :usuario_id AND lido = false
+        ORDER BY data_alerta DESC
+        LIMIT 50
+    """, parametros)
+    contagem = _indices_do_plano(sessao_banco, """
+        SELECT count(*) FROM alertas
+        WHERE usuario_id = :usuario_id AND lido = false
+    """, parametros)
+
+    assert "idx_alertas_nao_lidos" in listagem
+    assert "idx_alertas_nao_lidos" in contagem
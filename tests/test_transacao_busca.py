@@ -0,0 +1,39 @@
+import pytest
+
+from app.models import init  # noqa: F401 - registra todos os models
+from app.services.dados_sinteticos import criar_usuario, gerar_transacoes
+from app.services.transacao_service import TransacaoService
+
+
+@pytest.fixture(scope="module")
+def usuario_id(sessao_banco):
+    usuario_id = criar_usuario(sessao_banco)
+    gerar_transacoes(sessao_banco, usuario_id, 200)
+    return usuario_id
+
+
+def test_busca_so_por_etiqueta_ordena_pela_data(sessao_banco, usuario_id):
+    pagina = TransacaoService(sessao_banco).buscar(usuario_id, etiquetas=["viagem"], tamanho=5)
+
+    assert len(pagina.itens) == 5
+    assert pagina.tem_mais
+    assert all("viagem" in item.etiquetas for item in pagina.itens)
+    assert all(item.relevancia == 0 for item in pagina.itens)
+    datas = [item.data_transacao for item in pagina.itens]
+    assert datas == sorted(datas, reverse=True)
+
+
+def test_busca_por_termo_e_etiqueta(sessao_banco, usuario_id):
+    pagina = TransacaoService(sessao_banco).buscar(usuario_id, termo="supermercado", etiquetas=["viagem", "reembolso"])
+
+    assert pagina.itens
+    for item in pagina.itens:
+        assert "supermercado" in item.descricao.lower()
+        assert {"viagem", "reembolso"} <= set(item.etiquetas)
+
+
+def test_busca_por_trecho_da_descricao(sessao_banco, usuario_id):
+    pagina = TransacaoService(sessao_banco).buscar(usuario_id, termo="mercad", tamanho=100)
+
+    assert pagina.itens
+    assert all("mercad" in item.descricao.lower() for item in pagina.itens)
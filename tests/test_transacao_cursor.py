@@ -0,0 +1,65 @@
+import base64
+import json
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.transacao_service import TransacaoService
+
+
+def _transacao(data_transacao: date, id: uuid.UUID) -> SimpleNamespace:
+    return SimpleNamespace(data_transacao=data_transacao, id=id)
+
+
+def test_cursor_ida_e_volta():
+    id = uuid.uuid4()
+
+    cursor = TransacaoService._codificar_cursor(_transacao(date(2024, 2, 29), id))
+
+    assert TransacaoService._decodificar_cursor(cursor) == (date(2024, 2, 29), id)
+
+
+def test_cursor_e_seguro_para_url_e_sem_preenchimento():
+    for _ in range(50):
+        cursor = TransacaoService._codificar_cursor(_transacao(date(2024, 1, 1), uuid.uuid4()))
+
+        assert "=" not in cursor
+        assert "+" not in cursor and "/" not in cursor
+
+
+def test_cursor_e_opaco():
+    id = uuid.uuid4()
+
+    cursor = TransacaoService._codificar_cursor(_transacao(date(2024, 1, 1), id))
+
+    assert str(id) not in cursor
+    assert "2024" not in cursor
+
+
+def _codificar(valor) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valor).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "nao-e-base64!",
+    "é",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    _codificar("texto"),
+    _codificar([1, 2]),
+    _codificar({"d": "2024-01-01"}),
+    _codificar({"i": str(uuid.uuid4())}),
+    _codificar({"d": "2024-13-01", "i": str(uuid.uuid4())}),
+    _codificar({"d": 20240101, "i": str(uuid.uuid4())}),
+    _codificar({"d": "2024-01-01", "i": "nao-e-uuid"}),
+    _codificar({"d": "2024-01-01", "i": None}),
+])
+def test_cursor_invalido_responde_400(cursor):
+    with pytest.raises(HTTPException) as erro:
+        TransacaoService._decodificar_cursor(cursor)
+
+    assert erro.value.status_code == 400
+    assert erro.value.detail == "Cursor inválido"